@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Solve many 4x4 Color Puzzle boards in parallel
+
+Usage: python batch_solve.py boards.txt [-o results.jsonl] [--workers N]
+       [--time-limit SECONDS] [--max-nodes N] [--cache PATH | --no-cache]
+       cat boards.txt | python batch_solve.py -
+
+Input has one 16-cell board string per line (blank lines and lines starting
+with '#' are skipped). Output is one JSON record per board, written as soon
+as that board finishes, so records may arrive out of input order. Solved
+boards go into the shared solution cache (see solver.cache), so repeated
+boards cost one lookup.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+
+from solver import bitboard, search
+from solver.cache import DEFAULT_PATH, SolutionCache
+
+# Per-process solution caches by path, opened on first use in each worker
+_caches = {}
+
+
+def read_boards(stream):
+    """Yield (line number, board string) for every board in stream"""
+    for line_no, line in enumerate(stream, 1):
+        board = line.strip()
+        if not board or board.startswith('#'):
+            continue
+        yield line_no, board
+
+
+def open_cache(path):
+    """This worker's cache at path, or None if it can't be opened (warned about once)"""
+    if path not in _caches:
+        try:
+            _caches[path] = SolutionCache(path)
+        except (OSError, sqlite3.Error) as e:
+            # Boards still get solved, just not remembered
+            _caches[path] = None
+            print(f"Solution cache {path} unavailable, solving without it: {e}", file=sys.stderr)
+    return _caches[path]
+
+
+def format_moves(moves):
+    return [f"{action} {bitboard.piston_name((r, c))}" for action, r, c in moves]
+
+
+def solve_board(job):
+    """Worker entry point: solve one board and return its result record"""
+    line_no, board, method, max_depth, budgets, cache_path = job
+    record = {"line": line_no, "board": board}
+    try:
+        state = bitboard.parse_board(board)
+    except ValueError as e:
+        record["error"] = str(e)
+        return record
+    start_time = time.time()
+    cache = open_cache(cache_path) if cache_path is not None else None
+    result = cache.get(state) if cache is not None else None
+    record["cached"] = result is not None
+    if result is None:
+        result = search.solve(state, method=method, max_depth=max_depth, **budgets)
+        if cache is not None and result.solved:
+            cache.put(state, result.moves, result.optimal)
+    record.update({
+        "solved": result.solved,
+        "status": result.status,
+        "budget": result.budget,
+        "reason": result.reason,
+        "moves": format_moves(result.moves) if result.solved else None,
+        "length": len(result.moves) if result.solved else None,
+        "nodes": result.nodes_expanded,
+        "wall_time": round(time.time() - start_time, 4),
+    })
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a file of boards across all CPU cores")
+    parser.add_argument("input", help="file with one board per line, or - for stdin")
+    parser.add_argument("-o", "--output", help="write JSON lines here instead of stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes (default: all cores)")
+    parser.add_argument("--max-depth", type=int, default=100, help="maximum solution length (default: 100)")
+    parser.add_argument("--time-limit", type=float, metavar="SECONDS", help="per-board deadline")
+    parser.add_argument("--max-nodes", type=int, help="per-board limit on expanded nodes")
+    parser.add_argument("--cache", default=DEFAULT_PATH, help=f"solution cache database (default: {DEFAULT_PATH})")
+    parser.add_argument("--no-cache", action="store_true", help="always search, without reading or filling the cache")
+    # 'hda' starts its own processes, which pool workers are not allowed to do
+    methods = sorted(method for method in search.SOLVERS if method != 'hda')
+    parser.add_argument("--method", choices=methods, default="astar", help="search algorithm (default: astar)")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    out = open(args.output, 'w') if args.output else sys.stdout
+    budgets = {'time_limit': args.time_limit, 'max_nodes': args.max_nodes}
+    cache_path = None if args.no_cache else args.cache
+    jobs = ((line_no, board, args.method, args.max_depth, budgets, cache_path)
+            for line_no, board in read_boards(source))
+
+    start_time = time.time()
+    count = 0
+    solved = 0
+    try:
+        with multiprocessing.Pool(args.workers) as pool:
+            # imap_unordered hands back each record as soon as its board is done
+            for record in pool.imap_unordered(solve_board, jobs):
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                count += 1
+                solved += bool(record.get("solved"))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.time() - start_time
+    print(f"Solved {solved}/{count} boards in {elapsed:.2f}s with {args.workers} workers", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Solver benchmark corpus and regression runner
+
+Usage: python benchmark.py corpus [--seed 0] [--per-bucket 8] [-o benchmarks/corpus.txt]
+       python benchmark.py run [--corpus benchmarks/corpus.txt] [--method astar] [-o results.json]
+                               [--baseline benchmarks/baseline.json] [--save-baseline PATH]
+                               [--max-time-regression 0.25] [--max-nodes-regression 0.05]
+                               [--max-memory-regression 0.25] [--max-length-regression 0]
+
+The corpus holds boards dealt like a fresh random game (3 blocks of each
+color on the 12 edge cells), bucketed by how many nodes the A* solver
+needed when the corpus was made. It is generated once from a seed and
+checked in, so runs stay comparable as the solver changes.
+
+A run solves every board and records nodes expanded, wall time, peak
+estimated memory (from solver telemetry) and solution length. Totals per
+bucket are compared to a baseline run; the exit status is 1 if any total
+grew by more than its threshold (a fraction, e.g. 0.25 for 25%).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from solver import bitboard, search
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "corpus.txt")
+
+# Bucket of a board by A* nodes expanded when the corpus is generated
+BUCKETS = [("easy", 1500), ("medium", 6000), ("hard", None)]
+# Solves that need more nodes than this are left out of the corpus
+CORPUS_MAX_NODES = 200000
+
+METRICS = ["nodes", "wall_time", "peak_memory", "length"]
+
+# Edge cells of the inner grid, where a random game deals its blocks
+EDGE_CELLS = [bitboard.cell_index(r, c) for r in range(1, 5) for c in range(1, 5)
+              if r in (1, 4) or c in (1, 4)]
+
+
+def random_board(rng):
+    """A board dealt like PuzzleGame.place_blocks_random, as a packed state"""
+    cells = EDGE_CELLS[:]
+    rng.shuffle(cells)
+    state = 0
+    for cell, code in zip(cells, [code for code in range(1, 5) for _ in range(3)]):
+        state |= code << (3 * cell)
+    return state
+
+
+def bucket_for(nodes):
+    for name, limit in BUCKETS:
+        if limit is None or nodes < limit:
+            return name
+
+
+def generate_corpus(seed, per_bucket, log=None):
+    """(bucket, board string) pairs, per_bucket boards in each bucket"""
+    rng = random.Random(seed)
+    found = {name: [] for name, _ in BUCKETS}
+    seen = set()
+    while any(len(boards) < per_bucket for boards in found.values()):
+        state = random_board(rng)
+        board = bitboard.format_board(state)
+        if board in seen:
+            continue
+        seen.add(board)
+        result = search.solve(state, max_nodes=CORPUS_MAX_NODES)
+        if not result.solved:
+            continue
+        name = bucket_for(result.nodes_expanded)
+        if len(found[name]) < per_bucket:
+            found[name].append(board)
+            if log is not None:
+                log(f"[Corpus] {name}: {board} ({result.nodes_expanded} nodes)")
+    return [(name, board) for name, _ in BUCKETS for board in found[name]]
+
+
+def read_corpus(path):
+    corpus = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                bucket, board = line.split()
+                corpus.append((bucket, board))
+    return corpus
+
+
+def run_board(board, method, max_depth):
+    """Benchmark record for one board"""
+    state = bitboard.parse_board(board)
+    peak = [0]
+
+    def on_stats(stats):
+        peak[0] = max(peak[0], stats.memory_bytes)
+
+    start_time = time.perf_counter()
+    result = search.solve(state, method=method, max_depth=max_depth, on_stats=on_stats, stats_interval=0)
+    return {
+        "board": board,
+        "status": result.status,
+        "nodes": result.nodes_expanded,
+        "wall_time": round(time.perf_counter() - start_time, 4),
+        "peak_memory": peak[0],
+        "length": len(result.moves) if result.solved else None,
+    }
+
+
+def bucket_totals(records):
+    """{bucket: {metric: total}} over the records, plus an 'all' bucket"""
+    names = [name for name, _ in BUCKETS if any(record["bucket"] == name for record in records)]
+    totals = {name: {metric: 0 for metric in METRICS} for name in names + ["all"]}
+    for record in records:
+        for name in (record["bucket"], "all"):
+            for metric in METRICS:
+                totals[name][metric] += record[metric] or 0
+    return totals
+
+
+def compare(results, baseline, thresholds):
+    """List of regression messages: totals that grew past their threshold"""
+    regressions = []
+    current = results["totals"]
+    for name, old in baseline["totals"].items():
+        new = current.get(name)
+        if new is None:
+            continue
+        for metric, threshold in thresholds.items():
+            if old[metric] and new[metric] > old[metric] * (1 + threshold):
+                change = new[metric] / old[metric] - 1
+                regressions.append(f"{name} {metric}: {old[metric]} -> {new[metric]} "
+                                   f"(+{change:.1%}, threshold {threshold:.0%})")
+    return regressions
+
+
+def cmd_corpus(args):
+    log = lambda message: print(message, file=sys.stderr, flush=True)
+    corpus = generate_corpus(args.seed, args.per_bucket, log)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        f.write(f"# Solver benchmark corpus: python benchmark.py corpus --seed {args.seed} "
+                f"--per-bucket {args.per_bucket}\n")
+        f.write("# bucket board\n")
+        for bucket, board in corpus:
+            f.write(f"{bucket} {board}\n")
+    return 0
+
+
+def cmd_run(args):
+    records = []
+    for bucket, board in read_corpus(args.corpus):
+        record = run_board(board, args.method, args.max_depth)
+        record["bucket"] = bucket
+        records.append(record)
+        print(f"{bucket:6s} {board} {record['status']:15s} {record['nodes']:8d} nodes "
+              f"{record['wall_time']:8.3f}s {record['peak_memory'] / 1e6:7.1f} MB "
+              f"length {record['length']}", file=sys.stderr, flush=True)
+
+    results = {"method": args.method, "max_depth": args.max_depth,
+               "records": records, "totals": bucket_totals(records)}
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=1)
+
+    for name, totals in results["totals"].items():
+        print(f"{name:6s} nodes {totals['nodes']:9d}  time {totals['wall_time']:8.3f}s  "
+              f"peak memory {totals['peak_memory'] / 1e6:8.1f} MB  length {totals['length']}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    thresholds = {
+        "nodes": args.max_nodes_regression,
+        "wall_time": args.max_time_regression,
+        "peak_memory": args.max_memory_regression,
+        "length": args.max_length_regression,
+    }
+    regressions = compare(results, baseline, thresholds)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the solver on a fixed corpus of boards")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    corpus = commands.add_parser("corpus", help="generate a seeded corpus")
+    corpus.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    corpus.add_argument("--per-bucket", type=int, default=8, help="boards per difficulty bucket (default: 8)")
+    corpus.add_argument("-o", "--output", default=CORPUS_PATH, help="corpus file to write")
+
+    run = commands.add_parser("run", help="solve the corpus and compare with a baseline")
+    run.add_argument("--corpus", default=CORPUS_PATH, help="corpus file to read")
+    run.add_argument("--method", choices=sorted(search.SOLVERS), default="astar", help="search algorithm (default: astar)")
+    run.add_argument("--max-depth", type=int, default=100, help="maximum solution length (default: 100)")
+    run.add_argument("-o", "--output", help="write results as JSON here")
+    run.add_argument("--baseline", help="results JSON of an earlier run to compare with")
+    run.add_argument("--save-baseline", help="also write the results here, for later comparisons")
+    run.add_argument("--max-time-regression", type=float, default=0.25, help="allowed wall time growth (default: 0.25)")
+    run.add_argument("--max-nodes-regression", type=float, default=0.05, help="allowed node count growth (default: 0.05)")
+    run.add_argument("--max-memory-regression", type=float, default=0.25, help="allowed peak memory growth (default: 0.25)")
+    run.add_argument("--max-length-regression", type=float, default=0.0, help="allowed solution length growth (default: 0)")
+
+    args = parser.parse_args(argv)
+    return cmd_corpus(args) if args.command == "corpus" else cmd_run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
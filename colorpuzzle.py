@@ -1,12 +1,14 @@
 import tkinter as tk
 from tkinter import messagebox
 import random
-import copy
-import heapq
-import itertools
-import functools
+import sqlite3
+import multiprocessing
 import time
-import threading
+
+from solver import bitboard, feasibility, search
+from solver.cache import SolutionCache
+from solver.profiling import Profiler
+from solver.bitboard import COLORS, COLOR_CHARS, PISTON_DIRS
 
 # 4x4 Color Puzzle Game
 # A puzzle game where you use pistons to push colored blocks into their corners
@@ -21,151 +23,68 @@ import threading
 
 CELL_SIZE = 60
 GRID_SIZE = 6  # 6x6 total: outer ring pistons, inner 4x4 puzzle
+# Color name of each block character
+CHAR_COLORS = {char: color for color, char in COLOR_CHARS.items()}
+# Block colors while the solver runs
+DIM_COLORS = {'yellow': '#FFFFCC', 'blue': '#CCCCFF', 'red': '#FFCCCC', 'green': '#CCFFCC'}
+# Color indicators in the empty corners
+CORNER_LABELS = {(0, 0): 'Y', (0, 5): 'B', (5, 0): 'R', (5, 5): 'G'}
+# Autoplay speeds in moves per second; the board is redrawn at most once per frame
+PLAYBACK_SPEEDS = {"Slow": 2, "Normal": 5, "Fast": 15, "Turbo": 60}
+FRAME_MS = 33
+# How often the game checks the solver process for progress and its result
+PROGRESS_POLL_MS = 100
+# Solution text: header line, blank line, then one line per move
+FIRST_MOVE_LINE = 3
+
+
+class Playback:
+    """
+    A solution with the board before and after each of its moves, so playing,
+    stepping and scrubbing are lookups rather than replays
+    """
+
+    def __init__(self, state, moves):
+        self.moves = list(moves)
+        self.states = [state]
+        for action, r, c in self.moves:
+            piston = bitboard.PISTON_INDEX[(r, c)]
+            extended = bool((state >> bitboard.EXT_SHIFT) >> piston & 1)
+            state = bitboard.apply_piston(state, piston)
+            if state is None or extended != (action == 'retract'):
+                raise ValueError(f"cannot {action} {bitboard.piston_name((r, c))} at move {len(self.states)}")
+            self.states.append(state)
+        self.step = 0
+
+    def seek(self, step):
+        """Go to the board after step moves (clamped to the solution); returns that state"""
+        self.step = max(0, min(step, len(self.moves)))
+        return self.states[self.step]
+
+    @property
+    def state(self):
+        return self.states[self.step]
+
+    @property
+    def next_move(self):
+        """The move to play next, or None at the end"""
+        return self.moves[self.step] if self.step < len(self.moves) else None
+
+    @property
+    def remaining(self):
+        return len(self.moves) - self.step
 
-# Colors for blocks
-COLORS = ['yellow', 'blue', 'red', 'green']
-COLOR_CHARS = {'yellow': 'Y', 'blue': 'B', 'red': 'R', 'green': 'G'}
-
-# Directions for pistons and their sticky faces
-PISTON_DIRS = {
-    (0, 1): 'v', (0, 2): 'v', (0, 3): 'v', (0, 4): 'v',
-    (5, 1): '^', (5, 2): '^', (5, 3): '^', (5, 4): '^',
-    (1, 0): '>', (2, 0): '>', (3, 0): '>', (4, 0): '>',
-    (1, 5): '<', (2, 5): '<', (3, 5): '<', (4, 5): '<',
-}
-
-DIR_OFFSETS = {
-    '>': (0, 1),
-    '<': (0, -1),
-    '^': (-1, 0),
-    'v': (1, 0),
-}
-
-def serialize_grid(grid):
-    return tuple(tuple(row) for row in grid)
-
-def get_possible_moves(grid, extended, piston_heads):
-    moves = []
-    for (r, c), dir_char in PISTON_DIRS.items():
-        # Try extend
-        if not extended[(r, c)]:
-            dr, dc = DIR_OFFSETS[dir_char]
-            head_r, head_c = r + dr, c + dc
-            if not (1 <= head_r <= 4 and 1 <= head_c <= 4):
-                continue
-            if (head_r, head_c) in piston_heads:
-                continue
-            cell = grid[head_r][head_c]
-            if cell == '':
-                moves.append(('extend', r, c))
-            else:
-                # Try to push chain
-                positions = []
-                rr, cc = head_r, head_c
-                while True:
-                    if not (1 <= rr <= 4 and 1 <= cc <= 4):
-                        positions = None
-                        break
-                    cell2 = grid[rr][cc]
-                    if (rr, cc) in piston_heads:
-                        positions = None
-                        break
-                    if cell2 in COLOR_CHARS.values():
-                        positions.append((rr, cc))
-                        rr += dr
-                        cc += dc
-                        continue
-                    elif cell2 == '':
-                        break
-                    else:
-                        positions = None
-                        break
-                if positions is not None:
-                    moves.append(('extend', r, c))
-        else:
-            # Try retract
-            moves.append(('retract', r, c))
-    return moves
-
-def apply_move(grid, extended, piston_heads, move):
-    # Deepcopy all structures
-    grid = copy.deepcopy(grid)
-    extended = copy.deepcopy(extended)
-    piston_heads = copy.deepcopy(piston_heads)
-    action, r, c = move
-    dir_char = grid[r][c]
-    dr, dc = DIR_OFFSETS[dir_char]
-    head_r, head_c = r + dr, c + dc
-    if action == 'extend':
-        if grid[head_r][head_c] == '':
-            extended[(r, c)] = True
-            piston_heads[(head_r, head_c)] = (r, c)
-        else:
-            # Push chain
-            chain = []
-            rr, cc = head_r, head_c
-            while True:
-                if not (1 <= rr <= 4 and 1 <= cc <= 4):
-                    return grid, extended, piston_heads  # Invalid
-                cell2 = grid[rr][cc]
-                if (rr, cc) in piston_heads:
-                    return grid, extended, piston_heads
-                if cell2 in COLOR_CHARS.values():
-                    chain.append((rr, cc))
-                    rr += dr
-                    cc += dc
-                    continue
-                elif cell2 == '':
-                    break
-                else:
-                    return grid, extended, piston_heads
-            for rr, cc in reversed(chain):
-                new_r, new_c = rr + dr, cc + dc
-                grid[new_r][new_c] = grid[rr][cc]
-                grid[rr][cc] = ''
-            extended[(r, c)] = True
-            piston_heads[(head_r, head_c)] = (r, c)
-    elif action == 'retract':
-        if (head_r, head_c) in piston_heads:
-            del piston_heads[(head_r, head_c)]
-        sticky_r, sticky_c = head_r + dr, head_c + dc
-        if 1 <= sticky_r <= 4 and 1 <= sticky_c <= 4:
-            block = grid[sticky_r][sticky_c]
-            if block in COLOR_CHARS.values():
-                grid[head_r][head_c] = block
-                grid[sticky_r][sticky_c] = ''
-            else:
-                grid[head_r][head_c] = ''
-        else:
-            grid[head_r][head_c] = ''
-        extended[(r, c)] = False
-    return grid, extended, piston_heads
-
-def is_win(grid):
-    # Use your check_win logic, but return True/False only
-    for r in range(2, 4):
-        for c in range(2, 4):
-            if grid[r][c] != '':
-                return False
-    corner_checks = {
-        'yellow': [(1, 1), (1, 2), (2, 1)],
-        'blue': [(1, 4), (1, 3), (2, 4)],
-        'red': [(4, 1), (3, 1), (4, 2)],
-        'green': [(4, 4), (3, 4), (4, 3)],
-    }
-    for color, positions in corner_checks.items():
-        for r, c in positions:
-            if grid[r][c] != COLOR_CHARS[color]:
-                return False
-    return True
 
 class PuzzleGame:
-    def __init__(self, root):
+    def __init__(self, root, profile=None):
         self.root = root
+        # None, or '' to print a solver profile after each solve, or a path
+        # to also write it as a pstats file (launcher.py --profile)
+        self.profile = profile
         
         # Lock window size to prevent accidental resizing
         window_width = GRID_SIZE * CELL_SIZE + 20  # Just a little extra space on the right
-        window_height = GRID_SIZE * CELL_SIZE + 220  # More space at the bottom for all UI elements
+        window_height = GRID_SIZE * CELL_SIZE + 260  # More space at the bottom for all UI elements
         
         # Center the window on screen
         screen_width = root.winfo_screenwidth()
@@ -175,20 +94,37 @@ class PuzzleGame:
         
         root.geometry(f"{window_width}x{window_height}+{x}+{y}")
         root.resizable(False, False)  # Disable window resizing
+        root.protocol("WM_DELETE_WINDOW", self.quit_game)
         
         self.grid = [['' for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
         self.extended = {k: False for k in PISTON_DIRS}
         self.piston_heads = {}
         self.manual_setup_active = False
-        self.current_solution = None
+        # Playback of the last solution found, or None
+        self.playback = None
+        self.autoplaying = False
+        self.playback_job = None  # pending autoplay frame
+        self.render_job = None  # pending playback redraw
+        self.scale_step = 0  # step the slider was last set to
         self.setup_mode = tk.StringVar(value="Random")
         self.solving_in_progress = False
-        self.solver_thread = None
+        # Solver child process and the read end of its result pipe
+        self.solver_process = None
+        self.solver_conn = None
+        # Solutions shared with batch_solve.py; solving still works without it
+        try:
+            self.solution_cache = SolutionCache()
+        except (OSError, sqlite3.Error) as e:
+            self.solution_cache = None
+            warning = f"Solved boards will not be remembered between games.\n\n{e}"
+            # Once the window is up, like the game's other warnings
+            root.after(0, lambda: messagebox.showwarning("Solution Cache Unavailable", warning))
 
         # UI setup
         self.canvas = tk.Canvas(root, width=GRID_SIZE*CELL_SIZE, height=GRID_SIZE*CELL_SIZE)
         self.canvas.grid(row=0, column=0, columnspan=6)
         self.canvas.bind("<Button-1>", self.on_click)
+        self.create_canvas_items()
 
         self.win_label = tk.Label(root, text="Welcome!", font=("Arial", 14))
         self.win_label.grid(row=1, column=0, columnspan=6)
@@ -222,9 +158,24 @@ class PuzzleGame:
         self.mode_menu = tk.OptionMenu(root, self.setup_mode, "Random", "Manual", command=self.on_mode_change)
         self.mode_menu.grid(row=3, column=4)
 
-        self.quit_button = tk.Button(root, text="Quit", command=root.quit)
+        self.quit_button = tk.Button(root, text="Quit", command=self.quit_game)
         self.quit_button.grid(row=3, column=5)
 
+        # Solution playback: autoplay, speed, jump to the end and a step slider
+        self.play_button = tk.Button(root, text="Play", width=5, command=self.toggle_autoplay, state="disabled")
+        self.play_button.grid(row=4, column=0)
+
+        self.playback_speed = tk.StringVar(value="Normal")
+        self.speed_menu = tk.OptionMenu(root, self.playback_speed, *PLAYBACK_SPEEDS)
+        self.speed_menu.grid(row=4, column=1)
+
+        self.end_button = tk.Button(root, text="End", command=lambda: self.seek_solution(len(self.playback.moves)), state="disabled")
+        self.end_button.grid(row=4, column=2)
+
+        self.step_scale = tk.Scale(root, from_=0, to=0, orient="horizontal", showvalue=True,
+                                   command=self.on_scrub, state="disabled")
+        self.step_scale.grid(row=4, column=3, columnspan=3, sticky="ew")
+
         self.place_pistons()
         # Start with empty board - user selects mode and presses Start to begin
         self.clear_blocks()
@@ -245,8 +196,7 @@ class PuzzleGame:
 
 
     def start_game(self):
-        self.next_move_button.config(state="disabled")
-        self.current_solution = None  # Clear any previous solution
+        self.clear_playback()  # Clear any previous solution
         
         if self.setup_mode.get() == "Random":
             self.place_blocks_random()
@@ -384,128 +334,91 @@ class PuzzleGame:
                     return True
         return False
 
-    def retract_piston(self, r, c):
-        if not self.extended.get((r, c), False):
-            return
-
-        dir_char = self.grid[r][c]
-        dr, dc = DIR_OFFSETS[dir_char]
-        head_r, head_c = r + dr, c + dc
+    def toggle_piston(self, r, c):
+        """Extend or retract the piston at (r, c) with the bitboard rules; False if blocked"""
+        state = bitboard.apply_piston(bitboard.encode(self.grid, self.extended), bitboard.PISTON_INDEX[(r, c)])
+        if state is None:
+            return False
+        self.load_state(state)
+        return True
 
-        # Remove piston head visually
-        if (head_r, head_c) in self.piston_heads:
-            del self.piston_heads[(head_r, head_c)]
+    def load_state(self, state):
+        """Show a packed state on the board"""
+        # Update in place: the canvas and the solver both read these objects
+        grid, extended, piston_heads = bitboard.decode(state)
+        for row, new_row in zip(self.grid, grid):
+            row[:] = new_row
+        self.extended.update(extended)
+        self.piston_heads.clear()
+        self.piston_heads.update(piston_heads)
 
-        # Sticky face is the cell one step further in the piston direction
-        sticky_r, sticky_c = head_r + dr, head_c + dc
+    def retract_piston(self, r, c):
+        if self.extended.get((r, c), False):
+            self.toggle_piston(r, c)
 
-        if 1 <= sticky_r <= 4 and 1 <= sticky_c <= 4:
-            block = self.grid[sticky_r][sticky_c]
-            if block in COLOR_CHARS.values():
-                # Pull the block back to where the piston head was
-                self.grid[head_r][head_c] = block
-                self.grid[sticky_r][sticky_c] = ''
+    def extend_piston(self, r, c):
+        if not self.extended.get((r, c), False):
+            self.toggle_piston(r, c)
+
+    def cell_look(self, r, c):
+        """(background, block color or None, text, text color) of cell (r, c)"""
+        solving = self.solving_in_progress
+        cell = self.grid[r][c]
+        if (r, c) in self.piston_heads:
+            pr, pc = self.piston_heads[(r, c)]
+            dir_char = self.grid[pr][pc]
+            if solving:
+                return ('lightgray', None, dir_char, 'gray')
+            return ('orange', None, dir_char, 'black')
+        if (r, c) in PISTON_DIRS:
+            if solving:
+                color = "lightgray"  # Gray out pistons when solving
             else:
-                self.grid[head_r][head_c] = ''
-        else:
-            self.grid[head_r][head_c] = ''
-
-        self.extended[(r, c)] = False
-
-    def draw_grid(self):
-        self.canvas.delete("all")
+                color = "red" if self.extended[(r, c)] else "gray"
+            return ('white', None, cell, color)
+        if (r, c) in CORNER_LABELS:
+            return ('white', None, CORNER_LABELS[(r, c)], "lightgray" if solving else "black")
+        color_name = CHAR_COLORS.get(cell)
+        if color_name is not None and solving:
+            # Dim the colors when solving
+            color_name = DIM_COLORS.get(color_name, color_name)
+        return ('white', color_name, '', 'black')
+
+    def overlay_look(self):
+        """Which overlay the board shows: 'solving', 'empty' (start hint) or None"""
+        if self.solving_in_progress:
+            return 'solving'
+        if self.manual_setup_active:
+            # No text overlay during manual setup - instructions are in solution area
+            return None
+        for r in range(1, 5):
+            for c in range(1, 5):
+                if self.grid[r][c] in CHAR_COLORS:
+                    return None
+        return 'empty'
+
+    def create_canvas_items(self):
+        """
+        Create every canvas item once, in drawing order; draw_grid() then only
+        reconfigures the items whose look changed
+        """
+        canvas = self.canvas
+        self.cell_items = {}
         for r in range(GRID_SIZE):
             for c in range(GRID_SIZE):
                 x1 = c * CELL_SIZE
                 y1 = r * CELL_SIZE
                 x2 = x1 + CELL_SIZE
                 y2 = y1 + CELL_SIZE
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill='white', outline='black')
-
-                cell = self.grid[r][c]
-                if (r, c) in PISTON_DIRS:
-                    dir_char = self.grid[r][c]
-                    if self.solving_in_progress:
-                        color = "lightgray"  # Gray out pistons when solving
-                    else:
-                        color = "red" if self.extended[(r, c)] else "gray"
-                    self.canvas.create_text(x1 + CELL_SIZE // 2, y1 + CELL_SIZE // 2, text=dir_char, font=("Arial", 32), fill=color)
-
-                elif cell in COLOR_CHARS.values():
-                    color_name = [k for k, v in COLOR_CHARS.items() if v == cell][0]
-                    if self.solving_in_progress:
-                        # Dim the colors when solving
-                        dim_colors = {'yellow': '#FFFFCC', 'blue': '#CCCCFF', 'red': '#FFCCCC', 'green': '#CCFFCC'}
-                        color_name = dim_colors.get(color_name, color_name)
-                    self.canvas.create_oval(x1 + 10, y1 + 10, x2 - 10, y2 - 10, fill=color_name)
-
-        # Add helpful text in empty puzzle area when no blocks are placed
-        puzzle_area_empty = True
-        for r in range(1, 5):
-            for c in range(1, 5):
-                if self.grid[r][c] in COLOR_CHARS.values():
-                    puzzle_area_empty = False
-                    break
-            if not puzzle_area_empty:
-                break
-        
-        if puzzle_area_empty and not self.manual_setup_active and not self.solving_in_progress:
-            # Draw helpful text in the center of the puzzle area (4x4 inner grid)
-            # Calculate the actual center of the 4x4 puzzle area (rows 1-4, cols 1-4)
-            puzzle_left = 1 * CELL_SIZE
-            puzzle_right = 5 * CELL_SIZE
-            puzzle_top = 1 * CELL_SIZE
-            puzzle_bottom = 5 * CELL_SIZE
-            center_x = (puzzle_left + puzzle_right) // 2
-            center_y = (puzzle_top + puzzle_bottom) // 2
-            
-            # Main instruction - properly centered in puzzle area
-            self.canvas.create_text(center_x, center_y - 10, 
-                                  text="To start the game", 
-                                  font=("Arial", 16, "bold"), 
-                                  fill="steelblue", 
-                                  anchor="center")
-            self.canvas.create_text(center_x, center_y + 15, 
-                                  text="press START", 
-                                  font=("Arial", 16, "bold"), 
-                                  fill="darkblue",
-                                  anchor="center")
-        
-        elif self.manual_setup_active and not self.solving_in_progress:
-            # No text overlay during manual setup - instructions are in solution area
-            pass
-
-        # Add color indicators to the empty corners
-        corner_labels = {
-            (0, 0): 'Y',
-            (0, 5): 'B',
-            (5, 0): 'R',
-            (5, 5): 'G',
-        }
-        for (r, c), label in corner_labels.items():
-            x1 = c * CELL_SIZE
-            y1 = r * CELL_SIZE
-            label_color = "lightgray" if self.solving_in_progress else "black"
-            self.canvas.create_text(
-                x1 + CELL_SIZE // 2,
-                y1 + CELL_SIZE // 2,
-                text=label,
-                font=("Arial", 18, "bold"),
-                fill=label_color
-            )
-
-        for (hr, hc), (pr, pc) in self.piston_heads.items():
-            dir_char = self.grid[pr][pc]
-            hx1 = hc * CELL_SIZE
-            hy1 = hr * CELL_SIZE
-            hx2 = hx1 + CELL_SIZE
-            hy2 = hy1 + CELL_SIZE
-            head_color = "lightgray" if self.solving_in_progress else "orange"
-            self.canvas.create_rectangle(hx1, hy1, hx2, hy2, fill=head_color, outline='black')
-            text_color = "gray" if self.solving_in_progress else "black"
-            self.canvas.create_text(hx1 + CELL_SIZE // 2, hy1 + CELL_SIZE // 2, text=dir_char, font=("Arial", 32), fill=text_color)
-
-        # Draw piston labels for clarity
+                font = ("Arial", 18, "bold") if (r, c) in CORNER_LABELS else ("Arial", 32)
+                self.cell_items[(r, c)] = (
+                    canvas.create_rectangle(x1, y1, x2, y2, fill='white', outline='black'),
+                    canvas.create_oval(x1 + 10, y1 + 10, x2 - 10, y2 - 10, state='hidden'),
+                    canvas.create_text(x1 + CELL_SIZE // 2, y1 + CELL_SIZE // 2, text='', font=font),
+                )
+
+        # Piston labels for clarity
+        self.piston_label_items = []
         for (r, c), dir_char in PISTON_DIRS.items():
             if r == 0:
                 label = f"top{c}"
@@ -525,121 +438,78 @@ class PuzzleGame:
                 y = r * CELL_SIZE + CELL_SIZE // 2 + 18  # Move down below the '<'
             else:
                 continue
-            label_color = "lightblue" if self.solving_in_progress else "blue"
-            self.canvas.create_text(
-                x, y,
-                text=label,
-                font=("Arial", 10, "bold"),
-                fill=label_color
-            )
-
-        # Draw lock overlay when solving
-        if self.solving_in_progress:
-            # Draw semi-transparent overlay over the puzzle area
-            center_x = GRID_SIZE * CELL_SIZE // 2
-            center_y = GRID_SIZE * CELL_SIZE // 2
-            
-            # Draw lock icon
-            lock_size = 40
-            self.canvas.create_rectangle(center_x - lock_size//2, center_y - lock_size//2, 
-                                       center_x + lock_size//2, center_y + lock_size//2,
-                                       fill='lightgray', outline='darkgray', width=3)
-            self.canvas.create_text(center_x, center_y, text="🔒", font=("Arial", 24), fill="red")
-            
-            # Add "SOLVING..." text
-            self.canvas.create_text(center_x, center_y + 60, text="SOLVING...", 
-                                  font=("Arial", 16, "bold"), fill="red")
+            self.piston_label_items.append(
+                canvas.create_text(x, y, text=label, font=("Arial", 10, "bold"), fill="blue"))
+
+        # Helpful text in the center of the empty 4x4 puzzle area (rows 1-4, cols 1-4)
+        center_x = (1 * CELL_SIZE + 5 * CELL_SIZE) // 2
+        center_y = (1 * CELL_SIZE + 5 * CELL_SIZE) // 2
+        self.overlay_items = {'empty': [
+            canvas.create_text(center_x, center_y - 10, text="To start the game",
+                               font=("Arial", 16, "bold"), fill="steelblue", anchor="center"),
+            canvas.create_text(center_x, center_y + 15, text="press START",
+                               font=("Arial", 16, "bold"), fill="darkblue", anchor="center"),
+        ]}
+
+        # Lock overlay when solving
+        center_x = GRID_SIZE * CELL_SIZE // 2
+        center_y = GRID_SIZE * CELL_SIZE // 2
+        lock_size = 40
+        self.overlay_items['solving'] = [
+            canvas.create_rectangle(center_x - lock_size//2, center_y - lock_size//2,
+                                    center_x + lock_size//2, center_y + lock_size//2,
+                                    fill='lightgray', outline='darkgray', width=3),
+            canvas.create_text(center_x, center_y, text="🔒", font=("Arial", 24), fill="red"),
+            canvas.create_text(center_x, center_y + 60, text="SOLVING...",
+                               font=("Arial", 16, "bold"), fill="red"),
+        ]
+        for items in self.overlay_items.values():
+            for item in items:
+                canvas.itemconfigure(item, state='hidden')
 
         for i in range(GRID_SIZE + 1):
-            self.canvas.create_line(i * CELL_SIZE, 0, i * CELL_SIZE, GRID_SIZE * CELL_SIZE, fill='black')
-            self.canvas.create_line(0, i * CELL_SIZE, GRID_SIZE * CELL_SIZE, i * CELL_SIZE, fill='black')
-
-    def get_solver_progress(self, grid):
-        """Calculate solver progress based on corners solved and color groups"""
-        # Check true corners (main corner positions)
-        true_corners = {
-            (1, 1): 'Y',
-            (1, 4): 'B', 
-            (4, 1): 'R',
-            (4, 4): 'G',
-        }
-        corners_solved = 0
-        for (r, c), correct_char in true_corners.items():
-            if grid[r][c] == correct_char:
-                corners_solved += 1
-        
-        # Check how many colors have at least 2 blocks in their target corner area
-        group_targets = {
-            'Y': [(1, 1), (1, 2), (2, 1)],
-            'B': [(1, 4), (1, 3), (2, 4)],
-            'R': [(4, 1), (3, 1), (4, 2)],
-            'G': [(4, 4), (3, 4), (4, 3)],
-        }
-        colors_with_2plus = 0
-        for color, char in COLOR_CHARS.items():
-            count = 0
-            for (gr, gc) in group_targets[char]:
-                if grid[gr][gc] == char:
-                    count += 1
-            if count >= 2:
-                colors_with_2plus += 1
-        
-        return corners_solved, colors_with_2plus
-
-    def heuristic(self, grid):
-        """Admissible heuristic for A* search"""
-        # Phase 1: Get all true corners correct
-        true_corners = {
-            (1, 1): 'Y',
-            (1, 4): 'B',
-            (4, 1): 'R',
-            (4, 4): 'G',
-        }
-        wrong_corner = 0
-        for (r, c), correct_char in true_corners.items():
-            cell = grid[r][c]
-            if cell == '':
-                wrong_corner += 1  # Empty corner, must be filled
-            elif cell != correct_char and cell in COLOR_CHARS.values():
-                wrong_corner += 1  # Wrong color in true corner
-
-        # If all true corners are correct, focus on getting 2 of each color in their goal corner
-        group_targets = {
-            'Y': [(1, 1), (1, 2), (2, 1)],
-            'B': [(1, 4), (1, 3), (2, 4)],
-            'R': [(4, 1), (3, 1), (4, 2)],
-            'G': [(4, 4), (3, 4), (4, 3)],
-        }
-        color_counts = {char: 0 for char in COLOR_CHARS.values()}
-        for color, char in COLOR_CHARS.items():
-            for (gr, gc) in group_targets[char]:
-                if grid[gr][gc] == char:
-                    color_counts[char] += 1
-
-        # Phase 2: After all true corners are correct, get 2 of each color in their goal corner
-        phase2_penalty = 0
-        if wrong_corner == 0:
-            for char in COLOR_CHARS.values():
-                if color_counts[char] < 2:
-                    phase2_penalty += (2 - color_counts[char])  # Each missing block is 1 move away at least
-
-        # Check if we have 4/4 corners and 4/4 color groups - heavily favor this state
-        corners_solved = sum(1 for char in COLOR_CHARS.values() if color_counts[char] >= 2)
-        if wrong_corner == 0 and corners_solved == 4:
-            # This is a 4/4 state - give it massive priority even if moves aren't optimal
-            return 0  # Highest priority - explore this immediately
-
-        # Manhattan distance for all blocks (admissible)
-        dist_penalty = 0
-        for color, char in COLOR_CHARS.items():
-            for r in range(1, 5):
-                for c in range(1, 5):
-                    if grid[r][c] == char:
-                        min_dist = min(abs(r - gr) + abs(c - gc) for (gr, gc) in group_targets[char])
-                        dist_penalty += min_dist
-
-        # Heuristic is sum of wrong corners, phase2 penalty, and distances
-        return wrong_corner * 7 + phase2_penalty * 2 + dist_penalty
+            canvas.create_line(i * CELL_SIZE, 0, i * CELL_SIZE, GRID_SIZE * CELL_SIZE, fill='black')
+            canvas.create_line(0, i * CELL_SIZE, GRID_SIZE * CELL_SIZE, i * CELL_SIZE, fill='black')
+
+        # What the items show now; None forces the first draw_grid() to set everything
+        self.drawn_cells = dict.fromkeys(self.cell_items)
+        self.drawn_overlay = None
+        self.drawn_solving = None
+
+    def draw_grid(self):
+        """Bring the canvas up to date, touching only the items whose look changed"""
+        canvas = self.canvas
+        for pos, items in self.cell_items.items():
+            look = self.cell_look(*pos)
+            old = self.drawn_cells[pos]
+            if look == old:
+                continue
+            background, block, text, text_color = look
+            rect, oval, text_item = items
+            if old is None or background != old[0]:
+                canvas.itemconfigure(rect, fill=background)
+            if old is None or block != old[1]:
+                if block is None:
+                    canvas.itemconfigure(oval, state='hidden')
+                else:
+                    canvas.itemconfigure(oval, fill=block, state='normal')
+            if old is None or text != old[2] or text_color != old[3]:
+                canvas.itemconfigure(text_item, text=text, fill=text_color)
+            self.drawn_cells[pos] = look
+
+        if self.solving_in_progress != self.drawn_solving:
+            label_color = "lightblue" if self.solving_in_progress else "blue"
+            for item in self.piston_label_items:
+                canvas.itemconfigure(item, fill=label_color)
+            self.drawn_solving = self.solving_in_progress
+
+        overlay = self.overlay_look()
+        if overlay != self.drawn_overlay:
+            for item in self.overlay_items.get(self.drawn_overlay, ()):
+                canvas.itemconfigure(item, state='hidden')
+            for item in self.overlay_items.get(overlay, ()):
+                canvas.itemconfigure(item, state='normal')
+            self.drawn_overlay = overlay
 
     def on_click(self, event):
         # Don't allow clicks during solving
@@ -662,21 +532,16 @@ class PuzzleGame:
         if (r, c) not in PISTON_DIRS:
             return
         
-        # Determine what action will be performed
-        intended_action = 'retract' if self.extended[(r, c)] else 'extend'
-        
-        # Check if this matches the next move in the solution
-        move_matches_solution = False
-        if (hasattr(self, 'current_solution_moves') and 
-            self.current_solution_moves and 
-            hasattr(self, 'next_move_button') and 
-            self.next_move_button.cget('state') == 'normal'):
-            
-            next_move = self.current_solution_moves[0]  # Don't pop yet, just peek
-            next_action, next_r, next_c = next_move
-            if intended_action == next_action and r == next_r and c == next_c:
-                move_matches_solution = True
-        
+        # Pause any autoplay; a click that plays the next solution move
+        # advances the playback instead of leaving the solution
+        if self.playback is not None:
+            self.stop_autoplay()
+            intended_move = ('retract' if self.extended[(r, c)] else 'extend', r, c)
+            on_solution = self.playback.state == bitboard.encode(self.grid, self.extended)
+            if on_solution and self.playback.next_move == intended_move:
+                self.seek_solution(self.playback.step + 1)
+                return
+
         # Perform the move
         if self.extended[(r, c)]:
             self.retract_piston(r, c)
@@ -684,113 +549,14 @@ class PuzzleGame:
             self.extend_piston(r, c)
         
         self.draw_grid()
-        puzzle_solved = self.check_win()
-        
-        # If the move matched the solution, update the solution list
-        if move_matches_solution:
-            self.current_solution_moves.pop(0)  # Remove the move we just executed
-            
-            # Update solution display
-            self.solution_text.config(state="normal")
-            self.solution_text.delete("1.0", tk.END)
-            
-            if puzzle_solved:
-                # Puzzle is solved! Show congratulations message
-                self.solution_text.insert(tk.END, "🎉 Congratulations! Puzzle solved!\n\n")
-                self.solution_text.insert(tk.END, "The solution has been completed successfully.")
-                self.current_solution = None
-                self.current_solution_moves = None
-                self.next_move_button.config(state="disabled")
-            elif not self.current_solution_moves:
-                # All moves completed but puzzle not solved (shouldn't happen with correct solutions)
-                self.solution_text.insert(tk.END, "✅ All moves completed!")
-                self.current_solution = None
-                self.next_move_button.config(state="disabled")
-            else:
-                # Show remaining moves with updated numbering
-                move_texts = []
-                for idx, remaining_move in enumerate(self.current_solution_moves):
-                    remaining_action, remaining_r, remaining_c = remaining_move
-                    move_texts.append(f"{idx+1:3d}. {remaining_action.title()} {self.piston_name((remaining_r, remaining_c))}")
-                
-                self.solution_text.insert(tk.END, f"📝 Solution ({len(move_texts)} moves left):\n\n")
-                self.solution_text.insert(tk.END, "\n".join(move_texts))
-                self.current_solution = move_texts
-            
-            self.solution_text.config(state="disabled")
-
-    def can_push_chain(self, start_r, start_c, dr, dc):
-        positions = []
-        r, c = start_r, start_c
-        while True:
-            if not (1 <= r <= 4 and 1 <= c <= 4):
-                return None
-            cell = self.grid[r][c]
-            if (r, c) in self.piston_heads:
-                return None
-            if cell in COLOR_CHARS.values():
-                positions.append((r, c))
-                r += dr
-                c += dc
-                continue
-            elif cell == '':
-                break
-            else:
-                return None
-        return positions
-
-    def extend_piston(self, r, c):
-        dir_char = self.grid[r][c]
-        dr, dc = DIR_OFFSETS[dir_char]
-        head_r, head_c = r + dr, c + dc
-
-        if not (1 <= head_r <= 4 and 1 <= head_c <= 4):
-            return
-
-        if (head_r, head_c) in self.piston_heads:
-            return  # Another piston head is blocking
-
-        cell = self.grid[head_r][head_c]
-        if cell == '':
-            self.extended[(r, c)] = True
-            self.piston_heads[(head_r, head_c)] = (r, c)
-            return
-
-        chain = self.can_push_chain(head_r, head_c, dr, dc)
-        if chain is None:
-            return
-
-        for rr, cc in reversed(chain):
-            new_r, new_c = rr + dr, cc + dc
-            self.grid[new_r][new_c] = self.grid[rr][cc]
-            self.grid[rr][cc] = ''
-
-        self.extended[(r, c)] = True
-        self.piston_heads[(head_r, head_c)] = (r, c)
+        self.check_win()
 
     def check_win(self):
-        for r in range(2, 4):
-            for c in range(2, 4):
-                if self.grid[r][c] != '':
-                    # Keep the friendly message instead of showing technical details
-                    if self.win_label.cget("text") == "Welcome :3":
-                        self.win_label.config(text="Good Luck! :3")
-                    return False
-
-        corner_checks = {
-            'yellow': [(1, 1), (1, 2), (2, 1)],
-            'blue': [(1, 4), (1, 3), (2, 4)],
-            'red': [(4, 1), (3, 1), (4, 2)],
-            'green': [(4, 4), (3, 4), (4, 3)],
-        }
-
-        for color, positions in corner_checks.items():
-            for r, c in positions:
-                if self.grid[r][c] != COLOR_CHARS[color]:
-                    # Keep the friendly message instead of showing technical details
-                    if self.win_label.cget("text") == "Welcome :3":
-                        self.win_label.config(text="Good Luck! :3")
-                    return False
+        if not search.is_win(bitboard.encode(self.grid, self.extended)):
+            # Keep the friendly message instead of showing technical details
+            if self.win_label.cget("text") == "Welcome :3":
+                self.win_label.config(text="Good Luck! :3")
+            return False
 
         self.win_label.config(text="You Win!")
         return True
@@ -817,14 +583,27 @@ class PuzzleGame:
     def start_solving(self):
         if self.solving_in_progress:
             return
+        self.clear_playback()
+
+        state = bitboard.encode(self.grid, self.extended)
+        # A board solved before (or a symmetric image of it) needs no search
+        if self.solution_cache is not None:
+            cached = self.solution_cache.get(state)
+            if cached is not None:
+                self.on_solve_complete(cached.moves, from_cache=True)
+                return
+        # Nor does a board that provably has no solution
+        reason = feasibility.unsolvable_reason(state)
+        if reason is not None:
+            self.on_solve_complete(None, reason)
+            return
         
         self.solving_in_progress = True
         
-        # Initialize progress tracking
+        # Initialize progress tracking: the solver process sends SolverStats
+        # snapshots over a pipe and update_solver_progress reads them
         self.solver_start_time = time.time()
-        self.best_heuristic_seen = float('inf')
-        self.progress_percentage = 0
-        self.progress_cap = random.randint(93, 99)  # Random cap between 93-99%
+        self.latest_solver_stats = None
         
         # Update UI to show solving state
         self.solve_button.config(state="disabled")
@@ -834,46 +613,47 @@ class PuzzleGame:
         self.mode_menu.config(state="disabled")
         
         # Update display
-        self.win_label.config(text="Solving puzzle... 0%")
+        self.win_label.config(text="Solving puzzle...")
         self.solution_text.config(state="normal")
         self.solution_text.delete("1.0", tk.END)
-        self.solution_text.insert(tk.END, "🔍 Searching for optimal solution...\n\nProgress: 0%")
+        self.solution_text.insert(tk.END, "🔍 Searching for optimal solution...")
         self.solution_text.config(state="disabled")
         
         # Lock the UI visually BEFORE starting the solver
         self.draw_grid()
         self.root.update()  # Force UI update to show the lock immediately
         
-        # Start solver thread
-        self.solver_thread = threading.Thread(target=self.solve_in_background)
-        self.solver_thread.daemon = True
-        self.solver_thread.start()
+        # Start the solver in its own process, so the search gets a whole core
+        # and never holds the GIL the Tk mainloop needs
+        self.solver_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        self.solver_process = multiprocessing.Process(target=solver_process, args=(child_conn, state, self.profile))
+        self.solver_process.start()
+        child_conn.close()  # the child has its own copy; EOF then means it exited
         
         # Start progress updates
         self.update_solver_progress()
 
-    def solve_in_background(self):
-        try:
-            solution = self.solve_puzzle()
-            # Use after to safely update UI from background thread
-            self.root.after(0, self.on_solve_complete, solution)
-        except Exception as e:
-            self.root.after(0, self.on_solve_error, str(e))
-
-    def on_solve_complete(self, solution):
+    def stop_solver(self):
+        """Terminate the solver process if it runs and forget its progress"""
+        if self.solver_process is not None:
+            if self.solver_process.is_alive():
+                self.solver_process.terminate()
+            self.solver_process.join()
+            self.solver_conn.close()
+            self.solver_process = None
+            self.solver_conn = None
+        self.latest_solver_stats = None
+
+    def quit_game(self):
+        # A running solver would keep the program alive after the window closes
+        self.stop_solver()
+        self.root.quit()
+
+    def on_solve_complete(self, solution, reason=None, from_cache=False):
         self.solving_in_progress = False
         
-        # Clean up progress tracking
-        if hasattr(self, 'current_solver_grid'):
-            delattr(self, 'current_solver_grid')
-        if hasattr(self, 'best_heuristic_seen'):
-            delattr(self, 'best_heuristic_seen')
-        if hasattr(self, 'progress_percentage'):
-            delattr(self, 'progress_percentage')
-        if hasattr(self, 'progress_cap'):
-            delattr(self, 'progress_cap')
-        if hasattr(self, 'solver_start_time'):
-            delattr(self, 'solver_start_time')
+        # Stop the solver process and clean up progress tracking
+        self.stop_solver()
         
         # Re-enable UI
         self.solve_button.config(state="normal")
@@ -881,45 +661,29 @@ class PuzzleGame:
         self.start_button.config(state="normal")
         self.mode_menu.config(state="normal")
         
-        # Update solution display
-        self.solution_text.config(state="normal")
-        self.solution_text.delete("1.0", tk.END)
-        
         if solution is None:
-            self.solution_text.insert(tk.END, "❌ No solution found within the search limit.\n\nTry a different puzzle configuration.")
-            self.current_solution = None
-            self.current_solution_moves = None
-            self.next_move_button.config(state="disabled")
+            self.clear_playback()
+            self.solution_text.config(state="normal")
+            self.solution_text.delete("1.0", tk.END)
+            if reason is not None:
+                self.solution_text.insert(tk.END, f"❌ This puzzle cannot be solved: {reason}.\n\nTry a different puzzle configuration.")
+            else:
+                self.solution_text.insert(tk.END, "❌ No solution found within the search limit.\n\nTry a different puzzle configuration.")
+            self.solution_text.config(state="disabled")
             self.win_label.config(text="No solution found. Try another configuration.")
         else:
-            move_texts = []
-            for idx, move in enumerate(solution):
-                action, r, c = move
-                move_texts.append(f"{idx+1:3d}. {action.title()} {self.piston_name((r, c))}")
-            self.solution_text.insert(tk.END, f"✅ Solution found! ({len(move_texts)} moves)\n\n")
-            self.solution_text.insert(tk.END, "\n".join(move_texts))
-            self.current_solution = move_texts
-            self.current_solution_moves = solution.copy()
-            self.next_move_button.config(state="normal")
-            self.win_label.config(text=f"Solution ready! {len(solution)} moves to solve.")
+            # Only store fresh solutions; a cache hit is already stored
+            if self.solution_cache is not None and not from_cache:
+                self.solution_cache.put(bitboard.encode(self.grid, self.extended), solution)
+            self.show_playback(solution)
         
-        self.solution_text.config(state="disabled")
         self.draw_grid()
 
     def on_solve_error(self, error_msg):
         self.solving_in_progress = False
         
-        # Clean up progress tracking
-        if hasattr(self, 'current_solver_grid'):
-            delattr(self, 'current_solver_grid')
-        if hasattr(self, 'best_heuristic_seen'):
-            delattr(self, 'best_heuristic_seen')
-        if hasattr(self, 'progress_percentage'):
-            delattr(self, 'progress_percentage')
-        if hasattr(self, 'progress_cap'):
-            delattr(self, 'progress_cap')
-        if hasattr(self, 'solver_start_time'):
-            delattr(self, 'solver_start_time')
+        # Stop the solver process and clean up progress tracking
+        self.stop_solver()
         
         # Re-enable UI
         self.solve_button.config(state="normal")
@@ -941,17 +705,8 @@ class PuzzleGame:
         
         self.solving_in_progress = False
         
-        # Clean up progress tracking
-        if hasattr(self, 'current_solver_grid'):
-            delattr(self, 'current_solver_grid')
-        if hasattr(self, 'best_heuristic_seen'):
-            delattr(self, 'best_heuristic_seen')
-        if hasattr(self, 'progress_percentage'):
-            delattr(self, 'progress_percentage')
-        if hasattr(self, 'progress_cap'):
-            delattr(self, 'progress_cap')
-        if hasattr(self, 'solver_start_time'):
-            delattr(self, 'solver_start_time')
+        # Stop the solver process and clean up progress tracking
+        self.stop_solver()
         
         # Re-enable UI
         self.solve_button.config(state="normal")
@@ -969,448 +724,244 @@ class PuzzleGame:
         self.draw_grid()
 
     def update_solver_progress(self):
-        if self.solving_in_progress:
+        if not self.solving_in_progress:
+            return
+
+        # Read everything the solver process sent since the last check:
+        # keep the newest snapshot and stop at the result
+        new_stats = False
+        try:
+            while self.solver_conn.poll():
+                kind, payload = self.solver_conn.recv()
+                if kind == 'stats':
+                    self.latest_solver_stats = payload
+                    new_stats = True
+                elif kind == 'done':
+                    self.on_solve_complete(payload)
+                    return
+                else:
+                    self.on_solve_error(payload)
+                    return
+        except (EOFError, OSError):
+            # The process died without a result, e.g. killed for running out of memory
+            process = self.solver_process
+            process.join(timeout=1)
+            self.on_solve_error(f"the solver process exited unexpectedly (exit code {process.exitcode})")
+            return
+
+        stats = self.latest_solver_stats
+        if new_stats or stats is None:
             elapsed = time.time() - self.solver_start_time
-            
-            # Calculate progress based on time with some heuristic influence
-            progress_text = "Solving puzzle... 0%"
-            estimated_time = "~35 seconds"
-            
-            # More conservative progress calculation
-            if hasattr(self, 'current_solver_grid'):
-                current_heuristic = self.heuristic(self.current_solver_grid)
-                
-                # Update best heuristic if we found a better state
-                if current_heuristic < self.best_heuristic_seen:
-                    self.best_heuristic_seen = current_heuristic
-                    # Print detailed progress to terminal for developers
-                    corners_solved, colors_with_2plus = self.get_solver_progress(self.current_solver_grid)
-                    print(f"[Solver] New best state: heuristic={self.best_heuristic_seen}, corners={corners_solved}/4, groups={colors_with_2plus}/4", flush=True)
-                
-                # More realistic progress calculation
-                # Base progress primarily on heuristic with time as secondary factor
-                initial_heuristic = 30  # Rough average starting point
-                heuristic_progress = 0
-                if self.best_heuristic_seen < initial_heuristic:
-                    heuristic_progress = ((initial_heuristic - self.best_heuristic_seen) / initial_heuristic) * 60  # Heuristic contributes up to 60%
-                
-                # Time-based component for realism
-                time_factor = min(elapsed / 35.0, 1.0)  # 35 seconds average
-                time_progress = time_factor * 40  # Time contributes up to 40%
-                
-                # Combine heuristic and time progress
-                base_progress = heuristic_progress + time_progress
-                
-                # Apply smoothing to prevent big jumps
-                new_percentage = int(base_progress)
-                
-                # Gradual progress increase (max 5% jump per update)
-                if new_percentage > self.progress_percentage:
-                    self.progress_percentage = min(self.progress_percentage + 5, new_percentage)
-                
-                # Cap at random percentage until actually solved
-                self.progress_percentage = min(self.progress_percentage, self.progress_cap)
-                
-                # Adjust estimated time based on progress
-                if self.progress_percentage > 0:
-                    remaining = max(1, int((25 * (100 - self.progress_percentage)) / 100))
-                    estimated_time = f"~{remaining} seconds"
-                elif elapsed > 10:
-                    estimated_time = "~15-30 seconds"
-                
-                progress_text = f"Solving puzzle... {self.progress_percentage}%"
-            
-            # Update UI with clean progress display
-            self.win_label.config(text=progress_text)
-            
-            # Update solution text with simple progress info
+            if stats is not None:
+                self.win_label.config(text=f"Solving puzzle... {stats.nodes_expanded:,} nodes")
+            else:
+                self.win_label.config(text="Solving puzzle...")
+
+            # Show the solver's own telemetry
             self.solution_text.config(state="normal")
             self.solution_text.delete("1.0", tk.END)
             self.solution_text.insert(tk.END, "🔍 Searching for optimal solution...\n\n")
-            self.solution_text.insert(tk.END, f"Progress: {self.progress_percentage}%\n")
             self.solution_text.insert(tk.END, f"Elapsed: {elapsed:.1f}s\n")
-            self.solution_text.insert(tk.END, f"Estimated time: {estimated_time}\n\n")
-            
+            if stats is not None:
+                self.solution_text.insert(tk.END, f"Nodes expanded: {stats.nodes_expanded:,} ({stats.nodes_per_second:,.0f}/s)\n")
+                self.solution_text.insert(tk.END, f"Open list: {stats.open_size:,}\n")
+                self.solution_text.insert(tk.END, f"Visited: {stats.visited_size:,}\n")
+                self.solution_text.insert(tk.END, f"f-bound: {stats.f_bound}\n")
+                self.solution_text.insert(tk.END, f"Best heuristic: {stats.best_heuristic}\n")
+                self.solution_text.insert(tk.END, f"Memory: ~{stats.memory_bytes / 1e6:.1f} MB\n")
+
             self.solution_text.config(state="disabled")
-            
-            # Schedule next update
-            self.root.after(500, self.update_solver_progress)
+
+        # Check often so a finished solve shows up at once; the text above
+        # only changes when the solver publishes a snapshot
+        self.root.after(PROGRESS_POLL_MS, self.update_solver_progress)
 
     def do_next_move(self):
-        # Play the next move in the current solution, update board and solution display
-        if not hasattr(self, 'current_solution_moves') or not self.current_solution_moves:
+        # Play the next move in the current solution
+        if self.playback is None or not self.playback.remaining:
             return
-        
-        # Get and execute the next move
-        move = self.current_solution_moves.pop(0)
-        action, r, c = move
-        if action == 'extend':
-            self.extend_piston(r, c)
-        elif action == 'retract':
-            self.retract_piston(r, c)
-        
-        self.draw_grid()
-        puzzle_solved = self.check_win()  # Check if puzzle is solved after the move
-        
-        # Update solution display to show only remaining moves
+        self.stop_autoplay()
+        self.seek_solution(self.playback.step + 1)
+
+    def show_playback(self, moves):
+        """List a solution of the current board and enable the playback controls"""
+        self.clear_playback()
+        self.playback = Playback(bitboard.encode(self.grid, self.extended), moves)
+        # The move list is written once; stepping only moves the highlights
+        move_texts = [f"{idx+1:3d}. {action.title()} {self.piston_name((r, c))}"
+                      for idx, (action, r, c) in enumerate(self.playback.moves)]
         self.solution_text.config(state="normal")
         self.solution_text.delete("1.0", tk.END)
-        
+        self.solution_text.insert(tk.END, f"✅ Solution found! ({len(move_texts)} moves)\n\n")
+        self.solution_text.insert(tk.END, "\n".join(move_texts))
+        self.solution_text.tag_config("done", foreground="gray")
+        self.solution_text.tag_config("next", background="lightyellow")
+        self.solution_text.config(state="disabled")
+        self.step_scale.config(to=len(move_texts))
+        self.render_playback()
+
+    def clear_playback(self):
+        """Forget the current solution and disable the playback controls"""
+        self.stop_autoplay()
+        if self.render_job is not None:
+            self.root.after_cancel(self.render_job)
+            self.render_job = None
+        self.playback = None
+        self.step_scale.config(to=0)
+        self.update_playback_controls()
+
+    def update_playback_controls(self):
+        more = "normal" if self.playback is not None and self.playback.remaining else "disabled"
+        self.next_move_button.config(state=more)
+        self.end_button.config(state=more)
+        self.play_button.config(state=more, text="Pause" if self.autoplaying else "Play")
+        self.step_scale.config(state="normal" if self.playback is not None else "disabled")
+
+    def seek_solution(self, step):
+        """
+        Show the board after step moves of the solution. Redraws are deferred
+        to the next idle moment, so a burst of seeks (autoplay, dragging the
+        slider) costs one redraw
+        """
+        if self.playback is None or self.solving_in_progress:
+            return
+        self.load_state(self.playback.seek(step))
+        if self.render_job is None:
+            self.render_job = self.root.after_idle(self.render_playback)
+
+    def render_playback(self):
+        """Bring the board, move list and controls up to the playback's step"""
+        self.render_job = None
+        if self.playback is None:
+            return
+        self.draw_grid()
+        puzzle_solved = self.check_win()
+        step = self.playback.step
+        remaining = self.playback.remaining
+        if not puzzle_solved:
+            # check_win leaves the label alone, and it may still say "You Win!"
+            # from a later step
+            self.win_label.config(text=f"Solution ready! {remaining} moves to solve.")
+
+        text = self.solution_text
+        text.config(state="normal")
         if puzzle_solved:
-            # Puzzle is solved! Show congratulations message
-            self.solution_text.insert(tk.END, "🎉 Congratulations! Puzzle solved!\n\n")
-            self.solution_text.insert(tk.END, "The solution has been completed successfully.")
-            self.current_solution = None
-            self.current_solution_moves = None
-            self.next_move_button.config(state="disabled")
-        elif not self.current_solution_moves:
+            header = "🎉 Congratulations! Puzzle solved!"
+        elif step == 0:
+            header = f"✅ Solution found! ({len(self.playback.moves)} moves)"
+        elif not remaining:
             # All moves completed but puzzle not solved (shouldn't happen with correct solutions)
-            self.solution_text.insert(tk.END, "✅ All moves completed!")
-            self.current_solution = None
-            self.next_move_button.config(state="disabled")
+            header = "✅ All moves completed!"
         else:
-            # Show remaining moves with updated numbering
-            move_texts = []
-            for idx, remaining_move in enumerate(self.current_solution_moves):
-                remaining_action, remaining_r, remaining_c = remaining_move
-                move_texts.append(f"{idx+1:3d}. {remaining_action.title()} {self.piston_name((remaining_r, remaining_c))}")
-            
-            self.solution_text.insert(tk.END, f"📝 Solution ({len(move_texts)} moves left):\n\n")
-            self.solution_text.insert(tk.END, "\n".join(move_texts))
-            self.current_solution = move_texts
-        
-        self.solution_text.config(state="disabled")
+            header = f"📝 Solution ({remaining} moves left):"
+        text.delete("1.0", "1.end")
+        text.insert("1.0", header)
+        # Played moves in gray and the next one highlighted: a few tag
+        # changes per frame, however long the solution
+        next_line = FIRST_MOVE_LINE + step
+        text.tag_remove("done", f"{FIRST_MOVE_LINE}.0", tk.END)
+        text.tag_remove("next", f"{FIRST_MOVE_LINE}.0", tk.END)
+        text.tag_add("done", f"{FIRST_MOVE_LINE}.0", f"{next_line}.0")
+        if remaining:
+            text.tag_add("next", f"{next_line}.0", f"{next_line + 1}.0")
+            text.see(f"{next_line}.0")
+        text.config(state="disabled")
+
+        # Remember what the slider shows so its change callback can tell our
+        # own updates from the user dragging it
+        self.scale_step = step
+        self.step_scale.set(step)
+        if not remaining:
+            self.autoplaying = False
+        self.update_playback_controls()
+
+    def on_scrub(self, value):
+        step = int(float(value))
+        if self.playback is None or step == self.scale_step:
+            return
+        self.stop_autoplay()
+        self.scale_step = step
+        self.seek_solution(step)
 
-    def get_possible_moves(self, grid, extended, piston_heads):
-        moves = []
-        for (r, c), dir_char in PISTON_DIRS.items():
-            # Try extend
-            if not extended[(r, c)]:
-                dr, dc = DIR_OFFSETS[dir_char]
-                head_r, head_c = r + dr, c + dc
-                if not (1 <= head_r <= 4 and 1 <= head_c <= 4):
-                    continue
-                if (head_r, head_c) in piston_heads:
-                    continue
-                cell = grid[head_r][head_c]
-                if cell == '':
-                    moves.append(('extend', r, c))
-                else:
-                    # Try to push chain
-                    positions = []
-                    rr, cc = head_r, head_c
-                    while True:
-                        if not (1 <= rr <= 4 and 1 <= cc <= 4):
-                            positions = None
-                            break
-                        cell2 = grid[rr][cc]
-                        if (rr, cc) in piston_heads:
-                            positions = None
-                            break
-                        if cell2 in COLOR_CHARS.values():
-                            positions.append((rr, cc))
-                            rr += dr
-                            cc += dc
-                            continue
-                        elif cell2 == '':
-                            break
-                        else:
-                            positions = None
-                            break
-                    if positions is not None:
-                        moves.append(('extend', r, c))
-            else:
-                # Try retract
-                moves.append(('retract', r, c))
-        return moves
-
-    def apply_move(self, grid, extended, piston_heads, move):
-        # Deepcopy all structures
-        grid = copy.deepcopy(grid)
-        extended = copy.deepcopy(extended)
-        piston_heads = copy.deepcopy(piston_heads)
-        action, r, c = move
-        dir_char = grid[r][c]
-        dr, dc = DIR_OFFSETS[dir_char]
-        head_r, head_c = r + dr, c + dc
-        if action == 'extend':
-            if grid[head_r][head_c] == '':
-                extended[(r, c)] = True
-                piston_heads[(head_r, head_c)] = (r, c)
-            else:
-                # Push chain
-                chain = []
-                rr, cc = head_r, head_c
-                while True:
-                    if not (1 <= rr <= 4 and 1 <= cc <= 4):
-                        return grid, extended, piston_heads  # Invalid
-                    cell2 = grid[rr][cc]
-                    if (rr, cc) in piston_heads:
-                        return grid, extended, piston_heads
-                    if cell2 in COLOR_CHARS.values():
-                        chain.append((rr, cc))
-                        rr += dr
-                        cc += dc
-                        continue
-                    elif cell2 == '':
-                        break
-                    else:
-                        return grid, extended, piston_heads
-                for rr, cc in reversed(chain):
-                    new_r, new_c = rr + dr, cc + dc
-                    grid[new_r][new_c] = grid[rr][cc]
-                    grid[rr][cc] = ''
-                extended[(r, c)] = True
-                piston_heads[(head_r, head_c)] = (r, c)
-        elif action == 'retract':
-            if (head_r, head_c) in piston_heads:
-                del piston_heads[(head_r, head_c)]
-            sticky_r, sticky_c = head_r + dr, head_c + dc
-            if 1 <= sticky_r <= 4 and 1 <= sticky_c <= 4:
-                block = grid[sticky_r][sticky_c]
-                if block in COLOR_CHARS.values():
-                    grid[head_r][head_c] = block
-                    grid[sticky_r][sticky_c] = ''
-                else:
-                    grid[head_r][head_c] = ''
-            else:
-                grid[head_r][head_c] = ''
-            extended[(r, c)] = False
-        return grid, extended, piston_heads
-
-    def is_win(self, grid):
-        # Use your check_win logic, but return True/False only
-        for r in range(2, 4):
-            for c in range(2, 4):
-                if grid[r][c] != '':
-                    return False
-        corner_checks = {
-            'yellow': [(1, 1), (1, 2), (2, 1)],
-            'blue': [(1, 4), (1, 3), (2, 4)],
-            'red': [(4, 1), (3, 1), (4, 2)],
-            'green': [(4, 4), (3, 4), (4, 3)],
-        }
-        for color, positions in corner_checks.items():
-            for r, c in positions:
-                if grid[r][c] != COLOR_CHARS[color]:
-                    return False
-        return True
-    
-    def piston_name(self, pos):
-        r, c = pos
-        if r == 0:
-            return f"top{c}"
-        elif r == 5:
-            return f"bottom{c}"
-        elif c == 0:
-            return f"left{r}"
-        elif c == 5:
-            return f"right{r}"
+    def toggle_autoplay(self):
+        if self.autoplaying:
+            self.stop_autoplay()
         else:
-            return f"({r},{c})"
-
-
-    def compact_state_key(self, grid_tuple, ext_mask):
-        # grid_tuple: flat tuple of 36 chars (row-major)
-        # ext_mask: 16-bit int, 1 if piston extended
-        return (grid_tuple, ext_mask)
-
-    @functools.lru_cache(maxsize=32768)
-    def cached_heuristic(self, grid_tuple, ext_mask):
-        # grid_tuple: flat tuple of 36 chars
-        grid = [list(grid_tuple[i*GRID_SIZE:(i+1)*GRID_SIZE]) for i in range(GRID_SIZE)]
-        dist = self.heuristic(grid) + bin(ext_mask).count('1')
-        return dist
-
-    def solve_puzzle(self, max_depth=100):
-        start_time = time.time()
-        initial_grid = [row[:] for row in self.grid]
-        
-        # Initialize progress tracking
-        self.best_heuristic_seen = self.heuristic(initial_grid)
-        
-        def flat_grid(grid):
-            return tuple(cell for row in grid for cell in row)
-        initial_extended = self.extended.copy()
-        initial_piston_heads = self.piston_heads.copy()
-        heap = []
-        counter = itertools.count()
-        # For cycle detection, keep a dict of state: min moves to reach
-        visited = {}
-        # For undo-move penalty, keep last move in path
-        heapq.heappush(heap, (self.heuristic(initial_grid), 0, next(counter), initial_grid, initial_extended, initial_piston_heads, [], None))
-        visited[(flat_grid(initial_grid), tuple(sorted(initial_extended.items())), tuple(sorted(initial_piston_heads.items())))] = 0
-        node_count = 0
-        self.current_solver_grid = initial_grid  # Track current best grid for progress
-        while heap and self.solving_in_progress:  # Check for cancellation
-            priority, moves_so_far, _, grid, extended, piston_heads, path, last_move = heapq.heappop(heap)
-            
-            # Update progress tracking with current best grid and heuristic
-            current_heuristic = self.heuristic(grid)
-            if current_heuristic < self.best_heuristic_seen:
-                self.best_heuristic_seen = current_heuristic
-                self.current_solver_grid = grid  # Update to best grid found
-            
-            node_count += 1
-            if node_count % 5000 == 0:
-                elapsed = time.time() + 1e-9 - start_time
-                print(f"[Solver] {node_count} nodes expanded in {elapsed:.2f} seconds, best heuristic: {self.best_heuristic_seen}...", flush=True)
-                # Check for cancellation more frequently during long searches
-                if not self.solving_in_progress:
-                    return None
-            if moves_so_far > max_depth:
-                continue
-            if self.is_win(grid):
-                elapsed = time.time() - start_time
-                print(f"[Solver] Solution found in {elapsed:.2f} seconds, {moves_so_far} moves.", flush=True)
-                return path
-            for move in self.get_possible_moves(grid, extended, piston_heads):
-                if not self.solving_in_progress:  # Check for cancellation
-                    return None
-                new_grid = [row[:] for row in grid]
-                new_extended = extended.copy()
-                new_piston_heads = piston_heads.copy()
-                new_grid, new_extended, new_piston_heads = self.apply_move(new_grid, new_extended, new_piston_heads, move)
-                key = (flat_grid(new_grid), tuple(sorted(new_extended.items())), tuple(sorted(new_piston_heads.items())))
-                # Undo-move penalty: if move undoes last move, add penalty
-                undo_penalty = 0
-                if last_move is not None:
-                    # If this move is the exact inverse of last move, penalize
-                    last_action, last_r, last_c = last_move
-                    action, r, c = move
-                    if action != last_action and r == last_r and c == last_c:
-                        undo_penalty += 3  # Penalize immediate undo
-                # Cycle detection: if we've seen this state with fewer or equal moves, skip
-                if key in visited and visited[key] <= moves_so_far + 1:
-                    continue
-                visited[key] = moves_so_far + 1
-                priority = moves_so_far + 1 + self.heuristic(new_grid) + undo_penalty
-                heapq.heappush(heap, (priority, moves_so_far + 1, next(counter), new_grid, new_extended, new_piston_heads, path + [move], move))
-        
-        if not self.solving_in_progress:
-            return None  # Cancelled
-        
-        elapsed = time.time() - start_time
-        print(f"[Solver] No solution found in {elapsed:.2f} seconds.", flush=True)
-        return None
-
-    def get_possible_moves_immutable(self, grid_tuple, ext_mask, piston_heads_frozen):
-        # grid_tuple: flat tuple of 36 chars
-        # ext_mask: 16-bit int
-        # piston_heads_frozen: frozenset of ((hr, hc), (pr, pc))
-        moves = []
-        piston_heads = dict(piston_heads_frozen)
-        piston_idx_map = {k: i for i, k in enumerate(sorted(PISTON_DIRS.keys()))}
-        for (r, c), dir_char in PISTON_DIRS.items():
-            idx = piston_idx_map[(r, c)]
-            is_ext = (ext_mask >> idx) & 1
-            dr, dc = DIR_OFFSETS[dir_char]
-            head_r, head_c = r + dr, c + dc
-            if not is_ext:
-                if not (1 <= head_r <= 4 and 1 <= head_c <= 4):
-                    continue
-                if (head_r, head_c) in piston_heads:
-                    continue
-                cell = grid_tuple[head_r * GRID_SIZE + head_c]
-                if cell == '.' or cell == '':
-                    moves.append(('extend', r, c))
-                else:
-                    # Try to push chain
-                    positions = []
-                    rr, cc = head_r, head_c
-                    while True:
-                        if not (1 <= rr <= 4 and 1 <= cc <= 4):
-                            positions = None
-                            break
-                        cell2 = grid_tuple[rr * GRID_SIZE + cc]
-                        if (rr, cc) in piston_heads:
-                            positions = None
-                            break
-                        if cell2 in COLOR_CHARS.values():
-                            positions.append((rr, cc))
-                            rr += dr
-                            cc += dc
-                            continue
-                        elif cell2 == '.' or cell2 == '':
-                            break
-                        else:
-                            positions = None
-                            break
-                    if positions is not None:
-                        moves.append(('extend', r, c))
-            else:
-                moves.append(('retract', r, c))
-        return moves
-
-    def apply_move_immutable(self, grid_tuple, ext_mask, piston_heads_frozen, move):
-        # Returns new_grid_tuple, new_ext_mask, new_piston_heads_frozen
-        action, r, c = move
-        piston_idx_map = {k: i for i, k in enumerate(sorted(PISTON_DIRS.keys()))}
-        dir_char = self.grid[r][c]  # grid layout is static for pistons
-        dr, dc = DIR_OFFSETS[dir_char]
-        head_r, head_c = r + dr, c + dc
-        grid = [list(grid_tuple[i*GRID_SIZE:(i+1)*GRID_SIZE]) for i in range(GRID_SIZE)]
-        extended = {}
-        for i, k in enumerate(sorted(PISTON_DIRS.keys())):
-            extended[k] = bool((ext_mask >> i) & 1)
-        piston_heads = dict(piston_heads_frozen)
-        if action == 'extend':
-            if grid[head_r][head_c] == '.' or grid[head_r][head_c] == '':
-                extended[(r, c)] = True
-                piston_heads[(head_r, head_c)] = (r, c)
-            else:
-                # Push chain
-                chain = []
-                rr, cc = head_r, head_c
-                while True:
-                    if not (1 <= rr <= 4 and 1 <= cc <= 4):
-                        return grid_tuple, ext_mask, piston_heads_frozen  # Invalid
-                    cell2 = grid[rr][cc]
-                    if (rr, cc) in piston_heads:
-                        return grid_tuple, ext_mask, piston_heads_frozen
-                    if cell2 in COLOR_CHARS.values():
-                        chain.append((rr, cc))
-                        rr += dr
-                        cc += dc
-                        continue
-                    elif cell2 == '.' or cell2 == '':
-                        break
-                    else:
-                        return grid_tuple, ext_mask, piston_heads_frozen
-                for rr, cc in reversed(chain):
-                    new_r, new_c = rr + dr, cc + dc
-                    grid[new_r][new_c] = grid[rr][cc]
-                    grid[rr][cc] = '.'
-                extended[(r, c)] = True
-                piston_heads[(head_r, head_c)] = (r, c)
-        elif action == 'retract':
-            if (head_r, head_c) in piston_heads:
-                del piston_heads[(head_r, head_c)]
-            sticky_r, sticky_c = head_r + dr, head_c + dc
-            if 1 <= sticky_r <= 4 and 1 <= sticky_c <= 4:
-                block = grid[sticky_r][sticky_c]
-                if block in COLOR_CHARS.values():
-                    grid[head_r][head_c] = block
-                    grid[sticky_r][sticky_c] = '.'
-                else:
-                    grid[head_r][head_c] = '.'
-            else:
-                grid[head_r][head_c] = '.'
-            extended[(r, c)] = False
-        # Convert back to compact types
-        new_grid_tuple = tuple(cell if cell else '.' for row in grid for cell in row)
-        new_ext_mask = 0
-        for i, k in enumerate(sorted(PISTON_DIRS.keys())):
-            if extended[k]:
-                new_ext_mask |= (1 << i)
-        new_piston_heads_frozen = frozenset(piston_heads.items())
-        return new_grid_tuple, new_ext_mask, new_piston_heads_frozen
-
+            self.start_autoplay()
 
+    def start_autoplay(self):
+        if self.playback is None or not self.playback.remaining:
+            return
+        self.autoplaying = True
+        # Play the first move right away, then keep to the chosen speed
+        self.playback_credit = 1.0
+        self.playback_clock = time.perf_counter()
+        self.playback_frame()
+
+    def stop_autoplay(self):
+        if self.playback_job is not None:
+            self.root.after_cancel(self.playback_job)
+            self.playback_job = None
+        if self.autoplaying:
+            self.autoplaying = False
+            self.update_playback_controls()
+
+    def playback_frame(self):
+        """Play every move due since the last frame, redrawing once, then schedule the next frame"""
+        self.playback_job = None
+        now = time.perf_counter()
+        self.playback_credit += (now - self.playback_clock) * PLAYBACK_SPEEDS[self.playback_speed.get()]
+        self.playback_clock = now
+        due = int(self.playback_credit)
+        if due:
+            self.playback_credit -= due
+            self.seek_solution(self.playback.step + due)
+        if self.playback.remaining:
+            self.playback_job = self.root.after(FRAME_MS, self.playback_frame)
+        else:
+            self.autoplaying = False
 
+    def piston_name(self, pos):
+        return bitboard.piston_name(pos)
+
+
+def solve_puzzle(state, profile=None, max_depth=100, method='astar', **options):
+    """
+    Solution moves of state, or None. profile is PuzzleGame.profile: None, or
+    '' to print a solver profile, or a path to also write it as a pstats file
+    """
+    profiler = Profiler() if profile is not None and method in search.PROFILED_SOLVERS else None
+    result = search.solve(
+        state,
+        method=method,  # 'hda' spreads the search over all cores
+        max_depth=max_depth,
+        log=lambda message: print(message, flush=True),
+        profiler=profiler,
+        **options,
+    )
+    if profiler is not None:
+        print(profiler.summary(), flush=True)
+        if profile:
+            profiler.dump_stats(profile)
+    return result.moves
+
+
+def solver_process(conn, state, profile=None):
+    """
+    Body of the game's solver process: sends ('stats', SolverStats) snapshots
+    over conn while searching, then ('done', moves) or ('error', message).
+    Cancelling terminates the process, so the search never polls for it
+    """
+    try:
+        moves = solve_puzzle(state, profile, on_stats=lambda stats: conn.send(('stats', stats)))
+        conn.send(('done', moves))
+    except Exception as e:
+        conn.send(('error', str(e)))
+    finally:
+        conn.close()
 
 
-def main():
+def main(profile=None):
     root = tk.Tk()
     root.title("4x4 Color Puzzle")
     
@@ -1441,8 +992,10 @@ def main():
         # If icon loading fails, just continue without icon
         print(f"Note: Could not load icon: {e}")
     
-    game = PuzzleGame(root)
+    game = PuzzleGame(root, profile=profile)
     root.mainloop()
 
 if __name__ == "__main__":
+    # Lets a frozen executable start solver worker processes (method='hda')
+    multiprocessing.freeze_support()
     main()
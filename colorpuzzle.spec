@@ -5,7 +5,7 @@ a = Analysis(
     ['colorpuzzle.py'],
     pathex=[],
     binaries=[],
-    datas=[('icon.ico', '.'), ('icon.png', '.')],
+    datas=[('icon.ico', '.'), ('icon.png', '.'), ('solver/pattern_db.bin', 'solver')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Generate boards with a certified optimal solution length, in parallel
+
+Usage: python generate_boards.py --length 12 16 20 [--count 10] [-o boards.jsonl]
+       [--workers N] [--seed 0] [--perimeter-depth 14] [--certify-depth 14]
+
+Output is one JSON record per board, {"board": ..., "length": ...}, written
+as soon as a worker finds it. Lengths must be even (see solver.generator).
+Lengths up to the perimeter depth come straight from a table; longer ones
+need a certifying search per candidate, which costs about 1.8x more per
+extra move. Lengths past perimeter depth + certify depth (28 with the
+defaults) cannot be certified and are refused; each extra 2 moves of
+--perimeter-depth or --certify-depth costs about 3x the start-up time or
+the time per board.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from solver import bitboard, generator
+
+# Per-process distance oracle, built once by the pool initializer
+_oracle = None
+
+
+def init_worker(perimeter_depth):
+    global _oracle
+    _oracle = generator.DistanceOracle(perimeter_depth)
+
+
+def generate_board(job):
+    """Record for one (length, seed, attempts, certify_depth) job"""
+    length, seed, attempts, certify_depth = job
+    start_time = time.time()
+    state = generator.generate(length, _oracle, random.Random(seed), attempts, certify_depth)
+    record = {"length": length, "seed": seed, "wall_time": round(time.time() - start_time, 4)}
+    if state is None:
+        record["error"] = f"no board found in {attempts} attempts"
+    else:
+        record["board"] = bitboard.format_board(state)
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate boards of known optimal solution length")
+    parser.add_argument("--length", type=int, nargs="+", required=True, help="optimal solution lengths to generate (even)")
+    parser.add_argument("--count", type=int, default=10, help="boards per length (default: 10)")
+    parser.add_argument("-o", "--output", help="write JSON lines here instead of stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--perimeter-depth", type=int, default=generator.DEFAULT_PERIMETER_DEPTH,
+                        help=f"exact distance table depth (default: {generator.DEFAULT_PERIMETER_DEPTH})")
+    parser.add_argument("--attempts", type=int, default=600, help="walks per board before giving up (default: 600)")
+    parser.add_argument("--certify-depth", type=int, default=generator.CERTIFY_DEPTH,
+                        help=f"forward layers of each certifying search (default: {generator.CERTIFY_DEPTH})")
+    args = parser.parse_args(argv)
+    odd = [length for length in args.length if length % 2]
+    if odd:
+        parser.error(f"lengths must be even, got {odd}")
+    longest = generator.max_length(args.perimeter_depth, args.certify_depth)
+    too_long = [length for length in args.length if length > longest]
+    if too_long:
+        parser.error(f"lengths past {longest} cannot be certified with --perimeter-depth {args.perimeter_depth} "
+                     f"and --certify-depth {args.certify_depth}, got {too_long}")
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    # One job per board, each with its own seed so runs are reproducible
+    jobs = [(length, args.seed * 1000003 + i * len(args.length) + j, args.attempts, args.certify_depth)
+            for i in range(args.count) for j, length in enumerate(args.length)]
+
+    start_time = time.time()
+    seen = set()
+    count = 0
+    try:
+        with multiprocessing.Pool(args.workers, init_worker, (args.perimeter_depth,)) as pool:
+            for record in pool.imap_unordered(generate_board, jobs):
+                # Two walks can land on the same board; keep the first
+                if record.get("board") in seen:
+                    continue
+                if "board" in record:
+                    seen.add(record["board"])
+                    count += 1
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.time() - start_time
+    print(f"Generated {count}/{len(jobs)} boards in {elapsed:.2f}s with {args.workers} workers", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ Launcher script for 4x4 Color Puzzle Game
 This script handles common issues and provides better error messages
 """
 
+import argparse
 import sys
 import os
 
@@ -29,6 +30,11 @@ def check_tkinter():
 
 def main():
     """Main launcher function"""
+    parser = argparse.ArgumentParser(description="Start the 4x4 Color Puzzle game")
+    parser.add_argument("--profile", nargs="?", const="", metavar="PATH",
+                        help="print a solver hot-path profile after each solve; with PATH, also write a pstats file")
+    args = parser.parse_args()
+
     print("4x4 Color Puzzle Game Launcher")
     print("=" * 40)
     
@@ -46,7 +52,7 @@ def main():
     try:
         print("Loading game...")
         from colorpuzzle import main as game_main
-        game_main()
+        game_main(profile=args.profile)
     except ImportError as e:
         print(f"Error: Could not import game: {e}")
         print("Make sure colorpuzzle.py is in the same directory")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Command-line solver for 4x4 Color Puzzle boards (no display needed)
+
+Usage: python solve_cli.py YGGRR..BB..YBGRY [--method astar|ida|bidirectional|hda|anytime]
+       [--workers N] [--time-limit SECONDS] [--max-nodes N] [--max-memory MB]
+       [--max-depth 100] [--verbose] [--stats SECONDS] [--profile [PATH]]
+
+The board is 16 cells in row-major order: Y, B, R, G for blocks and '.' for
+empty cells. All pistons start retracted.
+"""
+
+import argparse
+import sys
+
+from solver import bitboard, search
+from solver.profiling import Profiler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a 4x4 Color Puzzle board without the GUI")
+    parser.add_argument("board", help="16-cell board string, e.g. YGGRR..BB..YBGRY")
+    parser.add_argument("--max-depth", type=int, default=100, help="maximum solution length (default: 100)")
+    parser.add_argument("--method", choices=sorted(search.SOLVERS), default="astar", help="search algorithm (default: astar)")
+    parser.add_argument("--workers", type=int, help="worker processes for --method hda (default: all cores)")
+    parser.add_argument("--time-limit", type=float, metavar="SECONDS", help="stop searching after this long (anytime: keep the best so far)")
+    parser.add_argument("--max-nodes", type=int, help="stop after expanding this many nodes")
+    parser.add_argument("--max-memory", type=float, metavar="MB", help="stop when the solver's estimated memory passes this")
+    parser.add_argument("--verbose", action="store_true", help="print solver progress to stderr")
+    parser.add_argument("--stats", type=float, metavar="SECONDS", help="print solver telemetry to stderr at this interval")
+    parser.add_argument("--profile", nargs="?", const="", metavar="PATH",
+                        help="time the solver's hot paths and print a summary to stderr; with PATH, also write a pstats file")
+    args = parser.parse_args(argv)
+
+    try:
+        state = bitboard.parse_board(args.board)
+    except ValueError as e:
+        parser.error(str(e))
+
+    log = None
+    if args.verbose:
+        log = lambda message: print(message, file=sys.stderr, flush=True)
+
+    options = {'time_limit': args.time_limit, 'max_nodes': args.max_nodes}
+    if args.max_memory is not None:
+        options['max_memory'] = int(args.max_memory * 1e6)
+    if args.stats:
+        options['on_stats'] = lambda stats: print(f"[Stats] {stats.format()}", file=sys.stderr, flush=True)
+        options['stats_interval'] = args.stats
+    if args.method == 'hda':
+        options['workers'] = args.workers
+    if args.profile is not None:
+        if args.method not in search.PROFILED_SOLVERS:
+            parser.error(f"--profile supports --method {' or '.join(sorted(search.PROFILED_SOLVERS))}")
+        options['profiler'] = Profiler()
+    result = search.solve(state, method=args.method, max_depth=args.max_depth, log=log, **options)
+    if args.profile is not None:
+        print(options['profiler'].summary(), file=sys.stderr, flush=True)
+        if args.profile:
+            options['profiler'].dump_stats(args.profile)
+    if not result.solved:
+        reason = result.reason or {
+            search.EXHAUSTED: f"no solution within {args.max_depth} moves",
+            search.BUDGET_EXCEEDED: f"{result.budget} budget exceeded",
+            search.CANCELLED: "cancelled",
+        }[result.status]
+        print(f"No solution found: {reason} ({result.nodes_expanded} nodes, {result.elapsed:.2f}s, "
+              f"best heuristic {result.best_heuristic})")
+        return 1
+
+    optimal = " (optimal)" if result.optimal else ""
+    print(f"Solution found: {len(result.moves)} moves{optimal} ({result.nodes_expanded} nodes, {result.elapsed:.2f}s)")
+    for idx, (action, r, c) in enumerate(result.moves):
+        print(f"{idx+1:3d}. {action.title()} {bitboard.piston_name((r, c))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Headless rules and solver for the 4x4 Color Puzzle (no tkinter required)."""
@@ -0,0 +1,424 @@
+"""
+Packed integer board state for the 4x4 Color Puzzle.
+
+A state is a single int:
+  bits 0-47   the 16 inner cells (row-major, 3 bits each, 0 = empty)
+  bits 48-63  the extension mask, one bit per piston in sorted(PISTON_DIRS) order
+
+Piston heads are not stored; an extended piston's head always sits on the
+first inner cell in front of it, so the head cells follow from the mask.
+"""
+
+import itertools
+
+# Colors for blocks
+COLORS = ['yellow', 'blue', 'red', 'green']
+COLOR_CHARS = {'yellow': 'Y', 'blue': 'B', 'red': 'R', 'green': 'G'}
+
+# Directions for pistons and their sticky faces
+PISTON_DIRS = {
+    (0, 1): 'v', (0, 2): 'v', (0, 3): 'v', (0, 4): 'v',
+    (5, 1): '^', (5, 2): '^', (5, 3): '^', (5, 4): '^',
+    (1, 0): '>', (2, 0): '>', (3, 0): '>', (4, 0): '>',
+    (1, 5): '<', (2, 5): '<', (3, 5): '<', (4, 5): '<',
+}
+
+DIR_OFFSETS = {
+    '>': (0, 1),
+    '<': (0, -1),
+    '^': (-1, 0),
+    'v': (1, 0),
+}
+
+# Goal cells for each color: the true corner plus its two neighbours
+GROUP_TARGETS = {
+    'Y': [(1, 1), (1, 2), (2, 1)],
+    'B': [(1, 4), (1, 3), (2, 4)],
+    'R': [(4, 1), (3, 1), (4, 2)],
+    'G': [(4, 4), (3, 4), (4, 3)],
+}
+
+# Cell codes: 0 is empty, colors are numbered in COLORS order starting at 1
+CELL_CHARS = [''] + [COLOR_CHARS[color] for color in COLORS]
+CHAR_CODES = {char: code for code, char in enumerate(CELL_CHARS) if char}
+
+EXT_SHIFT = 48
+CELLS_MASK = (1 << EXT_SHIFT) - 1
+
+# Bit index of each piston in the extension mask (same order as ext_mask elsewhere)
+PISTONS = sorted(PISTON_DIRS)
+PISTON_INDEX = {pos: i for i, pos in enumerate(PISTONS)}
+
+# Order in which moves are generated; matches iteration over PISTON_DIRS
+MOVE_ORDER = [PISTON_INDEX[pos] for pos in PISTON_DIRS]
+
+
+def cell_index(r, c):
+    """Index (0-15) of inner grid cell (r, c), where 1 <= r, c <= 4"""
+    return (r - 1) * 4 + (c - 1)
+
+
+def _piston_line(pos):
+    # Inner cells pushed by this piston, ordered from its head outwards
+    r, c = pos
+    dr, dc = DIR_OFFSETS[PISTON_DIRS[pos]]
+    cells = []
+    r, c = r + dr, c + dc
+    while 1 <= r <= 4 and 1 <= c <= 4:
+        cells.append(cell_index(r, c))
+        r, c = r + dr, c + dc
+    return cells
+
+
+PISTON_LINES = [_piston_line(pos) for pos in PISTONS]
+
+# Inner cell covered by each piston's head when extended
+HEAD_CELLS = [line[0] for line in PISTON_LINES]
+
+
+# --- Transition tables ---------------------------------------------------
+#
+# Every piston acts on one row or column of four cells. A line is packed as
+# 12 bits in natural order (left to right, top to bottom) and the head cells
+# lying on it as 4 bits. Pistons on the left/top push "forward" through the
+# line, pistons on the right/bottom push "backward". The tables below map
+# every (line, heads) combination to the resulting line, so applying a move
+# is a lookup plus a bit splice. They are small enough to build at import.
+
+LINE_MASK = 0xFFF
+COL_GATHER = 7 | 7 << 12 | 7 << 24 | 7 << 36
+
+
+def _line_result(line, heads, order, extending):
+    # Simulate one piston on a single packed line; None if the move is blocked
+    cells = [(line >> (3 * i)) & 7 for i in range(4)]
+    if not extending:
+        head, sticky = order[0], order[1]
+        if cells[sticky]:
+            cells[head], cells[sticky] = cells[sticky], 0
+    else:
+        end = None
+        for pos in order:
+            if heads & (1 << pos):
+                return None
+            if not cells[pos]:
+                end = pos
+                break
+        if end is None:
+            return None
+        i = order.index(end)
+        while i > 0:
+            cells[order[i]] = cells[order[i - 1]]
+            i -= 1
+        cells[order[0]] = 0
+    return sum(cell << (3 * i) for i, cell in enumerate(cells))
+
+
+def _build_tables(order):
+    extend_table = [-1] * (1 << 16)
+    retract_table = [-1] * (1 << 12)
+    for codes in itertools.product(range(5), repeat=4):
+        line = sum(code << (3 * i) for i, code in enumerate(codes))
+        retract_table[line] = _line_result(line, 0, order, False)
+        for heads in range(16):
+            # A head never shares a cell with a block
+            if any(codes[i] and heads & (1 << i) for i in range(4)):
+                continue
+            result = _line_result(line, heads, order, True)
+            if result is not None:
+                extend_table[line << 4 | heads] = result
+    return extend_table, retract_table
+
+
+FORWARD_TABLES = _build_tables((0, 1, 2, 3))
+BACKWARD_TABLES = _build_tables((3, 2, 1, 0))
+
+
+def _line_cells(k):
+    # Lines 0-3 are columns 1-4, lines 4-7 are rows 1-4
+    if k < 4:
+        return [cell_index(r, k + 1) for r in range(1, 5)]
+    return [cell_index(k - 3, c) for c in range(1, 5)]
+
+
+def _deposit_table(k):
+    cells = _line_cells(k)
+    table = []
+    for line in range(1 << 12):
+        value = 0
+        for i, cell in enumerate(cells):
+            value |= ((line >> (3 * i)) & 7) << (3 * cell)
+        table.append(value)
+    return table
+
+
+LINE_DEPOSIT = [_deposit_table(k) for k in range(8)]
+LINE_CLEAR = [~LINE_DEPOSIT[k][LINE_MASK] for k in range(8)]
+
+
+def _head_table(offset):
+    table = []
+    for byte in range(256):
+        mask = 0
+        for bit in range(8):
+            if byte & (1 << bit):
+                mask |= 1 << HEAD_CELLS[offset + bit]
+        table.append(mask)
+    return table
+
+
+HEADS_LO = _head_table(0)
+HEADS_HI = _head_table(8)
+
+
+def _move_spec(p):
+    r, c = PISTONS[p]
+    if r in (0, 5):
+        k = c - 1
+    else:
+        k = 3 + r
+    extend_table, retract_table = FORWARD_TABLES if r == 0 or c == 0 else BACKWARD_TABLES
+    return (p, 1 << (EXT_SHIFT + p), k, extend_table, retract_table,
+            LINE_CLEAR[k], LINE_DEPOSIT[k])
+
+
+MOVE_SPECS = [_move_spec(p) for p in MOVE_ORDER]
+PISTON_SPECS = [_move_spec(p) for p in range(len(PISTONS))]
+
+
+# --- Inverse transitions -------------------------------------------------
+#
+# Used to search backwards from the goal. INVERSE_EXTEND maps (resulting
+# line, other heads on the line) to every line an extend could have started
+# from; INVERSE_RETRACT maps a resulting line to every line a retract could
+# have started from (the piston's own head cell is always empty before).
+
+def _build_inverse_tables(tables, head_bit):
+    extend_table, retract_table = tables
+    inverse_extend = [()] * (1 << 16)
+    for index, result in enumerate(extend_table):
+        if result >= 0:
+            key = result << 4 | (index & 0xF)
+            inverse_extend[key] += (index >> 4,)
+    inverse_retract = [()] * (1 << 12)
+    for line, result in enumerate(retract_table):
+        if result >= 0 and not (line >> (3 * head_bit)) & 7:
+            inverse_retract[result] += (line,)
+    return inverse_extend, inverse_retract
+
+
+INVERSE_FORWARD = _build_inverse_tables(FORWARD_TABLES, 0)
+INVERSE_BACKWARD = _build_inverse_tables(BACKWARD_TABLES, 3)
+
+# 4-bit occupancy of each packed line
+LINE_OCCUPANCY = [sum(1 << i for i in range(4) if (line >> (3 * i)) & 7) for line in range(1 << 12)]
+
+
+def _inverse_spec(p):
+    r, c = PISTONS[p]
+    forward = r == 0 or c == 0
+    inverse_extend, inverse_retract = INVERSE_FORWARD if forward else INVERSE_BACKWARD
+    _, ext_bit, k, _, _, clear, deposit = PISTON_SPECS[p]
+    own_head = 1 if forward else 8  # the head's bit within the line
+    return (p, ext_bit, k, inverse_extend, inverse_retract, own_head,
+            1 << HEAD_CELLS[p], clear, deposit)
+
+
+INVERSE_SPECS = [_inverse_spec(p) for p in MOVE_ORDER]
+
+def head_mask(ext):
+    """16-bit mask of inner cells covered by piston heads for an extension mask"""
+    return HEADS_LO[ext & 0xFF] | HEADS_HI[ext >> 8]
+
+
+def line_values(state):
+    """Packed contents and head bits of the 8 lines (columns 1-4, then rows 1-4)"""
+    heads = HEADS_LO[(state >> EXT_SHIFT) & 0xFF] | HEADS_HI[state >> (EXT_SHIFT + 8)]
+    lines = []
+    line_heads = []
+    for c in range(4):
+        x = (state >> (3 * c)) & COL_GATHER
+        lines.append((x | x >> 9 | x >> 18 | x >> 27) & LINE_MASK)
+        h = (heads >> c) & 0x1111
+        line_heads.append((h | h >> 3 | h >> 6 | h >> 9) & 0xF)
+    for r in range(4):
+        lines.append((state >> (12 * r)) & LINE_MASK)
+        line_heads.append((heads >> (4 * r)) & 0xF)
+    return lines, line_heads
+
+
+def encode(grid, extended):
+    """Pack a 6x6 grid and an extended dict into a state int"""
+    state = 0
+    for r in range(1, 5):
+        for c in range(1, 5):
+            code = CHAR_CODES.get(grid[r][c], 0)
+            state |= code << (3 * cell_index(r, c))
+    for pos, is_ext in extended.items():
+        if is_ext:
+            state |= 1 << (EXT_SHIFT + PISTON_INDEX[pos])
+    return state
+
+
+def decode(state):
+    """Unpack a state int into (grid, extended, piston_heads)"""
+    grid = [['' for _ in range(6)] for _ in range(6)]
+    for pos, dir_char in PISTON_DIRS.items():
+        grid[pos[0]][pos[1]] = dir_char
+    for r in range(1, 5):
+        for c in range(1, 5):
+            grid[r][c] = CELL_CHARS[(state >> (3 * cell_index(r, c))) & 7]
+    extended = {}
+    piston_heads = {}
+    ext = state >> EXT_SHIFT
+    for p, pos in enumerate(PISTONS):
+        extended[pos] = bool((ext >> p) & 1)
+        if extended[pos]:
+            dr, dc = DIR_OFFSETS[PISTON_DIRS[pos]]
+            piston_heads[(pos[0] + dr, pos[1] + dc)] = pos
+    return grid, extended, piston_heads
+
+
+def parse_board(text):
+    """
+    Parse a 16-cell board string (row-major, Y/B/R/G for blocks, '.' for empty)
+    into a state with every piston retracted.
+    """
+    cells = ''.join(text.split())
+    if len(cells) != 16:
+        raise ValueError(f"expected 16 cells, got {len(cells)}: {text!r}")
+    state = 0
+    for i, char in enumerate(cells.upper()):
+        if char in ('.', '_', '0'):
+            continue
+        if char not in CHAR_CODES:
+            raise ValueError(f"unknown cell {char!r} in board {text!r}")
+        state |= CHAR_CODES[char] << (3 * i)
+    return state
+
+
+def format_board(state):
+    """16-cell board string for the cells of state (extension mask not included)"""
+    return ''.join(CELL_CHARS[(state >> (3 * i)) & 7] or '.' for i in range(16))
+
+
+def piston_name(pos):
+    r, c = pos
+    if r == 0:
+        return f"top{c}"
+    elif r == 5:
+        return f"bottom{c}"
+    elif c == 0:
+        return f"left{r}"
+    elif c == 5:
+        return f"right{r}"
+    else:
+        return f"({r},{c})"
+
+
+def is_extended(state, p):
+    return bool((state >> (EXT_SHIFT + p)) & 1)
+
+
+def move_tuple(state, p):
+    """Convert piston index p into an ('extend'|'retract', r, c) move for state"""
+    r, c = PISTONS[p]
+    return ('retract' if is_extended(state, p) else 'extend', r, c)
+
+
+def apply_piston(state, p):
+    """Toggle piston p. Returns the new state, or None if the extend is blocked"""
+    _, ext_bit, k, extend_table, retract_table, clear, deposit = PISTON_SPECS[p]
+    # Only the piston's own line is gathered, as in line_values()
+    if k < 4:
+        x = (state >> (3 * k)) & COL_GATHER
+        line = (x | x >> 9 | x >> 18 | x >> 27) & LINE_MASK
+    else:
+        line = (state >> (12 * (k - 4))) & LINE_MASK
+    if state & ext_bit:
+        # Retract: the sticky face pulls one block back into the head cell
+        new_line = retract_table[line]
+    else:
+        heads = HEADS_LO[(state >> EXT_SHIFT) & 0xFF] | HEADS_HI[state >> (EXT_SHIFT + 8)]
+        if k < 4:
+            h = (heads >> k) & 0x1111
+            line_heads = (h | h >> 3 | h >> 6 | h >> 9) & 0xF
+        else:
+            line_heads = (heads >> (4 * (k - 4))) & 0xF
+        new_line = extend_table[line << 4 | line_heads]
+        if new_line < 0:
+            return None
+    return ((state ^ ext_bit) & clear) | deposit[new_line]
+
+
+def successors(state):
+    """List of (piston index, child state) for every legal move, in MOVE_ORDER"""
+    lines, line_heads = line_values(state)
+    children = []
+    for p, ext_bit, k, extend_table, retract_table, clear, deposit in MOVE_SPECS:
+        if state & ext_bit:
+            new_line = retract_table[lines[k]]
+        else:
+            new_line = extend_table[lines[k] << 4 | line_heads[k]]
+            if new_line < 0:
+                continue
+        children.append((p, ((state ^ ext_bit) & clear) | deposit[new_line]))
+    return children
+
+
+def successor_lines(state):
+    """
+    Like successors(), as (piston index, child state, line index, old line,
+    new line) so callers can update per-line data instead of rescanning
+    """
+    lines, line_heads = line_values(state)
+    children = []
+    for p, ext_bit, k, extend_table, retract_table, clear, deposit in MOVE_SPECS:
+        line = lines[k]
+        if state & ext_bit:
+            new_line = retract_table[line]
+        else:
+            new_line = extend_table[line << 4 | line_heads[k]]
+            if new_line < 0:
+                continue
+        children.append((p, ((state ^ ext_bit) & clear) | deposit[new_line], k, line, new_line))
+    return children
+
+
+def predecessors(state):
+    """List of (piston index, parent state) such that toggling the piston in parent gives state"""
+    lines, line_heads = line_values(state)
+    heads = head_mask(state >> EXT_SHIFT)
+    parents = []
+    for p, ext_bit, k, inverse_extend, inverse_retract, own_head, head_cell, clear, deposit in INVERSE_SPECS:
+        if state & ext_bit:
+            # The piston was extended into this state; undo the push
+            for line in inverse_extend[lines[k] << 4 | (line_heads[k] & ~own_head)]:
+                parents.append((p, ((state ^ ext_bit) & clear) | deposit[line]))
+        elif not heads & head_cell:
+            # The piston was retracted into this state; its head cell was free
+            for line in inverse_retract[lines[k]]:
+                if not LINE_OCCUPANCY[line] & line_heads[k]:
+                    parents.append((p, ((state ^ ext_bit) & clear) | deposit[line]))
+    return parents
+
+
+def is_valid_state(state):
+    """True if no two piston heads share a cell and no block sits under a head"""
+    occupied = 0
+    for i in range(16):
+        if (state >> (3 * i)) & 7:
+            occupied |= 1 << i
+    ext = state >> EXT_SHIFT
+    for p in range(len(PISTONS)):
+        if ext & (1 << p):
+            cell = 1 << HEAD_CELLS[p]
+            if occupied & cell:
+                return False
+            occupied |= cell
+    return True
+
+
+def legal_moves(state):
+    """Legal moves from state as ('extend'|'retract', r, c) tuples"""
+    return [move_tuple(state, p) for p, _ in successors(state)]
@@ -0,0 +1,64 @@
+"""
+Per-solve budgets: node, wall-clock and memory limits.
+
+search.solve() wraps its limits and the caller's should_stop in a Budget
+and hands it to the solver as should_stop, which every solver polls once
+per expansion (HDA*'s coordinator polls more often and counts nothing). When the budget runs out the solver returns as if cancelled
+and solve() sets the result's status from Budget.reason.
+"""
+
+import time
+
+# SolveResult.status values
+SOLVED = 'solved'
+EXHAUSTED = 'exhausted'  # the whole space within max_depth was searched
+BUDGET_EXCEEDED = 'budget_exceeded'  # see SolveResult.budget for which limit
+CANCELLED = 'cancelled'  # should_stop returned True
+UNSOLVABLE = 'unsolvable'  # proven before searching; see solver.feasibility
+
+
+class Budget:
+    """
+    Callable stop condition for one solve.
+
+    Each call counts one expansion, so solvers poll it exactly once per
+    expanded node; with count_calls False the node total comes only from
+    observe(), for solvers that poll more often (HDA*'s coordinator). Memory is followed through telemetry
+    snapshots passed to observe(), which solve() takes every
+    telemetry.POLL_NODES expansions, so a search can overshoot max_memory
+    by what that many expansions add. reason is None until the budget
+    stops the search, then one of 'cancelled', 'nodes', 'time' or 'memory'.
+    """
+
+    def __init__(self, max_nodes=None, time_limit=None, max_memory=None, should_stop=None, start_time=None,
+                 count_calls=True):
+        self.max_nodes = max_nodes
+        self.count_calls = count_calls
+        self.max_memory = max_memory
+        self.should_stop = should_stop
+        start_time = time.time() if start_time is None else start_time
+        self.deadline = None if time_limit is None else start_time + time_limit
+        self.nodes = 0
+        self.memory_bytes = 0
+        self.reason = None
+
+    def observe(self, stats):
+        """Take memory, and node totals of solvers that poll less often, from a SolverStats"""
+        self.memory_bytes = stats.memory_bytes
+        if stats.nodes_expanded > self.nodes:
+            self.nodes = stats.nodes_expanded
+
+    def __call__(self):
+        if self.reason is not None:
+            return True
+        if self.count_calls:
+            self.nodes += 1
+        if self.should_stop is not None and self.should_stop():
+            self.reason = 'cancelled'
+        elif self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.reason = 'nodes'
+        elif self.max_memory is not None and self.memory_bytes > self.max_memory:
+            self.reason = 'memory'
+        elif self.deadline is not None and time.time() >= self.deadline:
+            self.reason = 'time'
+        return self.reason is not None
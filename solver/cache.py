@@ -0,0 +1,89 @@
+"""
+Persistent solution cache.
+
+Solutions are stored in an sqlite database under the canonical key of the
+board (see solver.symmetry), so a board and its 7 rotations and reflections
+share one entry. Moves are stored as piston indices played on the canonical
+board, one byte each, and mapped back to the board that was looked up.
+
+The default database lives in ~/.colorpuzzle/solutions.sqlite (override
+with the COLORPUZZLE_CACHE environment variable). Each process should open
+its own SolutionCache; sqlite serializes the writers.
+"""
+
+import os
+import sqlite3
+import time
+
+from . import bitboard, symmetry
+
+DEFAULT_PATH = os.environ.get(
+    "COLORPUZZLE_CACHE", os.path.join(os.path.expanduser("~"), ".colorpuzzle", "solutions.sqlite"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    key BLOB PRIMARY KEY,
+    moves BLOB NOT NULL,
+    length INTEGER NOT NULL,
+    optimal INTEGER NOT NULL
+)
+"""
+
+
+def _key_bytes(key):
+    # States use all 64 bits, past sqlite's signed INTEGER range
+    return key.to_bytes(8, 'big')
+
+
+class SolutionCache:
+    """Canonical board -> shortest known solution, with whether it is proven optimal"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, state):
+        """Cached solution for state as a SolveResult, or None"""
+        from .search import SOLVED, SolveResult, path_to_moves
+
+        start_time = time.time()
+        representative, s = symmetry.canonical(state)
+        row = self._db.execute("SELECT moves, optimal FROM solutions WHERE key = ?",
+                               (_key_bytes(representative),)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        moves = path_to_moves(state, symmetry.map_path(list(row[0]), s))
+        result = SolveResult(moves, 0, time.time() - start_time, optimal=bool(row[1]))
+        result.status = SOLVED
+        return result
+
+    def put(self, state, moves, optimal=False):
+        """
+        Store moves as a solution of state. An existing entry is kept unless
+        the new one is shorter, or as short and newly proven optimal.
+        """
+        representative, s = symmetry.canonical(state)
+        perm = symmetry.PISTON_PERMS[s]
+        path = bytes(perm[bitboard.PISTON_INDEX[(r, c)]] for _, r, c in moves)
+        with self._db:
+            self._db.execute(
+                "INSERT INTO solutions (key, moves, length, optimal) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET moves = excluded.moves, length = excluded.length, "
+                "optimal = excluded.optimal "
+                "WHERE excluded.length < solutions.length "
+                "OR (excluded.length = solutions.length AND excluded.optimal > solutions.optimal)",
+                (_key_bytes(representative), path, len(path), int(bool(optimal))))
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,64 @@
+"""
+Quick proofs that a board has no solution, checked before searching.
+
+A search on a dead board only ends once it has run out of states or hit
+max_depth, which can take minutes. These checks cost well under a
+millisecond:
+
+- Moves never create, remove or recolor blocks, so a board without
+  exactly 3 blocks of each color can never reach the goal.
+- A state with a block or a second head under an extended piston head
+  cannot occur in play, and the move tables are undefined for it.
+- The admissible pattern database bound (see solver.pattern_db) is a
+  distance in a relaxed game; if it exceeds max_depth, so does every
+  solution (beyond_depth_reason, a depth limit rather than a proof of no
+  solution at all).
+
+No cheap test rejects a legal board with 3 blocks of each color: from
+every arrangement of 12 blocks and extended heads the blocks can be moved
+onto the 12 goal cells, and in the pattern database every color can reach
+its corner from every placement.
+"""
+
+from . import bitboard, pattern_db
+from .bitboard import CELL_CHARS, COLORS
+
+BLOCKS_PER_COLOR = 3
+
+
+def color_counts(state):
+    """Number of cells holding each cell code, indexed by code (0 counts empty cells)"""
+    counts = [0] * 8
+    for i in range(16):
+        counts[(state >> (3 * i)) & 7] += 1
+    return counts
+
+
+def unsolvable_reason(state):
+    """
+    Why state can never be solved: it is not a legal position, has unknown
+    cell codes or lacks exactly 3 blocks of a color. None otherwise
+    """
+    if not bitboard.is_valid_state(state):
+        return "a block or another piston head is under an extended piston head"
+    counts = color_counts(state)
+    if any(counts[len(CELL_CHARS):]):
+        return "the board has cells with unknown codes"
+    wrong = [f"{counts[code]} {color}" for code, color in enumerate(COLORS, 1)
+             if counts[code] != BLOCKS_PER_COLOR]
+    if wrong:
+        return (f"every color needs exactly {BLOCKS_PER_COLOR} blocks and moves never change "
+                f"that, but the board has {', '.join(wrong)}")
+    return None
+
+
+def beyond_depth_reason(state, max_depth):
+    """
+    Why state has no solution within max_depth moves, or None. Only call
+    this for states that pass unsolvable_reason()
+    """
+    db = pattern_db.load()
+    bound = db.admissible(state) if db is not None else 0
+    if bound > max_depth:
+        return f"every solution takes at least {bound} moves, more than max_depth {max_depth}"
+    return None
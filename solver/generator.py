@@ -0,0 +1,186 @@
+"""
+Boards of a known optimal solution length, made by walking back from the goal.
+
+A board is playable when every piston is retracted. Every move toggles one
+piston and the solved board has them all retracted, so optimal lengths of
+playable boards are always even.
+
+Lengths up to the depth of the goal perimeter (see search.GoalPerimeter)
+are read straight off its exact distances. Longer boards are grown from
+there: walk back from a board of known length with inverse moves, retract
+every piston, then certify the exact distance by meeting the perimeter
+with a breadth-first search forward from the board.
+
+Certification costs grow about 1.8x per forward layer, so lengths are
+capped at DistanceOracle.max_length(): the perimeter depth plus
+certify_depth forward layers. Boards dealt by a random game typically
+need 30 to 60 moves, beyond the defaults' cap of 28.
+"""
+
+import random
+
+from . import bitboard, pattern_db, search, symmetry
+from .bitboard import EXT_SHIFT
+
+DEFAULT_PERIMETER_DEPTH = 14
+# Inverse moves per walk before the pistons are retracted again
+WALK_STEPS = 6
+# Edge boards a climb starts from, and how often it walks from its longest boards
+EDGE_BASES = 20
+CLIMB_TOP = 0.7
+# Forward layers one certification may search (about 670k states at 14)
+CERTIFY_DEPTH = 14
+
+
+def max_length(perimeter_depth=DEFAULT_PERIMETER_DEPTH, certify_depth=CERTIFY_DEPTH):
+    """Longest even length a perimeter_depth oracle can certify with certify_depth forward layers"""
+    # A solution of length L is only seen once the layers reach perimeter
+    # states L - perimeter_depth moves away
+    longest = perimeter_depth + certify_depth
+    return longest - longest % 2
+
+
+class DistanceOracle:
+    """
+    Exact distances near the goal and an admissible bound everywhere else,
+    from the goal perimeter grown to perimeter_depth and the pattern
+    database. Building it takes a few seconds at the default depth, and
+    about three times as long per 2 extra levels.
+    """
+
+    def __init__(self, perimeter_depth=DEFAULT_PERIMETER_DEPTH):
+        perimeter = search.goal_perimeter()
+        while perimeter.depth < perimeter_depth and perimeter.frontier:
+            perimeter.expand()
+        self.depth = perimeter.depth
+        self.dist = perimeter.dist
+        db = pattern_db.load()
+        self._admissible = db.admissible if db is not None else (lambda state: 0)
+        # Playable boards inside the perimeter, by distance
+        self.playable = {}
+        for key, d in self.dist.items():
+            if key >> EXT_SHIFT == 0:
+                self.playable.setdefault(d, []).append(key)
+
+    def exact(self, state):
+        """Distance to the goal if state is inside the perimeter, else None"""
+        return self.dist.get(symmetry.canonical_key(state))
+
+    def bound(self, state):
+        """Admissible distance estimate, exact inside the perimeter"""
+        d = self.dist.get(symmetry.canonical_key(state))
+        if d is not None:
+            return d
+        return max(self.depth + 1, self._admissible(state))
+
+    def max_length(self, certify_depth=CERTIFY_DEPTH):
+        """Longest even length certify() can prove with certify_depth forward layers"""
+        return max_length(self.depth, certify_depth)
+
+    def certify(self, state, upper=None, certify_depth=CERTIFY_DEPTH):
+        """
+        Optimal solution length of state, given one of length upper exists,
+        or None if proving it takes more than certify_depth forward layers.
+
+        Layers are grown forward from state, stopping at perimeter states. A
+        path not seen yet leaves the perimeter's outside after more than j
+        moves, so after layer j it is at least j + depth + 1 long; once the
+        best j' + dist found is no longer than that, it is exact.
+        """
+        dist = self.dist
+        canonical_key = symmetry.canonical_key
+        key = canonical_key(state)
+        if key in dist:
+            return dist[key]
+        best = float('inf') if upper is None else upper
+        seen = {key}
+        frontier = [state]
+        for j in range(1, certify_depth + 2):
+            if best <= j + self.depth:
+                return best
+            if j > certify_depth:
+                break
+            layer = []
+            for parent in frontier:
+                for _, child in bitboard.successors(parent):
+                    key = canonical_key(child)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    d = dist.get(key)
+                    if d is None:
+                        layer.append(child)
+                    elif j + d < best:
+                        best = j + d
+            frontier = layer
+        return None
+
+
+def _walk_back(state, steps, oracle, rng):
+    # Random inverse moves that favour states the oracle rates further away,
+    # then retract every piston; returns (board, moves taken) or None
+    seen = {state}
+    taken = 0
+    while taken < steps or state >> EXT_SHIFT:
+        parents = [parent for _, parent in bitboard.predecessors(state) if parent not in seen]
+        if taken >= steps:
+            # Only parents with fewer extended pistons, to end on a playable board
+            extended = bin(state >> EXT_SHIFT).count('1')
+            parents = [parent for parent in parents if bin(parent >> EXT_SHIFT).count('1') < extended]
+        if not parents:
+            return None
+        if rng.random() < 0.5:
+            state = max(parents, key=oracle.bound)
+        else:
+            state = rng.choice(parents)
+        seen.add(state)
+        taken += 1
+    return state, taken
+
+
+def generate(length, oracle, rng=None, attempts=600, certify_depth=CERTIFY_DEPTH):
+    """
+    A playable board whose optimal solution takes exactly length moves, in a
+    random orientation, or None if attempts walks found none. Raises
+    ValueError for lengths that are odd or past oracle.max_length(certify_depth)
+    """
+    if rng is None:
+        rng = random.Random()
+    if length % 2:
+        raise ValueError(f"playable boards have even solution lengths, not {length}")
+    if length > oracle.max_length(certify_depth):
+        raise ValueError(f"lengths past {oracle.max_length(certify_depth)} cannot be certified with a "
+                         f"depth {oracle.depth} perimeter and {certify_depth} forward layers")
+    if length <= oracle.depth:
+        boards = oracle.playable.get(length)
+        if not boards:
+            return None
+        return symmetry.transform(rng.choice(boards), rng.randrange(symmetry.NUM_SYMMETRIES))
+
+    # Climb from the perimeter's edge through a pool of certified boards by
+    # length, mostly walking from the longest ones found so far
+    edge = oracle.depth - oracle.depth % 2
+    starts = oracle.playable[edge]
+    pool = {edge: rng.sample(starts, min(EDGE_BASES, len(starts)))}
+    for _ in range(attempts):
+        levels = sorted(pool, reverse=True)
+        if len(levels) == 1 or rng.random() < CLIMB_TOP:
+            base_length = levels[0]
+        else:
+            base_length = rng.choice(levels[1:3])
+        base = rng.choice(pool[base_length])
+        walked = _walk_back(base, WALK_STEPS, oracle, rng)
+        if walked is None:
+            # A dead end; drop the base unless it is one of the edge's
+            if base_length > edge:
+                pool[base_length].remove(base)
+                if not pool[base_length]:
+                    del pool[base_length]
+            continue
+        board, steps = walked
+        certified = oracle.certify(board, base_length + steps, certify_depth)
+        if certified == length:
+            return symmetry.transform(board, rng.randrange(symmetry.NUM_SYMMETRIES))
+        if certified is not None and edge < certified < length:
+            pool.setdefault(certified, []).append(board)
+    return None
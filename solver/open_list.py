@@ -0,0 +1,79 @@
+"""
+Open lists for best-first search, ordered by (f, g, insertion order).
+
+Both classes share push(f, g, item) / pop() -> (f, g, item) so a solver can
+switch between them. BucketQueue needs small non-negative integer f and g;
+HeapQueue takes any comparable priorities.
+"""
+
+import heapq
+import itertools
+from collections import deque
+
+
+class HeapQueue:
+    """Binary heap open list; ties on f and g go to the oldest item"""
+
+    __slots__ = ('_heap', '_counter')
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+
+    def push(self, f, g, item):
+        heapq.heappush(self._heap, (f, g, next(self._counter), item))
+
+    def pop(self):
+        f, g, _, item = heapq.heappop(self._heap)
+        return f, g, item
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class BucketQueue:
+    """
+    Open list of per-(f, g) buckets with a moving minimum pointer.
+
+    Bucket f * g_limit + g holds the items pushed with that f and g, so
+    push and pop are a list index and a deque operation instead of tuple
+    comparisons. Buckets are FIFO (ties go to the oldest item, like
+    HeapQueue) or LIFO with lifo=True. Every g must be below g_limit; the
+    bucket array grows to the largest f pushed.
+    """
+
+    __slots__ = ('g_limit', 'lifo', '_buckets', '_min', '_size')
+
+    def __init__(self, g_limit, lifo=False):
+        self.g_limit = g_limit
+        self.lifo = lifo
+        self._buckets = []
+        self._min = 0
+        self._size = 0
+
+    def push(self, f, g, item):
+        index = f * self.g_limit + g
+        buckets = self._buckets
+        if index >= len(buckets):
+            buckets.extend(deque() for _ in range(index + 1 - len(buckets)))
+        buckets[index].append(item)
+        if index < self._min:
+            # Heuristics need not be consistent, so f can drop below the minimum
+            self._min = index
+        self._size += 1
+
+    def pop(self):
+        if not self._size:
+            raise IndexError("pop from an empty BucketQueue")
+        buckets = self._buckets
+        index = self._min
+        while not buckets[index]:
+            index += 1
+        self._min = index
+        self._size -= 1
+        item = buckets[index].pop() if self.lifo else buckets[index].popleft()
+        f, g = divmod(index, self.g_limit)
+        return f, g, item
+
+    def __len__(self):
+        return self._size
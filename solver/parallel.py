@@ -0,0 +1,313 @@
+"""
+Hash-distributed A* (HDA*) across worker processes.
+
+Every state is owned by one worker, chosen by a hash of its packed int.
+Each worker runs its own open list and visited map over the states it owns
+and sends generated children to their owners in batches. The coordinator
+(the calling process) collects solutions, broadcasts the best cost so
+workers can prune against it, and detects termination with two waves of
+message counters: when every worker reports idle with the same sent and
+received totals twice in a row, and the totals balance, no batch is in
+flight and the search is over. The solution path is then rebuilt by asking
+each state's owner for its parent.
+
+Use it through search.solve(state, method='hda', workers=N).
+"""
+
+import multiprocessing
+import os
+import queue as queue_module
+import time
+import traceback
+
+from . import bitboard
+from .open_list import BucketQueue, HeapQueue
+from .telemetry import DICT_ENTRY_BYTES, LIST_ENTRY_BYTES
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+# Expansions between inbox polls and progress messages, and total
+# expansions between log lines
+POLL_INTERVAL = 64
+PROGRESS_INTERVAL = 2048
+LOG_INTERVAL = 5000
+
+
+def owner(state, workers):
+    """Index of the worker that owns state"""
+    return (((state * _HASH_MULTIPLIER) & _MASK64) >> 32) % workers
+
+
+def _worker(index, inboxes, results, root, max_depth, heuristic, batch_size):
+    try:
+        _run_worker(index, inboxes, results, root, max_depth, heuristic, batch_size)
+    except Exception:
+        # The coordinator is still reading results, so this gets flushed
+        results.put(('error', index, traceback.format_exc()))
+    else:
+        # After 'quit' the coordinator joins the workers without reading any
+        # more results; don't wait for buffered reports to be read
+        results.cancel_join_thread()
+    # Batches still buffered for other workers are no longer needed; don't
+    # wait for them to be read before exiting
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+
+
+def _run_worker(index, inboxes, results, root, max_depth, heuristic, batch_size):
+    from .search import IncrementalHeuristic, is_win
+
+    workers = len(inboxes)
+    inbox = inboxes[index]
+    incremental = isinstance(heuristic, IncrementalHeuristic)
+    if incremental:
+        value, update = heuristic.value, heuristic.update
+    open_list = BucketQueue(max_depth + 2) if incremental else HeapQueue()
+    visited = {}  # owned state -> fewest moves to reach it
+    parents = {}  # owned state -> (parent state, piston), None for the root
+    # Children bound for other workers: (f, g, state, parent, piston, components)
+    outboxes = [[] for _ in range(workers)]
+    sent = received = expanded = 0
+    bound = None  # cost of the best solution known so far
+    best_heuristic = None
+    reported = None  # counters in the last idle report
+
+    def add(f, g, state, parent, piston, components):
+        seen = visited.get(state)
+        if seen is not None and seen <= g:
+            return
+        visited[state] = g
+        parents[state] = None if parent is None else (parent, piston)
+        open_list.push(f, g, (state, piston, components))
+
+    def flush(target):
+        nonlocal sent
+        inboxes[target].put(('nodes', outboxes[target]))
+        outboxes[target] = []
+        sent += 1
+
+    def handle(message):
+        # Returns False once the worker should exit
+        nonlocal received, bound
+        kind = message[0]
+        if kind == 'nodes':
+            received += 1
+            for node in message[1]:
+                add(*node)
+        elif kind == 'bound':
+            if bound is None or message[1] < bound:
+                bound = message[1]
+        elif kind == 'probe':
+            results.put(('probe', index, not open_list, sent, received, expanded))
+        elif kind == 'parent':
+            results.put(('parent', parents.get(message[1])))
+        elif kind == 'quit':
+            return False
+        return True
+
+    if owner(root, workers) == index:
+        components = heuristic.components(root) if incremental else None
+        h = value(components) if incremental else heuristic(root)
+        add(h, 0, root, None, -1, components)
+
+    while True:
+        if not open_list:
+            for target in range(workers):
+                if outboxes[target]:
+                    flush(target)
+            counters = (sent, received)
+            if counters != reported:
+                results.put(('idle', index, sent, received, expanded, len(visited)))
+                reported = counters
+            if not handle(inbox.get()):
+                return
+            continue
+        if expanded % POLL_INTERVAL == 0:
+            # Send partial batches too, so idle workers are not kept waiting
+            for target in range(workers):
+                if outboxes[target]:
+                    flush(target)
+            while True:
+                try:
+                    message = inbox.get_nowait()
+                except queue_module.Empty:
+                    break
+                if not handle(message):
+                    return
+
+        f, g, (state, last_piston, components) = open_list.pop()
+        if visited[state] < g:
+            continue  # Stale entry, the state was reached again in fewer moves
+        if bound is not None and f >= bound:
+            continue
+        expanded += 1
+        if expanded % PROGRESS_INTERVAL == 0:
+            results.put(('progress', index, expanded, len(open_list), len(visited), f))
+        h = value(components) if incremental else heuristic(state)
+        if best_heuristic is None or h < best_heuristic:
+            best_heuristic = h
+            results.put(('improve', state, h))
+        if g > max_depth:
+            continue
+        if is_win(state):
+            bound = g
+            results.put(('solution', index, g, state))
+            continue
+        for piston, child, k, old_line, new_line in bitboard.successor_lines(state):
+            if incremental:
+                child_components = update(components, k, old_line, new_line)
+                child_h = value(child_components)
+            else:
+                child_components = None
+                child_h = heuristic(child)
+            # Same priority as solve_astar, including the undo-move penalty
+            child_f = g + 1 + child_h + (3 if piston == last_piston else 0)
+            target = owner(child, workers)
+            if target == index:
+                add(child_f, g + 1, child, state, piston, child_components)
+            else:
+                outboxes[target].append((child_f, g + 1, child, state, piston, child_components))
+                if len(outboxes[target]) >= batch_size:
+                    flush(target)
+
+
+def solve_hda(state, max_depth, heuristic, should_stop, on_improve, log, workers=None, batch_size=64,
+              stats=None):
+    """
+    Hash-distributed A* over workers processes (default: all cores).
+
+    Children are sent to their owning worker in batches of batch_size. The
+    search runs until every open list is empty or holds only nodes whose f
+    is no better than the cheapest solution found, and returns that
+    solution. heuristic must be picklable when processes are spawned.
+
+    stats (a telemetry.StatsPublisher) receives totals over all workers, as
+    of each worker's latest progress message. A solve() node budget is
+    checked against those totals, so it can overshoot by a few thousand nodes.
+    """
+    from .search import SolveResult, path_to_moves
+
+    start_time = time.time()
+    workers = workers or os.cpu_count() or 1
+    inboxes = [multiprocessing.Queue() for _ in range(workers)]
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_worker, daemon=True,
+                                args=(i, inboxes, results, state, max_depth, heuristic, batch_size))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def broadcast(message):
+        for inbox in inboxes:
+            inbox.put(message)
+
+    def finish(moves, node_count):
+        broadcast(('quit',))
+        for process in processes:
+            process.join()
+        return SolveResult(moves, node_count, time.time() - start_time)
+
+    def balanced(counters):
+        return None not in counters and sum(s for s, _ in counters) == sum(r for _, r in counters)
+
+    # Latest (sent, received) of each worker that reported idle, None while active
+    idle = [None] * workers
+    expanded = [0] * workers
+    # Latest (open list size, visited size, f) of each worker
+    sizes = [(0, 0, None)] * workers
+    best_cost = best_state = None
+    best_heuristic = None
+    # Probe wave: idle counters when it started, and the replies so far
+    snapshot = replies = None
+    pending = 0
+
+    while True:
+        if should_stop is not None and should_stop():
+            return finish(None, sum(expanded))
+        if stats is not None and stats.due():
+            open_size = sum(size[0] for size in sizes)
+            visited_size = sum(size[1] for size in sizes)
+            f_values = [size[2] for size in sizes if size[2] is not None]
+            # Each worker keeps a visited and a parent entry per owned state
+            stats.publish(sum(expanded), open_size, visited_size, min(f_values, default=None), best_heuristic,
+                          2 * visited_size * DICT_ENTRY_BYTES + open_size * LIST_ENTRY_BYTES)
+        try:
+            message = results.get(timeout=0.05)
+        except queue_module.Empty:
+            continue
+        kind = message[0]
+        if kind == 'idle':
+            _, i, sent, received, expanded[i], visited_size = message
+            idle[i] = (sent, received)
+            sizes[i] = (0, visited_size, None)
+        elif kind == 'progress':
+            _, i, expanded[i], open_size, visited_size, f = message
+            sizes[i] = (open_size, visited_size, f)
+            total = sum(expanded)
+            # Each message adds PROGRESS_INTERVAL, so this logs once per LOG_INTERVAL crossed
+            if log is not None and total // LOG_INTERVAL > (total - PROGRESS_INTERVAL) // LOG_INTERVAL:
+                elapsed = time.time() + 1e-9 - start_time
+                log(f"[Solver] {total} nodes expanded by {workers} workers in {elapsed:.2f} seconds, "
+                    f"best heuristic: {best_heuristic}...")
+        elif kind == 'improve':
+            if best_heuristic is None or message[2] < best_heuristic:
+                best_heuristic = message[2]
+                if on_improve is not None:
+                    on_improve(message[1], best_heuristic)
+        elif kind == 'solution':
+            _, i, cost, goal = message
+            if best_cost is None or cost < best_cost:
+                best_cost, best_state = cost, goal
+                broadcast(('bound', cost))
+                if log is not None:
+                    log(f"[Solver] Worker {i} found a {cost}-move solution after "
+                        f"{time.time() - start_time:.2f} seconds")
+        elif kind == 'probe':
+            _, i, is_idle, sent, received, expanded[i] = message
+            replies[i] = (sent, received) if is_idle else None
+            pending -= 1
+            if not pending:
+                # Nothing was sent or received since the balanced snapshot,
+                # so no batch can be in flight and every worker is idle
+                if replies == snapshot:
+                    break
+                # Replies come after any earlier report, so they are the freshest
+                idle = replies
+        elif kind == 'error':
+            for process in processes:
+                process.terminate()
+            raise RuntimeError(f"HDA* worker {message[1]} failed:\n{message[2]}")
+
+        if not pending and balanced(idle):
+            snapshot = list(idle)
+            replies = [None] * workers
+            pending = workers
+            broadcast(('probe',))
+
+    node_count = sum(expanded)
+    elapsed = time.time() - start_time
+    if best_state is None:
+        if log is not None:
+            log(f"[Solver] No solution found in {elapsed:.2f} seconds.")
+        return finish(None, node_count)
+
+    # Walk parent links back to the root, asking each state's owner
+    path = []
+    state_on_path = best_state
+    while True:
+        inboxes[owner(state_on_path, workers)].put(('parent', state_on_path))
+        message = results.get()
+        while message[0] != 'parent':
+            message = results.get()
+        link = message[1]
+        if link is None:
+            break
+        state_on_path, piston = link
+        path.append(piston)
+    path.reverse()
+    if log is not None:
+        log(f"[Solver] Solution found in {elapsed:.2f} seconds, {len(path)} moves.")
+    return finish(path_to_moves(state, path), node_count)
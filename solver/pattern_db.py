@@ -0,0 +1,249 @@
+"""
+Pattern database heuristic.
+
+For one color, the abstract state is where that color's three blocks are,
+which cells hold some other block (all other colors look alike) and which
+cells are empty. Piston extension is ignored: any line may be pushed from
+either end and the block next to an edge cell may be pulled onto it at any
+time. Every real move maps to one of these abstract moves (or to no change),
+so the exact abstract distance never overestimates the real one.
+
+The corners are symmetric images of each other (see solver.symmetry), so a
+single table for yellow serves every color after transforming the board. The per-color distances are
+combined either by max (admissible) or by sum (much better guidance, but one
+push can move several colors at once, so the sum may overestimate).
+
+Build the table offline with:  python -m solver.pattern_db
+It is written to pattern_db.bin next to this module and memory-mapped by
+load(). Solvers fall back to the classic heuristic when the file is missing.
+"""
+
+import itertools
+import mmap
+import os
+import sys
+import time
+from collections import deque
+
+from . import bitboard, symmetry
+from .bitboard import GROUP_TARGETS, cell_index
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pattern_db.bin")
+MAGIC = b"CPDB\x01"
+UNREACHABLE = 255
+
+CENTER_MASK = sum(1 << cell_index(r, c) for r in (2, 3) for c in (2, 3))
+
+
+def _rank_table(k):
+    # Map every 16-bit mask with k bits set to its combination rank
+    table = [-1] * (1 << 16)
+    count = 0
+    for count, cells in enumerate(itertools.combinations(range(16), k)):
+        table[sum(1 << cell for cell in cells)] = count
+    return table, count + 1
+
+
+RANK3, NUM_RANK3 = _rank_table(3)
+RANK4, NUM_RANK4 = _rank_table(4)
+DB_SIZE = NUM_RANK3 * NUM_RANK4
+
+
+def db_index(color_mask, empty_mask):
+    return RANK3[color_mask] * NUM_RANK4 + RANK4[empty_mask]
+
+
+def _color_permutations():
+    # Cell permutation of a symmetry that carries each color's corner onto yellow's
+    perms = []
+    for code in range(1, 5):
+        for s in range(symmetry.NUM_SYMMETRIES):
+            if symmetry.COLOR_PERMS[s][code] == bitboard.CHAR_CODES['Y']:
+                perms.append(symmetry.CELL_PERMS[s])
+                break
+    return perms
+
+
+def _byte_tables(perm, offset):
+    table = []
+    for byte in range(256):
+        mask = 0
+        for bit in range(8):
+            if byte & (1 << bit):
+                mask |= 1 << perm[offset + bit]
+        table.append(mask)
+    return table
+
+
+# Per color (in cell-code order) lookups that transform a 16-bit cell mask
+PERMS = _color_permutations()
+PERM_LO = [_byte_tables(perm, 0) for perm in PERMS]
+PERM_HI = [_byte_tables(perm, 8) for perm in PERMS]
+
+
+def _line_mask_tables():
+    # For each of the 8 lines (columns, then rows), packed line contents ->
+    # one 16-bit mask per cell code, laid out at bits 16 * code of a single
+    # int. Masks of different cells never overlap, so they can be added and
+    # subtracted line by line.
+    tables = []
+    for k in range(8):
+        cells = bitboard._line_cells(k)
+        table = []
+        for line in range(1 << 12):
+            value = 0
+            for i, cell in enumerate(cells):
+                code = (line >> (3 * i)) & 7
+                if code <= 4:
+                    value |= 1 << (16 * code + cell)
+            table.append(value)
+        tables.append(table)
+    return tables
+
+
+LINE_MASKS = _line_mask_tables()
+ROW_MASKS = LINE_MASKS[4:]
+
+
+def cell_masks(state):
+    """Packed per-code cell masks of state: mask for code k is at bits 16*k"""
+    return (ROW_MASKS[0][state & 0xFFF] | ROW_MASKS[1][(state >> 12) & 0xFFF]
+            | ROW_MASKS[2][(state >> 24) & 0xFFF] | ROW_MASKS[3][(state >> 36) & 0xFFF])
+
+
+# Lines in both push directions, as lists of cell bits from the pushing end
+LINE_ORDERS = []
+for _k in range(8):
+    _cells = bitboard._line_cells(_k)
+    LINE_ORDERS.append([1 << cell for cell in _cells])
+    LINE_ORDERS.append([1 << cell for cell in reversed(_cells)])
+
+
+def _predecessors(color_mask, empty_mask):
+    """Abstract states one move before (color_mask, empty_mask)"""
+    preds = []
+    for order in LINE_ORDERS:
+        head = order[0]
+        if not empty_mask & head:
+            # Undo a pull: the block on the edge cell came from the next cell
+            nxt = order[1]
+            if empty_mask & nxt:
+                new_color = (color_mask & ~head) | nxt if color_mask & head else color_mask
+                preds.append((new_color, (empty_mask & ~nxt) | head))
+            continue
+        # Undo a push of a k-block chain that now sits on order[1..k]
+        chain = 0
+        moved_color = 0
+        for k in range(1, 4):
+            cell = order[k]
+            if empty_mask & cell:
+                break
+            chain |= cell
+            if color_mask & cell:
+                moved_color |= order[k - 1]
+            preds.append(((color_mask & ~chain) | moved_color,
+                          (empty_mask & ~head) | cell))
+    return preds
+
+
+def build(path=DB_PATH, log=print):
+    """Breadth-first search backwards from the goal and write the table to path"""
+    start_time = time.time()
+    dist = bytearray([UNREACHABLE]) * DB_SIZE
+    goal_color = sum(1 << cell_index(r, c) for r, c in GROUP_TARGETS['Y'])
+    goal_index = db_index(goal_color, CENTER_MASK)
+    dist[goal_index] = 0
+    frontier = deque([(goal_color, CENTER_MASK)])
+    depth = 0
+    while frontier:
+        color_mask, empty_mask = frontier.popleft()
+        d = dist[db_index(color_mask, empty_mask)] + 1
+        if d > depth:
+            depth = d
+            if log is not None:
+                log(f"[PDB] depth {depth}, {time.time() - start_time:.1f}s")
+        for pred in _predecessors(color_mask, empty_mask):
+            idx = RANK3[pred[0]] * NUM_RANK4 + RANK4[pred[1]]
+            if dist[idx] == UNREACHABLE:
+                dist[idx] = d
+                frontier.append(pred)
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(bytes(dist))
+    if log is not None:
+        log(f"[PDB] wrote {path} ({DB_SIZE} entries) in {time.time() - start_time:.1f}s")
+
+
+class PatternDatabase:
+    """Memory-mapped pattern database; use load() to open the default table"""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC or len(self._mmap) != len(MAGIC) + DB_SIZE:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a pattern database for this version")
+        self._offset = len(MAGIC)
+
+    def _distance_sum_and_max(self, masks):
+        empty = masks & 0xFFFF
+        db = self._mmap
+        offset = self._offset
+        total = 0
+        best = 0
+        for i in range(4):
+            lo, hi = PERM_LO[i], PERM_HI[i]
+            color = (masks >> (16 * (i + 1))) & 0xFFFF
+            color = lo[color & 0xFF] | hi[color >> 8]
+            mapped_empty = lo[empty & 0xFF] | hi[empty >> 8]
+            d = db[offset + RANK3[color] * NUM_RANK4 + RANK4[mapped_empty]]
+            total += d
+            if d > best:
+                best = d
+        return total, best
+
+    def __reduce__(self):
+        # Pickled (e.g. for spawned solver processes) as a reference to the
+        # file, which the receiving process maps itself
+        return load, (self.path,)
+
+    def admissible(self, state):
+        """Max over colors of the abstract distance; never overestimates"""
+        return self._distance_sum_and_max(cell_masks(state))[1]
+
+    def additive(self, state):
+        """
+        Sum over colors of the abstract distance. A single push can move
+        several colors at once, so this may overestimate, but it guides the
+        search far better than the max and is the default solver heuristic.
+        """
+        return self._distance_sum_and_max(cell_masks(state))[0]
+
+    def admissible_masks(self, masks):
+        """admissible() of the state whose cell_masks() are masks"""
+        return self._distance_sum_and_max(masks)[1]
+
+    def additive_masks(self, masks):
+        """additive() of the state whose cell_masks() are masks"""
+        return self._distance_sum_and_max(masks)[0]
+
+    def close(self):
+        self._mmap.close()
+
+
+_loaded = {}
+
+
+def load(path=DB_PATH):
+    """Open the pattern database at path once per process; None if it is missing"""
+    if path not in _loaded:
+        try:
+            _loaded[path] = PatternDatabase(path)
+        except (OSError, ValueError):
+            _loaded[path] = None
+    return _loaded[path]
+
+
+if __name__ == "__main__":
+    build(sys.argv[1] if len(sys.argv) > 1 else DB_PATH)
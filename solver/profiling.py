@@ -0,0 +1,89 @@
+"""
+Opt-in hot-path profiling for the solvers.
+
+Pass a Profiler to search.solve(profiler=...) and the solver wraps its
+hot functions in timers, one phase each. Without a profiler nothing is
+wrapped, so a normal solve pays nothing. Each wrapped call costs two
+perf_counter() calls, so a profiled solve runs noticeably slower than a
+normal one; compare phases with each other, not with unprofiled timings.
+
+After the solve, summary() gives a table of calls and cumulative time per
+phase, and dump_stats(path) writes a pstats file that pstats.Stats,
+snakeviz or flameprof can read.
+"""
+
+import marshal
+import time
+
+# Phases in the order summaries list them
+PHASES = [
+    'open_pop',  # take the next node off the open list
+    'move_generation',  # legal moves with their child states (one table-driven call)
+    'key',  # canonical key of a child (symmetry_keys only)
+    'visited_lookup',  # best known depth of a state
+    'visited_store',  # record a new best depth
+    'heuristic',  # score a child (components update and value)
+    'open_push',  # queue a child
+]
+
+
+class Profiler:
+    """Call counts and cumulative wall time per solver phase"""
+
+    def __init__(self):
+        self.method = None
+        self.elapsed = 0.0
+        self.phases = {}
+
+    def wrap(self, phase, fn):
+        """fn wrapped to add its calls and time to phase"""
+        counter = self.phases.setdefault(phase, [0, 0.0])
+        perf_counter = time.perf_counter
+
+        def timed(*args):
+            start = perf_counter()
+            result = fn(*args)
+            counter[1] += perf_counter() - start
+            counter[0] += 1
+            return result
+
+        return timed
+
+    def finish(self, method, elapsed):
+        """Record the solve the phases belong to"""
+        self.method = method
+        self.elapsed = elapsed
+
+    @property
+    def other_time(self):
+        """Solve time outside the profiled phases (loop overhead, bookkeeping)"""
+        return max(0.0, self.elapsed - sum(total for _, total in self.phases.values()))
+
+    def _ordered(self):
+        known = [phase for phase in PHASES if phase in self.phases]
+        return known + sorted(phase for phase in self.phases if phase not in PHASES)
+
+    def summary(self):
+        """Table of calls, cumulative time, time per call and share of the solve"""
+        lines = [f"Profile of {self.method}: {self.elapsed:.3f}s",
+                 f"{'phase':16s} {'calls':>10s} {'total s':>9s} {'per call us':>12s} {'share':>7s}"]
+        rows = [(phase, *self.phases[phase]) for phase in self._ordered()]
+        rows.append(('other', 1, self.other_time))
+        for phase, calls, total in rows:
+            per_call = total / calls * 1e6 if calls else 0.0
+            share = total / self.elapsed if self.elapsed > 0 else 0.0
+            lines.append(f"{phase:16s} {calls:10d} {total:9.3f} {per_call:12.2f} {share:7.1%}")
+        return "\n".join(lines)
+
+    def dump_stats(self, path):
+        """
+        Write the phases as a pstats file: the solver function is the root and
+        each phase a function it calls, so tools draw one flame per phase
+        """
+        root = ('~', 0, f"solve_{self.method}")
+        stats = {root: (1, 1, self.other_time, self.elapsed, {})}
+        for phase in self._ordered():
+            calls, total = self.phases[phase]
+            stats[('~', 0, phase)] = (calls, calls, total, total, {root: (calls, calls, total, total)})
+        with open(path, 'wb') as f:
+            marshal.dump(stats, f)
@@ -0,0 +1,939 @@
+"""
+Headless puzzle rules and A* solver.
+
+Everything here works on packed bitboard states (see solver.bitboard) and
+never imports tkinter, so it can run on machines without a display.
+"""
+
+import heapq
+import itertools
+import time
+from array import array
+
+from . import bitboard, pattern_db, symmetry
+from .bitboard import CHAR_CODES, GROUP_TARGETS, cell_index
+from .budget import BUDGET_EXCEEDED, CANCELLED, EXHAUSTED, SOLVED, UNSOLVABLE, Budget
+from .feasibility import beyond_depth_reason, unsolvable_reason
+from .open_list import BucketQueue, HeapQueue
+from .telemetry import DICT_ENTRY_BYTES, LIST_ENTRY_BYTES, POLL_NODES, StatsPublisher
+from .transposition import TranspositionTable
+
+# Packed-state lookups used by heuristic(), indexed by cell code
+TRUE_CORNER_CODES = [
+    (cell_index(*GROUP_TARGETS[char][0]), CHAR_CODES[char])
+    for char in bitboard.CELL_CHARS[1:]
+]
+GROUP_TARGET_CELLS = [()] + [
+    tuple(cell_index(r, c) for r, c in GROUP_TARGETS[char])
+    for char in bitboard.CELL_CHARS[1:]
+]
+GROUP_DISTANCES = [()] + [
+    tuple(min(abs(r - gr) + abs(c - gc) for gr, gc in GROUP_TARGETS[char])
+          for r in range(1, 5) for c in range(1, 5))
+    for char in bitboard.CELL_CHARS[1:]
+]
+
+
+def _win_cells():
+    cells = 0
+    for char, targets in GROUP_TARGETS.items():
+        for r, c in targets:
+            cells |= CHAR_CODES[char] << (3 * cell_index(r, c))
+    return cells
+
+
+# Cell bits of the solved board (center empty, every group in its corner)
+WIN_CELLS = _win_cells()
+
+
+class SolveResult:
+    """Outcome of a solve() call"""
+
+    def __init__(self, moves, nodes_expanded, elapsed, iterations=None, table_stats=None, optimal=None):
+        self.moves = moves  # list of ('extend'|'retract', r, c), or None
+        self.nodes_expanded = nodes_expanded
+        self.elapsed = elapsed
+        # IDA* only: list of (f-bound, nodes expanded) for each iteration
+        self.iterations = iterations
+        # Counters of the bounded transposition table, when one was used
+        self.table_stats = table_stats
+        # Anytime only: True once no shorter solution within max_depth can exist
+        self.optimal = optimal
+        # Set by solve(): one of the solver.budget statuses, the limit that
+        # ran out ('nodes', 'time' or 'memory') if any, why the board was
+        # rejected without a search (see solver.feasibility) if it was, and
+        # the state with the lowest heuristic reached
+        self.status = None
+        self.budget = None
+        self.reason = None
+        self.best_state = None
+        self.best_heuristic = None
+
+    @property
+    def solved(self):
+        return self.moves is not None
+
+    def __repr__(self):
+        length = len(self.moves) if self.moves is not None else None
+        return (f"SolveResult(status={self.status}, length={length}, nodes_expanded={self.nodes_expanded}, "
+                f"elapsed={self.elapsed:.2f})")
+
+
+def is_win(state):
+    return state & bitboard.CELLS_MASK == WIN_CELLS
+
+
+def goal_states():
+    """
+    Every valid state that satisfies is_win(). Piston heads always land on
+    the outer ring of cells, which a solved board fills completely, so in
+    practice this is the single board with every piston retracted.
+    """
+    return [WIN_CELLS | ext << bitboard.EXT_SHIFT for ext in range(1 << len(bitboard.PISTONS))
+            if bitboard.is_valid_state(WIN_CELLS | ext << bitboard.EXT_SHIFT)]
+
+
+class GoalPerimeter:
+    """
+    Breadth-first layers grown backwards from the goal states with inverse
+    moves. dist maps the canonical key (see solver.symmetry) of every state
+    seen so far to its exact distance to the goal; symmetric states are the
+    same distance away, so each entry covers up to 8 states. The goal never
+    changes, so one perimeter is shared by all solves in a process (see
+    goal_perimeter()).
+    """
+
+    def __init__(self):
+        self.dist = {symmetry.canonical_key(goal): 0 for goal in goal_states()}
+        self.frontier = list(self.dist)
+        self.depth = 0
+
+    def expand(self):
+        """Add the next layer and return the canonical keys newly reached"""
+        depth = self.depth + 1
+        dist = self.dist
+        canonical_key = symmetry.canonical_key
+        layer = []
+        for state in self.frontier:
+            for _, parent in bitboard.predecessors(state):
+                key = canonical_key(parent)
+                if key not in dist:
+                    dist[key] = depth
+                    layer.append(key)
+        self.frontier = layer
+        self.depth = depth
+        return layer
+
+    def distance(self, state):
+        """Exact distance from state to the goal, or None if it is outside the perimeter"""
+        return self.dist.get(symmetry.canonical_key(state))
+
+    def path_to_goal(self, state):
+        """Piston indices leading from a state inside the perimeter to a goal"""
+        path = []
+        d = self.distance(state)
+        while d:
+            for piston, child in bitboard.successors(state):
+                if self.distance(child) == d - 1:
+                    path.append(piston)
+                    state = child
+                    break
+            d -= 1
+        return path
+
+
+_goal_perimeter = None
+
+
+def goal_perimeter():
+    """The process-wide GoalPerimeter, created on first use"""
+    global _goal_perimeter
+    if _goal_perimeter is None:
+        _goal_perimeter = GoalPerimeter()
+    return _goal_perimeter
+
+
+# Components of heuristic(), packed so that per-line values can be added and
+# subtracted: bits 0-7 hold the distance sum, bits 8-11 the wrong true
+# corners and bits 12-27 a 4-bit count per color of its blocks inside its
+# goal group. Fields never go negative, as every total is a real count.
+COMPONENT_WRONG_SHIFT = 8
+COMPONENT_COUNT_SHIFT = 12
+
+
+def _cell_components(cell, code):
+    components = GROUP_DISTANCES[code][cell]
+    for corner, corner_code in TRUE_CORNER_CODES:
+        if cell == corner and code != corner_code:
+            components += 1 << COMPONENT_WRONG_SHIFT
+    if cell in GROUP_TARGET_CELLS[code]:
+        components += 1 << (COMPONENT_COUNT_SHIFT + 4 * (code - 1))
+    return components
+
+
+def _line_component_tables():
+    # Summed components of every 12-bit line value, for each of the 8 lines
+    tables = []
+    for k in range(8):
+        cells = bitboard._line_cells(k)
+        table = []
+        for line in range(1 << 12):
+            components = 0
+            for i, cell in enumerate(cells):
+                code = (line >> (3 * i)) & 7
+                if code > 4:
+                    break
+                if code:
+                    components += _cell_components(cell, code)
+                else:
+                    # An empty true corner is a wrong one
+                    components += sum(1 << COMPONENT_WRONG_SHIFT
+                                      for corner, _ in TRUE_CORNER_CODES if corner == cell)
+            table.append(components)
+        tables.append(table)
+    return tables
+
+
+LINE_COMPONENTS = _line_component_tables()
+# Phase 2 penalty for each packed set of four group counts
+PHASE2_PENALTY = [
+    sum(max(0, 2 - ((counts >> (4 * i)) & 15)) for i in range(4))
+    for counts in range(1 << 16)
+]
+
+
+class IncrementalHeuristic:
+    """
+    A heuristic that is a function of per-line components.
+
+    A move only changes one row or column, so a search that keeps each
+    node's components can score a child with update() and value() instead of
+    rescanning the board. Calling the object scores a state from scratch.
+    """
+
+    def __init__(self, line_tables, value):
+        self.line_tables = line_tables
+        self.value = value
+        self._rows = line_tables[4:]
+
+    def components(self, state):
+        rows = self._rows
+        return (rows[0][state & 0xFFF] + rows[1][(state >> 12) & 0xFFF]
+                + rows[2][(state >> 24) & 0xFFF] + rows[3][(state >> 36) & 0xFFF])
+
+    def update(self, components, k, old_line, new_line):
+        """Components after line k changed from old_line to new_line"""
+        tables = self.line_tables[k]
+        return components + tables[new_line] - tables[old_line]
+
+    def __call__(self, state):
+        return self.value(self.components(state))
+
+
+def _classic_value(components):
+    wrong_corner = (components >> COMPONENT_WRONG_SHIFT) & 15
+    dist_penalty = components & 0xFF
+    if wrong_corner:
+        return wrong_corner * 7 + dist_penalty
+    # Phase 2: After all true corners are correct, get 2 of each color in their goal corner
+    phase2_penalty = PHASE2_PENALTY[components >> COMPONENT_COUNT_SHIFT]
+    if phase2_penalty == 0:
+        # This is a 4/4 state - give it massive priority even if moves aren't optimal
+        return 0
+    return phase2_penalty * 2 + dist_penalty
+
+
+# Corner-first estimate used to order the A* search (not admissible):
+# 7 per wrong true corner, then 2 per block missing from a color's goal
+# group once the corners are right, plus the Manhattan distance sum
+heuristic = IncrementalHeuristic(LINE_COMPONENTS, _classic_value)
+
+
+def default_heuristic():
+    """Additive pattern database when its table is available, else heuristic()"""
+    db = pattern_db.load()
+    if db is None:
+        return heuristic
+    return IncrementalHeuristic(pattern_db.LINE_MASKS, db.additive_masks)
+
+
+def default_lower_bound():
+    """Admissible pattern database estimate when available, else None (no bound)"""
+    db = pattern_db.load()
+    if db is None:
+        return None
+    return IncrementalHeuristic(pattern_db.LINE_MASKS, db.admissible_masks)
+
+
+def get_possible_moves(state):
+    """Legal moves from state as ('extend'|'retract', r, c) tuples"""
+    return bitboard.legal_moves(state)
+
+
+def apply_move(state, move):
+    """Apply an ('extend'|'retract', r, c) move; blocked moves leave state unchanged"""
+    action, r, c = move
+    p = bitboard.PISTON_INDEX[(r, c)]
+    if (action == 'retract') != bitboard.is_extended(state, p):
+        return state
+    new_state = bitboard.apply_piston(state, p)
+    return state if new_state is None else new_state
+
+
+def path_to_moves(state, path):
+    """Replay piston indices from state into ('extend'|'retract', r, c) moves"""
+    moves = []
+    for p in path:
+        moves.append(bitboard.move_tuple(state, p))
+        state = bitboard.apply_piston(state, p)
+    return moves
+
+
+def solve(state, method='astar', max_depth=100, heuristic=None, should_stop=None,
+          on_improve=None, log=None, on_stats=None, stats_interval=0.5,
+          max_nodes=None, time_limit=None, max_memory=None, profiler=None, **options):
+    """
+    Search for a move sequence that solves state.
+
+    method: 'astar' (default), 'ida' for iterative-deepening A*, whose memory
+        use grows only with the solution depth, 'bidirectional' to meet a
+        backward search from the goal, 'hda' to spread one search over
+        worker processes, or 'anytime' to report ever shorter solutions
+    heuristic: optional callable(state) -> int; defaults to default_heuristic().
+        An IncrementalHeuristic is updated per move instead of rescanning children
+    should_stop: optional callable polled once per expansion; returning True cancels
+    on_improve: optional callable(state, h) called when a node with a lower heuristic is reached
+    log: optional callable(str) for periodic progress lines
+    on_stats: optional callable(SolverStats) called every stats_interval
+        seconds and once more on return (see solver.telemetry)
+    max_nodes, time_limit (seconds), max_memory (estimated bytes): optional
+        budgets; the search stops gracefully when one runs out
+    profiler: optional solver.profiling.Profiler that times the hot calls
+        of 'astar' or 'anytime' per phase
+    options: method-specific settings, e.g. symmetry_keys, visited_bytes,
+        visited_policy and open_list for 'astar', tt_size for 'ida', backward_limit for
+        'bidirectional', workers and batch_size for 'hda' or weight and
+        on_solution for 'anytime'
+
+    Boards that solver.feasibility proves dead are rejected without a
+    search, with result.reason saying why.
+
+    The result's status is 'solved', 'exhausted' (no solution within
+    max_depth), 'unsolvable' (no solution at any depth), 'budget_exceeded'
+    (result.budget names the limit) or 'cancelled', and best_state is the
+    lowest-heuristic state reached.
+    """
+    start_time = time.time()
+    if heuristic is None:
+        heuristic = default_heuristic()
+    if method not in SOLVERS:
+        raise ValueError(f"unknown solver method {method!r}, expected one of {sorted(SOLVERS)}")
+    if profiler is not None:
+        if method not in PROFILED_SOLVERS:
+            raise ValueError(f"profiling supports {sorted(PROFILED_SOLVERS)}, not {method!r}")
+        options['profiler'] = profiler
+
+    budget = None
+    if should_stop is not None or max_nodes is not None or time_limit is not None or max_memory is not None:
+        # HDA* polls from its coordinator loop; its node totals come from telemetry
+        budget = Budget(max_nodes, time_limit, max_memory, should_stop, start_time,
+                        count_calls=method != 'hda')
+    best = [state, heuristic(state)]
+
+    def track_improve(improved_state, h):
+        best[:] = improved_state, h
+        if on_improve is not None:
+            on_improve(improved_state, h)
+
+    # Memory budgets (and node budgets for HDA*, whose workers count the
+    # nodes) are followed through telemetry, sampled at every poll: every
+    # POLL_NODES expansions, whatever the wall clock says
+    follow_stats = max_memory is not None or (max_nodes is not None and method == 'hda')
+    if follow_stats:
+        last_forwarded = [None]
+
+        def observe(snapshot):
+            budget.observe(snapshot)
+            if on_stats is not None and (snapshot.final or last_forwarded[0] is None
+                                         or snapshot.elapsed - last_forwarded[0] >= stats_interval):
+                last_forwarded[0] = snapshot.elapsed
+                on_stats(snapshot)
+
+        options['stats'] = StatsPublisher(observe, method, 0, start_time)
+    elif on_stats is not None:
+        options['stats'] = StatsPublisher(on_stats, method, stats_interval, start_time)
+
+    unsolvable = unsolvable_reason(state)
+    too_deep = beyond_depth_reason(state, max_depth) if unsolvable is None else None
+    if unsolvable is not None or too_deep is not None:
+        if log is not None:
+            log(f"[Solver] No solution: {unsolvable or too_deep}.")
+        result = SolveResult(None, 0, time.time() - start_time)
+        result.reason = unsolvable or too_deep
+    else:
+        result = SOLVERS[method](state, max_depth, heuristic, budget, track_improve, log, **options)
+    if 'stats' in options:
+        options['stats'].finish(result)
+    if profiler is not None:
+        profiler.finish(method, result.elapsed)
+
+    result.best_state, result.best_heuristic = best
+    reason = budget.reason if budget is not None else None
+    if reason != 'cancelled':
+        result.budget = reason
+    if result.moves is not None:
+        result.status = SOLVED
+    elif unsolvable is not None:
+        result.status = UNSOLVABLE
+    elif too_deep is not None:
+        result.status = EXHAUSTED
+    elif reason == 'cancelled':
+        result.status = CANCELLED
+    elif reason is not None:
+        result.status = BUDGET_EXCEEDED
+    else:
+        result.status = EXHAUSTED
+    return result
+
+
+class NodeArena:
+    """
+    Search nodes stored as parallel arrays, addressed by integer node id.
+
+    Each node records its packed state, moves from the start, parent node id
+    (-1 for the root) and the piston that led to it, so a heap entry only
+    needs the node id and a path is rebuilt by walking parents.
+    """
+
+    __slots__ = ('states', 'g', 'parents', 'pistons')
+
+    def __init__(self):
+        self.states = array('Q')
+        self.g = array('H')
+        self.parents = array('l')
+        self.pistons = array('b')
+
+    def add(self, state, g, parent=-1, piston=-1):
+        self.states.append(state)
+        self.g.append(g)
+        self.parents.append(parent)
+        self.pistons.append(piston)
+        return len(self.states) - 1
+
+    def path(self, node_id):
+        """Piston indices from the root to node_id"""
+        parents = self.parents
+        pistons = self.pistons
+        path = []
+        while parents[node_id] >= 0:
+            path.append(pistons[node_id])
+            node_id = parents[node_id]
+        path.reverse()
+        return path
+
+    def __len__(self):
+        return len(self.states)
+
+    @property
+    def approx_bytes(self):
+        """Memory used by the node arrays"""
+        return sum(len(a) * a.itemsize for a in (self.states, self.g, self.parents, self.pistons))
+
+
+def solve_astar(state, max_depth, heuristic, should_stop, on_improve, log, symmetry_keys=False,
+                visited_bytes=None, visited_policy='depth', open_list=None, stats=None, profiler=None):
+    """
+    Best-first A* search keeping every generated state in memory.
+
+    With symmetry_keys the visited map is keyed on canonical keys, so a
+    state is skipped when any symmetric image was already reached in as few
+    moves. That stores fewer states at the cost of canonicalizing each child.
+
+    visited_bytes caps the visited map with a TranspositionTable using
+    visited_policy ('depth' or 'lru'). Evicted states may be expanded again,
+    which costs extra expansions and can lead to a different (still valid)
+    solution and node count than an unbounded search, but never makes the
+    search unsound.
+
+    open_list is 'buckets' for a BucketQueue or 'heap' for a binary heap. The
+    default is buckets for an IncrementalHeuristic, whose values are small
+    non-negative ints, and the heap for any other heuristic. Both pop the
+    lowest f, then the lowest g, then the oldest node.
+
+    With a profiler (see solver.profiling) the hot calls are timed per phase.
+    """
+    start_time = time.time()
+    # An IncrementalHeuristic keeps each node's components beside the arena,
+    # indexed by node id, and scores children from the line their move changed
+    incremental = isinstance(heuristic, IncrementalHeuristic)
+    if incremental:
+        node_components = [heuristic.components(state)]
+        value = heuristic.value
+        update = heuristic.update
+        initial_heuristic = value(node_components[0])
+    else:
+        initial_heuristic = heuristic(state)
+    best_heuristic = initial_heuristic
+
+    if open_list is None:
+        open_list = 'buckets' if incremental else 'heap'
+    if open_list == 'buckets':
+        # Children are pushed with g up to max_depth + 1
+        queue = BucketQueue(max_depth + 2)
+    elif open_list == 'heap':
+        queue = HeapQueue()
+    else:
+        raise ValueError(f"unknown open list {open_list!r}, expected 'buckets' or 'heap'")
+    # Queue items are node ids
+    nodes = NodeArena()
+    node_states = nodes.states
+    node_pistons = nodes.pistons
+    add_node = nodes.add
+    # For cycle detection, keep a dict of state: min moves to reach
+    key_of = symmetry.canonical_key if symmetry_keys else None
+    if visited_bytes is None:
+        visited = {}
+        store_visited = visited.__setitem__
+    else:
+        visited = TranspositionTable(visited_bytes, visited_policy)
+        store_visited = visited.store
+    store_visited(key_of(state) if key_of else state, 0)
+    table_stats = visited.stats if visited_bytes is not None else lambda: None
+    queue.push(initial_heuristic, 0, add_node(state, 0))
+    push = queue.push
+    pop = queue.pop
+    lookup = visited.get
+    successor_lines = bitboard.successor_lines
+    if profiler is not None:
+        pop, push = profiler.wrap('open_pop', pop), profiler.wrap('open_push', push)
+        successor_lines = profiler.wrap('move_generation', successor_lines)
+        lookup, store_visited = profiler.wrap('visited_lookup', lookup), profiler.wrap('visited_store', store_visited)
+        if key_of is not None:
+            key_of = profiler.wrap('key', key_of)
+        if incremental:
+            update, value = profiler.wrap('heuristic', update), profiler.wrap('heuristic', value)
+        else:
+            heuristic = profiler.wrap('heuristic', heuristic)
+    node_count = 0
+    initial_state = state
+    while queue:
+        priority, moves_so_far, node_id = pop()
+        state = node_states[node_id]
+        if stats is not None and node_count % POLL_NODES == 0 and stats.due():
+            visited_memory = len(visited) * DICT_ENTRY_BYTES if visited_bytes is None else visited.approx_bytes
+            components_memory = len(node_components) * LIST_ENTRY_BYTES if incremental else 0
+            stats.publish(node_count, len(queue), len(visited), priority, best_heuristic,
+                          nodes.approx_bytes + visited_memory + components_memory + len(queue) * LIST_ENTRY_BYTES)
+        # Lazy removal: skip a node whose state was reached again in fewer moves
+        seen = lookup(key_of(state) if key_of else state)
+        if seen is not None and seen < moves_so_far:
+            continue
+        # Polled once per expansion, so a node budget counts expansions only
+        if should_stop is not None and should_stop():
+            return SolveResult(None, node_count, time.time() - start_time, table_stats=table_stats())
+
+        if incremental:
+            components = node_components[node_id]
+            current_heuristic = value(components)
+        else:
+            current_heuristic = heuristic(state)
+        if current_heuristic < best_heuristic:
+            best_heuristic = current_heuristic
+            if on_improve is not None:
+                on_improve(state, best_heuristic)
+
+        node_count += 1
+        if log is not None and node_count % 5000 == 0:
+            elapsed = time.time() + 1e-9 - start_time
+            log(f"[Solver] {node_count} nodes expanded in {elapsed:.2f} seconds, best heuristic: {best_heuristic}...")
+        if moves_so_far > max_depth:
+            continue
+        if is_win(state):
+            elapsed = time.time() - start_time
+            if log is not None:
+                log(f"[Solver] Solution found in {elapsed:.2f} seconds, {moves_so_far} moves.")
+            return SolveResult(path_to_moves(initial_state, nodes.path(node_id)), node_count, elapsed,
+                               table_stats=table_stats())
+        # The piston that led here, for the undo-move penalty (-1 at the root)
+        last_piston = node_pistons[node_id]
+        for piston, new_state, k, old_line, new_line in successor_lines(state):
+            # Undo-move penalty: toggling the same piston again undoes the last move
+            undo_penalty = 3 if piston == last_piston else 0
+            # Cycle detection: if we've seen this state with fewer or equal moves, skip
+            key = key_of(new_state) if key_of else new_state
+            seen = lookup(key)
+            if seen is not None and seen <= moves_so_far + 1:
+                continue
+            store_visited(key, moves_so_far + 1)
+            if incremental:
+                child_components = update(components, k, old_line, new_line)
+                node_components.append(child_components)
+                h = value(child_components)
+            else:
+                h = heuristic(new_state)
+            priority = moves_so_far + 1 + h + undo_penalty
+            push(priority, moves_so_far + 1, add_node(new_state, moves_so_far + 1, node_id, piston))
+
+    elapsed = time.time() - start_time
+    if log is not None:
+        log(f"[Solver] No solution found in {elapsed:.2f} seconds.")
+    return SolveResult(None, node_count, elapsed, table_stats=table_stats())
+
+
+def solve_ida(state, max_depth, heuristic, should_stop, on_improve, log, tt_size=65536, stats=None):
+    """
+    Iterative-deepening A*. Memory is proportional to the depth, plus a
+    depth-preferred transposition table of tt_size slots (0 disables it) that
+    stops the same state being expanded twice within one iteration. Without
+    it the many transpositions of this puzzle make IDA* impractically slow.
+    """
+    start_time = time.time()
+    initial_state = state
+    best_heuristic = bound = heuristic(state)
+    if is_win(state):
+        return SolveResult([], 0, time.time() - start_time, [])
+
+    iterations = []
+    node_count = 0
+    root_components = heuristic.components(state) if isinstance(heuristic, IncrementalHeuristic) else None
+    table = TranspositionTable(capacity=tt_size) if tt_size else None
+    table_stats = table.stats if table is not None else lambda: None
+    while True:
+        iteration_nodes = 0
+        next_bound = None
+        if table is not None:
+            table.clear()
+        # Depth-first stack of child lists; path and path_states mirror it
+        path = []
+        path_states = [state]
+        on_path = {state}
+        stack = [_ordered_children(state, heuristic, root_components)]
+        while stack:
+            children = stack[-1]
+            if not children:
+                stack.pop()
+                if path:
+                    path.pop()
+                    on_path.discard(path_states.pop())
+                continue
+            h, piston, child, components = children.pop()
+            g = len(path) + 1
+            if child in on_path:
+                continue
+            f = g + h
+            if f > bound:
+                if next_bound is None or f < next_bound:
+                    next_bound = f
+                continue
+            if table is not None:
+                seen = table.get(child)
+                if seen is not None and seen <= g:
+                    continue
+                table.store(child, g)
+            if is_win(child):
+                path.append(piston)
+                iterations.append((bound, iteration_nodes))
+                elapsed = time.time() - start_time
+                if log is not None:
+                    log(f"[Solver] IDA* solution found in {elapsed:.2f} seconds, {len(path)} moves.")
+                return SolveResult(path_to_moves(initial_state, path), node_count, elapsed, iterations,
+                                   table_stats())
+            if g >= max_depth:
+                continue
+
+            if should_stop is not None and should_stop():
+                iterations.append((bound, iteration_nodes))
+                return SolveResult(None, node_count, time.time() - start_time, iterations, table_stats())
+            if h < best_heuristic:
+                best_heuristic = h
+                if on_improve is not None:
+                    on_improve(child, best_heuristic)
+            if stats is not None and node_count % POLL_NODES == 0 and stats.due():
+                open_size = sum(len(pending) for pending in stack)
+                stats.publish(node_count, open_size, len(table) if table is not None else len(on_path), bound,
+                              best_heuristic, (table.approx_bytes if table is not None else 0)
+                              + (open_size + 2 * len(path)) * LIST_ENTRY_BYTES + len(on_path) * DICT_ENTRY_BYTES)
+            node_count += 1
+            iteration_nodes += 1
+            path.append(piston)
+            path_states.append(child)
+            on_path.add(child)
+            stack.append(_ordered_children(child, heuristic, components))
+
+        iterations.append((bound, iteration_nodes))
+        if log is not None:
+            elapsed = time.time() - start_time
+            log(f"[Solver] IDA* bound {bound}: {iteration_nodes} nodes expanded ({elapsed:.2f} seconds total)")
+        if next_bound is None:
+            # Nothing was cut off by the bound, so the reachable space is exhausted
+            elapsed = time.time() - start_time
+            if log is not None:
+                log(f"[Solver] No solution found in {elapsed:.2f} seconds.")
+            return SolveResult(None, node_count, elapsed, iterations, table_stats())
+        bound = next_bound
+
+
+def _ordered_children(state, heuristic, components=None):
+    # Children as (h, piston, child, components) with the most promising last,
+    # ready to pop(). components is the parent's for an IncrementalHeuristic,
+    # else None; pistons differ between children, so sorting never compares it.
+    if components is None:
+        children = [(heuristic(child), piston, child, None)
+                    for piston, child in bitboard.successors(state)]
+    else:
+        value, update = heuristic.value, heuristic.update
+        children = []
+        for piston, child, k, old_line, new_line in bitboard.successor_lines(state):
+            child_components = update(components, k, old_line, new_line)
+            children.append((value(child_components), piston, child, child_components))
+    children.sort(reverse=True)
+    return children
+
+
+def solve_bidirectional(state, max_depth, heuristic, should_stop, on_improve, log, backward_limit=300000,
+                        stats=None):
+    """
+    Forward A* towards a backward breadth-first search from the goal states.
+
+    The backward side is grown one layer at a time whenever it holds fewer
+    states than the forward side, up to backward_limit states. The search
+    stops as soon as the two sides share a state (up to symmetry), and the
+    solution is the forward path to that state plus the exact backward path
+    to the goal.
+    """
+    start_time = time.time()
+    perimeter = goal_perimeter()
+    initial_state = state
+
+    def found(meeting_state, node_count):
+        path = []
+        s = meeting_state
+        while parents[s] is not None:
+            s, piston = parents[s]
+            path.append(piston)
+        path.reverse()
+        path += perimeter.path_to_goal(meeting_state)
+        elapsed = time.time() - start_time
+        if log is not None:
+            log(f"[Solver] Sides met after {node_count} forward nodes and {len(perimeter.dist)} "
+                f"backward states in {elapsed:.2f} seconds, {len(path)} moves.")
+        return SolveResult(path_to_moves(initial_state, path), node_count, elapsed)
+
+    canonical_key = symmetry.canonical_key
+    parents = {state: None}
+    visited = {state: 0}
+    # Expanded forward states by canonical key, to look up backward states.
+    # Only expanded states are canonicalized; that is 10x cheaper than doing
+    # it for every generated child and delays a meeting by one move at most.
+    expanded = {}
+
+    best_heuristic = heuristic(state)
+    heap = [(best_heuristic, 0, 0, state, None)]
+    counter = itertools.count(1)
+    node_count = 0
+    while heap:
+        # Keep the two sides balanced while the backward side may still grow
+        while (perimeter.frontier and len(perimeter.dist) < len(expanded)
+               and len(perimeter.dist) < backward_limit):
+            layer = perimeter.expand()
+            if log is not None:
+                log(f"[Solver] Backward depth {perimeter.depth}: {len(perimeter.dist)} states")
+            for key in layer:
+                if key in expanded:
+                    return found(expanded[key], node_count)
+
+        priority, moves_so_far, _, state, last_piston = heapq.heappop(heap)
+        if moves_so_far > visited[state]:
+            continue  # Stale entry, the state was reached again by a shorter path
+        if should_stop is not None and should_stop():
+            return SolveResult(None, node_count, time.time() - start_time)
+        if stats is not None and node_count % POLL_NODES == 0 and stats.due():
+            # Both sides count as visited: forward states plus the backward perimeter
+            stats.publish(node_count, len(heap), len(visited) + len(perimeter.dist), priority, best_heuristic,
+                          (len(visited) + len(parents) + len(expanded) + len(perimeter.dist)) * DICT_ENTRY_BYTES
+                          + len(heap) * LIST_ENTRY_BYTES)
+        current_heuristic = heuristic(state)
+        if current_heuristic < best_heuristic:
+            best_heuristic = current_heuristic
+            if on_improve is not None:
+                on_improve(state, best_heuristic)
+
+        node_count += 1
+        if log is not None and node_count % 5000 == 0:
+            elapsed = time.time() + 1e-9 - start_time
+            log(f"[Solver] {node_count} nodes expanded in {elapsed:.2f} seconds, best heuristic: {best_heuristic}...")
+        key = canonical_key(state)
+        if key in perimeter.dist:
+            return found(state, node_count)
+        if moves_so_far >= max_depth:
+            continue
+        expanded[key] = state
+        for piston, new_state in bitboard.successors(state):
+            seen = visited.get(new_state)
+            if seen is not None and seen <= moves_so_far + 1:
+                continue
+            visited[new_state] = moves_so_far + 1
+            parents[new_state] = (state, piston)
+            undo_penalty = 3 if piston == last_piston else 0
+            priority = moves_so_far + 1 + heuristic(new_state) + undo_penalty
+            heapq.heappush(heap, (priority, moves_so_far + 1, next(counter), new_state, piston))
+
+    elapsed = time.time() - start_time
+    if log is not None:
+        log(f"[Solver] No solution found in {elapsed:.2f} seconds.")
+    return SolveResult(None, node_count, elapsed)
+
+
+def solve_anytime(state, max_depth, heuristic, should_stop, on_improve, log, weight=2,
+                  lower_bound=None, on_solution=None, stats=None, profiler=None):
+    """
+    Anytime weighted A*: report a first solution quickly, then keep
+    searching for strictly shorter ones.
+
+    Nodes are expanded in order of g + weight * h. Each goal reached that is
+    shorter than the best so far becomes the new incumbent and is passed to
+    on_solution(moves). From then on, a node is dropped when g plus its
+    lower_bound (an admissible callable(state) -> int; defaults to
+    default_lower_bound()) reaches the incumbent's length. When the open list
+    runs dry, the incumbent is optimal and result.optimal is True; stopping
+    early on should_stop (or a solve() budget such as time_limit) returns the
+    incumbent with result.optimal False.
+
+    With a profiler (see solver.profiling) the hot calls are timed per phase.
+    """
+    start_time = time.time()
+    if lower_bound is None:
+        lower_bound = default_lower_bound() or (lambda s: 0)
+    incremental = isinstance(heuristic, IncrementalHeuristic)
+    # The default heuristic and bound share their per-line tables, so one set
+    # of components scores both
+    shared = (incremental and isinstance(lower_bound, IncrementalHeuristic)
+              and lower_bound.line_tables is heuristic.line_tables)
+    if incremental:
+        node_components = [heuristic.components(state)]
+        value = heuristic.value
+        update = heuristic.update
+        initial_heuristic = value(node_components[0])
+    else:
+        initial_heuristic = heuristic(state)
+    bound_value = lower_bound.value if shared else None
+    best_heuristic = initial_heuristic
+
+    initial_state = state
+    if is_win(state):
+        if on_solution is not None:
+            on_solution([])
+        return SolveResult([], 0, time.time() - start_time, optimal=True)
+
+    nodes = NodeArena()
+    node_states = nodes.states
+    node_pistons = nodes.pistons
+    add_node = nodes.add
+    use_buckets = incremental and isinstance(weight, int)
+    queue = BucketQueue(max_depth + 2) if use_buckets else HeapQueue()
+    queue.push(weight * initial_heuristic, 0, add_node(state, 0))
+    visited = {state: 0}
+    push = queue.push
+    pop = queue.pop
+    lookup = visited.get
+    store_visited = visited.__setitem__
+    successor_lines = bitboard.successor_lines
+    if profiler is not None:
+        pop, push = profiler.wrap('open_pop', pop), profiler.wrap('open_push', push)
+        successor_lines = profiler.wrap('move_generation', successor_lines)
+        lookup, store_visited = profiler.wrap('visited_lookup', lookup), profiler.wrap('visited_store', store_visited)
+        if incremental:
+            update, value = profiler.wrap('heuristic', update), profiler.wrap('heuristic', value)
+        else:
+            heuristic = profiler.wrap('heuristic', heuristic)
+        if shared:
+            bound_value = profiler.wrap('heuristic', bound_value)
+        else:
+            lower_bound = profiler.wrap('heuristic', lower_bound)
+    # Only solutions shorter than best_cost are of interest
+    best_cost = max_depth + 1
+    best_moves = None
+    node_count = 0
+    while queue:
+        priority, moves_so_far, node_id = pop()
+        state = node_states[node_id]
+        if stats is not None and node_count % POLL_NODES == 0 and stats.due():
+            components_memory = len(node_components) * LIST_ENTRY_BYTES if incremental else 0
+            stats.publish(node_count, len(queue), len(visited), priority, best_heuristic,
+                          nodes.approx_bytes + len(visited) * DICT_ENTRY_BYTES + components_memory
+                          + len(queue) * LIST_ENTRY_BYTES)
+        if lookup(state) < moves_so_far:
+            continue  # Stale entry, the state was reached again in fewer moves
+        components = node_components[node_id] if incremental else None
+        if moves_so_far + (bound_value(components) if shared else lower_bound(state)) >= best_cost:
+            continue  # Cannot beat the incumbent found since it was queued
+        if should_stop is not None and should_stop():
+            break
+
+        current_heuristic = value(components) if incremental else heuristic(state)
+        if current_heuristic < best_heuristic:
+            best_heuristic = current_heuristic
+            if on_improve is not None:
+                on_improve(state, best_heuristic)
+        node_count += 1
+        if log is not None and node_count % 5000 == 0:
+            elapsed = time.time() + 1e-9 - start_time
+            log(f"[Solver] {node_count} nodes expanded in {elapsed:.2f} seconds, best heuristic: {best_heuristic}...")
+
+        g = moves_so_far + 1
+        for piston, new_state, k, old_line, new_line in successor_lines(state):
+            seen = lookup(new_state)
+            if seen is not None and seen <= g:
+                continue
+            if incremental:
+                child_components = update(components, k, old_line, new_line)
+            if is_win(new_state):
+                # Goals are tested when generated, so a better incumbent
+                # starts pruning as early as possible
+                if g < best_cost:
+                    best_cost = g
+                    best_moves = path_to_moves(initial_state, nodes.path(node_id) + [piston])
+                    if log is not None:
+                        log(f"[Solver] {g}-move solution after {time.time() - start_time:.2f} seconds")
+                    if on_solution is not None:
+                        on_solution(best_moves)
+                continue
+            if g + (bound_value(child_components) if shared else lower_bound(new_state)) >= best_cost:
+                continue
+            store_visited(new_state, g)
+            if incremental:
+                node_components.append(child_components)
+                h = value(child_components)
+            else:
+                h = heuristic(new_state)
+            push(g + weight * h, g, add_node(new_state, g, node_id, piston))
+    else:
+        elapsed = time.time() - start_time
+        if log is not None:
+            if best_moves is None:
+                log(f"[Solver] No solution found in {elapsed:.2f} seconds.")
+            else:
+                log(f"[Solver] {len(best_moves)} moves proven optimal in {elapsed:.2f} seconds.")
+        return SolveResult(best_moves, node_count, elapsed, optimal=True)
+
+    return SolveResult(best_moves, node_count, time.time() - start_time, optimal=False)
+
+
+def solve_hda(state, max_depth, heuristic, should_stop, on_improve, log, workers=None, batch_size=64,
+              stats=None):
+    """Hash-distributed A* across worker processes; see solver.parallel"""
+    from . import parallel
+    return parallel.solve_hda(state, max_depth, heuristic, should_stop, on_improve, log,
+                              workers=workers, batch_size=batch_size, stats=stats)
+
+
+SOLVERS = {
+    'astar': solve_astar,
+    'ida': solve_ida,
+    'bidirectional': solve_bidirectional,
+    'hda': solve_hda,
+    'anytime': solve_anytime,
+}
+
+# Solvers that take a profiler
+PROFILED_SOLVERS = {'astar', 'anytime'}
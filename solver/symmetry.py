@@ -0,0 +1,146 @@
+"""
+Symmetries of the board.
+
+The 4x4 board and its ring of pistons look the same under the 8 rotations and
+reflections of the square. Each symmetry moves every corner onto another
+corner, so the block colors are relabelled to match: a state and its image
+are then exactly as far from the goal, and solutions carry over move by move
+with the pistons relabelled.
+
+canonical(state) picks one representative per class of symmetric states, which
+can be used as a key wherever states are stored (visited sets, solution
+caches) to share work between symmetric boards.
+"""
+
+import itertools
+
+from .bitboard import EXT_SHIFT, GROUP_TARGETS, PISTONS, PISTON_INDEX, CHAR_CODES, cell_index
+
+
+def _point_maps():
+    # Each symmetry as a map on 6x6 grid coordinates (pistons and cells alike)
+    return [
+        lambda r, c: (r, c),          # identity
+        lambda r, c: (c, 5 - r),      # quarter turn clockwise
+        lambda r, c: (5 - r, 5 - c),  # half turn
+        lambda r, c: (5 - c, r),      # quarter turn counterclockwise
+        lambda r, c: (r, 5 - c),      # mirror left-right
+        lambda r, c: (5 - r, c),      # mirror top-bottom
+        lambda r, c: (c, r),          # mirror on the main diagonal
+        lambda r, c: (5 - c, 5 - r),  # mirror on the anti-diagonal
+    ]
+
+
+POINT_MAPS = _point_maps()
+IDENTITY = 0
+NUM_SYMMETRIES = len(POINT_MAPS)
+
+# CELL_PERMS[s][i]: where inner cell i goes under symmetry s
+CELL_PERMS = [
+    [cell_index(*f(r, c)) for r in range(1, 5) for c in range(1, 5)]
+    for f in POINT_MAPS
+]
+
+# PISTON_PERMS[s][p]: which piston p becomes under symmetry s
+PISTON_PERMS = [[PISTON_INDEX[f(*pos)] for pos in PISTONS] for f in POINT_MAPS]
+INVERSE_PISTON_PERMS = [
+    [perm.index(p) for p in range(len(PISTONS))] for perm in PISTON_PERMS
+]
+
+
+def _color_perm(f):
+    # Relabel colors so each group lands on the group that owns its new corner
+    perm = [0] * 5
+    for char, targets in GROUP_TARGETS.items():
+        corner = f(*targets[0])
+        for other, other_targets in GROUP_TARGETS.items():
+            if other_targets[0] == corner:
+                perm[CHAR_CODES[char]] = CHAR_CODES[other]
+    return perm
+
+
+COLOR_PERMS = [_color_perm(f) for f in POINT_MAPS]
+
+
+def _row_tables(s):
+    tables = []
+    for row in range(4):
+        table = [0] * (1 << 12)
+        for codes in itertools.product(range(5), repeat=4):
+            line = 0
+            image = 0
+            for i, code in enumerate(codes):
+                line |= code << (3 * i)
+                image |= COLOR_PERMS[s][code] << (3 * CELL_PERMS[s][4 * row + i])
+            table[line] = image
+        tables.append(table)
+    return tables
+
+
+def _ext_table(s, offset):
+    table = []
+    for byte in range(256):
+        image = 0
+        for bit in range(8):
+            if byte & (1 << bit):
+                image |= 1 << (EXT_SHIFT + PISTON_PERMS[s][offset + bit])
+        table.append(image)
+    return table
+
+
+# Per symmetry: packed row contents -> image bits, and extension byte -> image bits
+ROW_TABLES = [_row_tables(s) for s in range(NUM_SYMMETRIES)]
+EXT_TABLES = [(_ext_table(s, 0), _ext_table(s, 8)) for s in range(NUM_SYMMETRIES)]
+
+
+def _compose(a, b):
+    # Symmetry equal to applying a, then b
+    perm = [PISTON_PERMS[b][PISTON_PERMS[a][p]] for p in range(len(PISTONS))]
+    return PISTON_PERMS.index(perm)
+
+
+# COMPOSE[a][b]: apply a, then b
+COMPOSE = [[_compose(a, b) for b in range(NUM_SYMMETRIES)] for a in range(NUM_SYMMETRIES)]
+INVERSE = [COMPOSE[s].index(IDENTITY) for s in range(NUM_SYMMETRIES)]
+
+
+def transform(state, s):
+    """Image of state under symmetry s"""
+    rows = ROW_TABLES[s]
+    ext_lo, ext_hi = EXT_TABLES[s]
+    return (rows[0][state & 0xFFF] | rows[1][(state >> 12) & 0xFFF]
+            | rows[2][(state >> 24) & 0xFFF] | rows[3][(state >> 36) & 0xFFF]
+            | ext_lo[(state >> EXT_SHIFT) & 0xFF] | ext_hi[state >> (EXT_SHIFT + 8)])
+
+
+def canonical(state):
+    """(representative, s) where representative == transform(state, s) is the smallest image"""
+    best = state
+    best_sym = IDENTITY
+    for s in range(1, NUM_SYMMETRIES):
+        image = transform(state, s)
+        if image < best:
+            best = image
+            best_sym = s
+    return best, best_sym
+
+
+def canonical_key(state):
+    """Smallest image of state; equal for all symmetric states"""
+    return canonical(state)[0]
+
+
+def map_path(path, s):
+    """Piston indices played on transform(state, s), translated back to pistons of state"""
+    inverse = INVERSE_PISTON_PERMS[s]
+    return [inverse[p] for p in path]
+
+
+def map_moves(moves, s):
+    """('extend'|'retract', r, c) moves played on transform(state, s), translated back to state"""
+    inverse = INVERSE_PISTON_PERMS[s]
+    result = []
+    for action, r, c in moves:
+        r, c = PISTONS[inverse[PISTON_INDEX[(r, c)]]]
+        result.append((action, r, c))
+    return result
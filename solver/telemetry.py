@@ -0,0 +1,91 @@
+"""
+Solver telemetry.
+
+Solvers publish SolverStats snapshots through an on_stats callback at a
+fixed wall-clock interval, and one final snapshot when they return. The
+callback runs on the solver's thread; pass a queue.Queue's put method to
+hand snapshots to another thread (the GUI polls such a queue from its
+event loop).
+"""
+
+import time
+
+# Rough per-entry costs behind the memory estimate
+DICT_ENTRY_BYTES = 100  # hash slot plus int key and value objects
+LIST_ENTRY_BYTES = 40  # list, deque or heap slot plus a small int or tuple share
+# Expansions between a solver's due() polls
+POLL_NODES = 256
+
+
+class SolverStats:
+    """One telemetry snapshot; sizes are entry counts, memory is an estimate"""
+
+    __slots__ = ('method', 'elapsed', 'nodes_expanded', 'open_size', 'visited_size',
+                 'f_bound', 'best_heuristic', 'memory_bytes', 'final')
+
+    def __init__(self, method, elapsed, nodes_expanded, open_size, visited_size,
+                 f_bound, best_heuristic, memory_bytes, final=False):
+        self.method = method
+        self.elapsed = elapsed
+        self.nodes_expanded = nodes_expanded
+        self.open_size = open_size
+        self.visited_size = visited_size
+        self.f_bound = f_bound  # f of the node being expanded (IDA*: the iteration bound)
+        self.best_heuristic = best_heuristic
+        self.memory_bytes = memory_bytes
+        self.final = final  # True for the snapshot published when the solver returns
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes_expanded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self):
+        stats = {name: getattr(self, name) for name in self.__slots__}
+        stats['nodes_per_second'] = self.nodes_per_second
+        return stats
+
+    def format(self):
+        """One-line summary for logs"""
+        return (f"{self.nodes_expanded} nodes ({self.nodes_per_second:.0f}/s), open {self.open_size}, "
+                f"visited {self.visited_size}, f {self.f_bound}, best h {self.best_heuristic}, "
+                f"~{self.memory_bytes / 1e6:.1f} MB, {self.elapsed:.2f}s")
+
+    def __repr__(self):
+        return f"SolverStats({self.method}: {self.format()})"
+
+
+class StatsPublisher:
+    """
+    Rate-limited on_stats callback for one solve.
+
+    Solvers poll due() every POLL_NODES expansions and call publish() when
+    it returns True; with interval 0 every poll publishes. finish() sends the final snapshot, reusing the sizes of
+    the last periodic one.
+    """
+
+    def __init__(self, callback, method, interval=0.5, start_time=None):
+        self.callback = callback
+        self.method = method
+        self.interval = interval
+        self.start_time = time.time() if start_time is None else start_time
+        self._next = self.start_time + interval
+        self._last = None
+
+    def due(self):
+        return time.time() >= self._next
+
+    def publish(self, nodes_expanded, open_size, visited_size, f_bound, best_heuristic, memory_bytes):
+        now = time.time()
+        self._next = now + self.interval
+        self._last = SolverStats(self.method, now - self.start_time, nodes_expanded, open_size,
+                                 visited_size, f_bound, best_heuristic, memory_bytes)
+        self.callback(self._last)
+
+    def finish(self, result):
+        """Publish the final snapshot for a SolveResult"""
+        last = self._last
+        self.callback(SolverStats(
+            self.method, result.elapsed, result.nodes_expanded,
+            last.open_size if last else 0, last.visited_size if last else 0,
+            last.f_bound if last else None, last.best_heuristic if last else None,
+            last.memory_bytes if last else 0, final=True))
@@ -0,0 +1,145 @@
+"""
+Fixed-size transposition tables mapping packed states to the fewest moves
+they were reached in.
+
+Losing an entry never makes a search wrong, it only means a state may be
+expanded again, so these tables trade re-expansions for a hard memory cap.
+"""
+
+from array import array
+from collections import OrderedDict
+
+EMPTY = 0xFFFF
+# Bytes per slot: one 64-bit key plus one 16-bit move count
+SLOT_BYTES = 10
+# Rough per-entry cost of an OrderedDict holding int keys and values
+LRU_ENTRY_BYTES = 150
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class TranspositionTable:
+    """
+    Bounded map of state -> moves with hit/miss/eviction counters.
+
+    policy 'depth': two-slot buckets in flat arrays. The first slot keeps the
+    entry reached in the fewest moves (those prune the most), the second slot
+    always takes the newest entry.
+    policy 'lru': least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, policy='depth', capacity=None):
+        if policy not in ('depth', 'lru'):
+            raise ValueError(f"unknown replacement policy {policy!r}, expected 'depth' or 'lru'")
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if capacity is None:
+            capacity = max_bytes // (SLOT_BYTES if policy == 'depth' else LRU_ENTRY_BYTES)
+        capacity = max(2, capacity)
+        if policy == 'lru':
+            self.capacity = capacity
+            self._entries = OrderedDict()
+        else:
+            # Power-of-two number of slots, so the hash can take the top bits
+            self._bits = capacity.bit_length() - 1
+            self.capacity = 1 << self._bits
+            self._shift = 64 - self._bits + 1  # index of a two-slot bucket
+            self._keys = array('Q', bytes(8 * self.capacity))
+            self._moves = array('H', [EMPTY]) * self.capacity
+            self._size = 0
+
+    def get(self, key):
+        """Fewest moves stored for key, or None"""
+        if self.policy == 'lru':
+            moves = self._entries.get(key)
+            if moves is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return moves
+        i = (((key * _HASH_MULTIPLIER) & _MASK64) >> self._shift) << 1
+        keys = self._keys
+        if keys[i] == key and self._moves[i] != EMPTY:
+            self.hits += 1
+            return self._moves[i]
+        if keys[i + 1] == key and self._moves[i + 1] != EMPTY:
+            self.hits += 1
+            return self._moves[i + 1]
+        self.misses += 1
+        return None
+
+    def store(self, key, moves):
+        """Record that key was reached in moves, keeping the smaller count"""
+        if self.policy == 'lru':
+            entries = self._entries
+            old = entries.get(key)
+            if old is not None:
+                if moves < old:
+                    entries[key] = moves
+                entries.move_to_end(key)
+                return
+            if len(entries) >= self.capacity:
+                entries.popitem(last=False)
+                self.evictions += 1
+            entries[key] = moves
+            return
+
+        i = (((key * _HASH_MULTIPLIER) & _MASK64) >> self._shift) << 1
+        keys = self._keys
+        counts = self._moves
+        for slot in (i, i + 1):
+            if keys[slot] == key and counts[slot] != EMPTY:
+                if moves < counts[slot]:
+                    counts[slot] = moves
+                return
+        if counts[i] == EMPTY:
+            keys[i] = key
+            counts[i] = moves
+            self._size += 1
+            return
+        if moves <= counts[i]:
+            # New entry is shallower: it takes the preferred slot and the old
+            # preferred entry drops to the always-replace slot
+            old_key, old_moves = keys[i], counts[i]
+            keys[i] = key
+            counts[i] = moves
+            key, moves = old_key, old_moves
+        if counts[i + 1] == EMPTY:
+            self._size += 1
+        else:
+            self.evictions += 1
+        keys[i + 1] = key
+        counts[i + 1] = moves
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        if self.policy == 'lru':
+            self._entries.clear()
+        else:
+            self._moves = array('H', [EMPTY]) * self.capacity
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries) if self.policy == 'lru' else self._size
+
+    @property
+    def approx_bytes(self):
+        """Memory used by the table's storage"""
+        if self.policy == 'lru':
+            return len(self._entries) * LRU_ENTRY_BYTES
+        return self.capacity * SLOT_BYTES
+
+    def stats(self):
+        return {
+            'policy': self.policy,
+            'capacity': self.capacity,
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'approx_bytes': self.approx_bytes,
+        }
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Benchmark corpus generation and baseline comparison"""
+
+import sys
+import os
+import random
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import benchmark
+from solver import bitboard
+
+
+def test_random_boards_are_dealt_like_the_game():
+    rng = random.Random(1)
+    for _ in range(20):
+        board = bitboard.format_board(benchmark.random_board(rng))
+        assert board[5:7] == board[9:11] == ".."
+        assert sorted(board.replace(".", "")) == sorted("BBBGGGRRRYYY")
+
+
+def test_corpus_is_deterministic():
+    first = benchmark.generate_corpus(3, 1)
+    assert first == benchmark.generate_corpus(3, 1)
+    assert [bucket for bucket, _ in first] == [name for name, _ in benchmark.BUCKETS]
+
+
+def test_checked_in_corpus_reads():
+    corpus = benchmark.read_corpus(benchmark.CORPUS_PATH)
+    buckets = {name for name, _ in benchmark.BUCKETS}
+    assert corpus and all(bucket in buckets for bucket, _ in corpus)
+
+
+def test_compare_flags_regressions_past_threshold():
+    records = [dict(bucket="easy", board=".", nodes=100, wall_time=1.0, peak_memory=1000, length=30)]
+    baseline = {"totals": benchmark.bucket_totals(records)}
+    thresholds = {"nodes": 0.05, "wall_time": 0.25, "peak_memory": 0.25, "length": 0}
+    assert benchmark.compare(baseline, baseline, thresholds) == []
+
+    records[0].update(nodes=104, wall_time=1.5, length=31)
+    regressions = benchmark.compare({"totals": benchmark.bucket_totals(records)}, baseline, thresholds)
+    assert sorted(message.split(":")[0] for message in regressions) == [
+        "all length", "all wall_time", "easy length", "easy wall_time"]
+
+
+if __name__ == "__main__":
+    test_random_boards_are_dealt_like_the_game()
+    test_corpus_is_deterministic()
+    test_checked_in_corpus_reads()
+    test_compare_flags_regressions_past_threshold()
+    print("✅ All benchmark tests passed!")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Check the packed bitboard kernel against a plain grid-based statement of the rules"""
+
+import sys
+import os
+import random
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver import bitboard
+
+BLOCKS = set(bitboard.COLOR_CHARS.values())
+
+
+def reference_push_chain(grid, piston_heads, r, c, dr, dc):
+    # Cells of the blocks an extending head pushes, or None if blocked
+    chain = []
+    while 1 <= r <= 4 and 1 <= c <= 4 and (r, c) not in piston_heads:
+        if grid[r][c] == '':
+            return chain
+        chain.append((r, c))
+        r, c = r + dr, c + dc
+    return None
+
+
+def reference_moves(grid, extended, piston_heads):
+    """Legal moves by walking the grid, in PISTON_DIRS order"""
+    moves = []
+    for (r, c), dir_char in bitboard.PISTON_DIRS.items():
+        if extended[(r, c)]:
+            moves.append(('retract', r, c))
+            continue
+        dr, dc = bitboard.DIR_OFFSETS[dir_char]
+        if reference_push_chain(grid, piston_heads, r + dr, c + dc, dr, dc) is not None:
+            moves.append(('extend', r, c))
+    return moves
+
+
+def reference_apply(grid, extended, piston_heads, move):
+    """Copies of grid, extended and piston_heads after a legal move"""
+    grid = [row[:] for row in grid]
+    extended = dict(extended)
+    piston_heads = dict(piston_heads)
+    action, r, c = move
+    dr, dc = bitboard.DIR_OFFSETS[grid[r][c]]
+    head_r, head_c = r + dr, c + dc
+    if action == 'extend':
+        for rr, cc in reversed(reference_push_chain(grid, piston_heads, head_r, head_c, dr, dc)):
+            grid[rr + dr][cc + dc], grid[rr][cc] = grid[rr][cc], ''
+        extended[(r, c)] = True
+        piston_heads[(head_r, head_c)] = (r, c)
+    else:
+        del piston_heads[(head_r, head_c)]
+        # The sticky face pulls back the block in front of the head, if any
+        sticky_r, sticky_c = head_r + dr, head_c + dc
+        if 1 <= sticky_r <= 4 and 1 <= sticky_c <= 4 and grid[sticky_r][sticky_c] in BLOCKS:
+            grid[head_r][head_c], grid[sticky_r][sticky_c] = grid[sticky_r][sticky_c], ''
+        extended[(r, c)] = False
+    return grid, extended, piston_heads
+
+
+def random_grid(rng):
+    grid = [['' for _ in range(6)] for _ in range(6)]
+    for (r, c), dir_char in bitboard.PISTON_DIRS.items():
+        grid[r][c] = dir_char
+    cells = [(r, c) for r in range(1, 5) for c in range(1, 5)]
+    rng.shuffle(cells)
+    blocks = [bitboard.COLOR_CHARS[color] for color in bitboard.COLORS for _ in range(3)]
+    for (r, c), block in zip(cells, blocks):
+        grid[r][c] = block
+    return grid
+
+
+def test_encode_decode_round_trip():
+    rng = random.Random(1)
+    grid = random_grid(rng)
+    extended = {pos: False for pos in bitboard.PISTON_DIRS}
+    state = bitboard.encode(grid, extended)
+    assert state >> bitboard.EXT_SHIFT == 0
+    new_grid, new_extended, piston_heads = bitboard.decode(state)
+    assert new_grid == grid
+    assert new_extended == extended
+    assert piston_heads == {}
+
+
+def test_random_walks_match_grid_rules():
+    rng = random.Random(2)
+    for _ in range(50):
+        grid = random_grid(rng)
+        extended = {pos: False for pos in bitboard.PISTON_DIRS}
+        piston_heads = {}
+        state = bitboard.encode(grid, extended)
+        for _ in range(40):
+            expected = reference_moves(grid, extended, piston_heads)
+            assert bitboard.legal_moves(state) == expected
+            move = rng.choice(expected)
+            grid, extended, piston_heads = reference_apply(grid, extended, piston_heads, move)
+            state = bitboard.apply_piston(state, bitboard.PISTON_INDEX[move[1:]])
+            assert bitboard.decode(state) == (grid, extended, piston_heads)
+
+
+def test_game_moves_use_kernel():
+    # The game's piston methods only touch grid, extended and piston_heads,
+    # so they run without a window
+    from colorpuzzle import PuzzleGame
+    rng = random.Random(3)
+    game = PuzzleGame.__new__(PuzzleGame)
+    game.grid = random_grid(rng)
+    game.extended = {pos: False for pos in bitboard.PISTON_DIRS}
+    game.piston_heads = {}
+    rows = list(game.grid)
+    state = bitboard.encode(game.grid, game.extended)
+    for _ in range(200):
+        r, c = rng.choice(bitboard.PISTONS)
+        new_state = bitboard.apply_piston(state, bitboard.PISTON_INDEX[(r, c)])
+        if game.extended[(r, c)]:
+            game.extend_piston(r, c)  # already extended: no change
+            game.retract_piston(r, c)
+        else:
+            game.extend_piston(r, c)
+        state = state if new_state is None else new_state
+        assert bitboard.decode(state) == (game.grid, game.extended, game.piston_heads)
+    assert all(a is b for a, b in zip(rows, game.grid))
+
+
+if __name__ == "__main__":
+    test_encode_decode_round_trip()
+    test_random_walks_match_grid_rules()
+    test_game_moves_use_kernel()
+    print("✅ All bitboard tests passed!")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Solution cache: symmetric lookups, replacement rules and use from batch_solve"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver import bitboard, search, symmetry
+from solver.cache import SolutionCache
+
+BOARD = "GBBBY..RG..GYRRY"
+
+
+def replay(state, moves):
+    for move in moves:
+        assert move in search.get_possible_moves(state)
+        state = search.apply_move(state, move)
+    return state
+
+
+def test_symmetric_boards_share_an_entry():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SolutionCache(os.path.join(tmp, "solutions.sqlite"))
+        state = bitboard.parse_board(BOARD)
+        assert cache.get(state) is None
+        cache.put(state, search.solve(state).moves)
+        assert len(cache) == 1
+        for s in range(symmetry.NUM_SYMMETRIES):
+            image = symmetry.transform(state, s)
+            result = cache.get(image)
+            assert result.status == search.SOLVED and not result.optimal
+            assert search.is_win(replay(image, result.moves))
+        assert cache.hits == symmetry.NUM_SYMMETRIES and cache.misses == 1
+        cache.close()
+
+
+def test_keeps_shortest_solution():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SolutionCache(os.path.join(tmp, "solutions.sqlite"))
+        state = bitboard.parse_board(BOARD)
+        short = search.solve(state).moves
+        long = search.solve(state, method='ida').moves
+        assert len(long) > len(short)
+        cache.put(state, short)
+        cache.put(state, long)
+        assert cache.get(state).moves == short
+        cache.put(state, short, optimal=True)
+        assert cache.get(state).optimal
+        cache.close()
+
+
+def test_batch_solve_uses_cache():
+    import batch_solve
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "solutions.sqlite")
+        first = batch_solve.solve_board((1, BOARD, "astar", 100, {}, path))
+        second = batch_solve.solve_board((2, BOARD, "astar", 100, {}, path))
+        assert not first["cached"] and second["cached"]
+        assert second["moves"] == first["moves"] and second["nodes"] == 0
+        batch_solve._caches.pop(path).close()
+
+
+def test_batch_solve_without_usable_cache():
+    import batch_solve
+    with tempfile.TemporaryDirectory() as tmp:
+        # A plain file where the cache's directory should be
+        blocker = os.path.join(tmp, "blocker")
+        open(blocker, "w").close()
+        path = os.path.join(blocker, "solutions.sqlite")
+        record = batch_solve.solve_board((1, BOARD, "astar", 100, {}, path))
+        assert record["solved"] and not record["cached"]
+        assert batch_solve._caches.pop(path) is None
+
+
+if __name__ == "__main__":
+    test_symmetric_boards_share_an_entry()
+    test_keeps_shortest_solution()
+    test_batch_solve_uses_cache()
+    test_batch_solve_without_usable_cache()
+    print("✅ All solution cache tests passed!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Tests for the incremental canvas drawing of the game board"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver import bitboard
+
+
+class RecordingCanvas:
+    """Stand-in for tk.Canvas that records item creation and updates"""
+
+    def __init__(self):
+        self.items = {}
+        self.updates = []
+
+    def _create(self, kind, *coords, **options):
+        item = len(self.items) + 1
+        self.items[item] = dict(options, kind=kind, coords=coords)
+        return item
+
+    def create_rectangle(self, *coords, **options):
+        return self._create('rectangle', *coords, **options)
+
+    def create_oval(self, *coords, **options):
+        return self._create('oval', *coords, **options)
+
+    def create_text(self, *coords, **options):
+        return self._create('text', *coords, **options)
+
+    def create_line(self, *coords, **options):
+        return self._create('line', *coords, **options)
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+        self.updates.append(item)
+
+
+def make_game(board):
+    # PuzzleGame without a window, drawing onto a RecordingCanvas
+    from colorpuzzle import PuzzleGame
+    game = PuzzleGame.__new__(PuzzleGame)
+    game.grid, game.extended, game.piston_heads = bitboard.decode(bitboard.parse_board(board))
+    game.solving_in_progress = False
+    game.manual_setup_active = False
+    game.canvas = RecordingCanvas()
+    game.create_canvas_items()
+    game.draw_grid()
+    return game
+
+
+def shown(game, pos):
+    """(background, block color, text) the canvas shows for cell pos"""
+    rect, oval, text = (game.canvas.items[item] for item in game.cell_items[pos])
+    block = oval['fill'] if oval['state'] == 'normal' else None
+    return rect['fill'], block, text['text']
+
+
+def test_items_created_once():
+    game = make_game("RRRB B..B G..G GYYY".replace(' ', ''))
+    created = len(game.canvas.items)
+    for r, c in bitboard.PISTONS[:4]:
+        game.extend_piston(r, c)
+        game.draw_grid()
+    game.solving_in_progress = True
+    game.draw_grid()
+    assert len(game.canvas.items) == created
+
+
+def test_move_updates_only_changed_cells():
+    game = make_game("RRRB B..B G..G GYYY".replace(' ', ''))
+    game.canvas.updates.clear()
+    game.draw_grid()
+    assert game.canvas.updates == []
+
+    # Extending the piston left of row 2 pushes (2,1) into (2,2)
+    assert game.toggle_piston(2, 0)
+    game.draw_grid()
+    changed = {pos for pos, items in game.cell_items.items()
+               if any(item in game.canvas.updates for item in items)}
+    assert changed == {(2, 0), (2, 1), (2, 2)}
+    assert len(game.canvas.updates) <= 5
+    assert shown(game, (2, 1)) == ('orange', None, '>')
+    assert shown(game, (2, 2)) == ('white', 'blue', '')
+
+
+def test_canvas_matches_board():
+    import random
+    rng = random.Random(5)
+    game = make_game("RRRB B..B G..G GYYY".replace(' ', ''))
+    for step in range(100):
+        game.toggle_piston(*rng.choice(bitboard.PISTONS))
+        game.solving_in_progress = step % 10 == 9
+        game.draw_grid()
+        for pos in game.cell_items:
+            background, block, text, _ = game.cell_look(*pos)
+            assert shown(game, pos) == (background, block, text)
+
+
+def test_overlays():
+    game = make_game("." * 16)
+    visible = lambda name: all(game.canvas.items[item]['state'] == 'normal' for item in game.overlay_items[name])
+    assert visible('empty') and not visible('solving')
+    game.solving_in_progress = True
+    game.draw_grid()
+    assert visible('solving') and not visible('empty')
+    game.solving_in_progress = False
+    game.manual_setup_active = True
+    game.draw_grid()
+    assert not visible('solving') and not visible('empty')
+
+
+if __name__ == "__main__":
+    test_items_created_once()
+    test_move_updates_only_changed_cells()
+    test_canvas_matches_board()
+    test_overlays()
+    print("✅ All draw_grid tests passed!")
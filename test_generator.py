@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Generated boards have the optimal solution length they were made for"""
+
+import sys
+import os
+import random
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver import bitboard, generator, search
+
+oracle = generator.DistanceOracle(perimeter_depth=8)
+
+
+def test_generated_lengths_are_optimal():
+    rng = random.Random(4)
+    for length in (6, 8, 10, 12):
+        state = generator.generate(length, oracle, rng)
+        assert state is not None and state >> bitboard.EXT_SHIFT == 0
+        # The anytime solver proves its answer optimal with its own lower bound
+        result = search.solve(state, method='anytime', max_depth=length)
+        assert result.optimal and len(result.moves) == length
+
+
+def test_odd_lengths_are_rejected():
+    try:
+        generator.generate(7, oracle)
+        assert False, "playable boards have even lengths"
+    except ValueError:
+        pass
+
+
+def test_lengths_past_the_ceiling_are_rejected():
+    assert oracle.max_length(certify_depth=5) == 12
+    try:
+        generator.generate(14, oracle, certify_depth=5)
+        assert False, "14 moves need more than 5 forward layers past a depth 8 perimeter"
+    except ValueError:
+        pass
+
+
+def test_certify_matches_breadth_first_distances():
+    # A deeper perimeter of its own (the oracle's is shared per process)
+    # gives exact distances to check the shallow oracle against
+    deep = search.GoalPerimeter()
+    while deep.depth < 12:
+        deep.expand()
+    rng = random.Random(2)
+    for length in (10, 12):
+        playable = [key for key, d in deep.dist.items() if d == length and key >> bitboard.EXT_SHIFT == 0]
+        for key in rng.sample(playable, 5):
+            # Exact with just enough forward layers, and None with one fewer
+            needed = length - oracle.depth
+            assert oracle.certify(key, certify_depth=needed) == length
+            assert oracle.certify(key, certify_depth=needed - 1) is None
+
+
+def test_generate_boards_record():
+    import generate_boards
+    generate_boards._oracle = oracle
+    record = generate_boards.generate_board((10, 1, 200, generator.CERTIFY_DEPTH))
+    assert record["length"] == 10 and len(record["board"]) == 16
+
+
+if __name__ == "__main__":
+    test_generated_lengths_are_optimal()
+    test_odd_lengths_are_rejected()
+    test_lengths_past_the_ceiling_are_rejected()
+    test_certify_matches_breadth_first_distances()
+    test_generate_boards_record()
+    print("✅ All generator tests passed!")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Open lists: bucket queue ordering and use as the A* open list"""
+
+import sys
+import os
+import random
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver import bitboard, search
+from solver.open_list import BucketQueue, HeapQueue
+
+BOARD = "GBBBY..RG..GYRRY"
+
+
+def test_bucket_queue_matches_heap_order():
+    rng = random.Random(2)
+    buckets = BucketQueue(g_limit=10)
+    heap = HeapQueue()
+    for item in range(500):
+        f, g = rng.randrange(40), rng.randrange(10)
+        buckets.push(f, g, item)
+        heap.push(f, g, item)
+        if rng.random() < 0.3:
+            assert buckets.pop() == heap.pop()
+    while heap:
+        assert buckets.pop() == heap.pop()
+    assert not buckets
+
+
+def test_bucket_queue_lifo_ties():
+    queue = BucketQueue(g_limit=4, lifo=True)
+    for item in range(3):
+        queue.push(5, 2, item)
+    queue.push(5, 1, 'shallow')
+    assert [queue.pop()[2] for _ in range(4)] == ['shallow', 2, 1, 0]
+
+
+def test_open_lists_find_same_solution():
+    state = bitboard.parse_board(BOARD)
+    heap = search.solve(state, open_list='heap')
+    buckets = search.solve(state, open_list='buckets')
+    assert buckets.moves == heap.moves
+    assert buckets.nodes_expanded == heap.nodes_expanded
+
+
+if __name__ == "__main__":
+    test_bucket_queue_matches_heap_order()
+    test_bucket_queue_lifo_ties()
+    test_open_lists_find_same_solution()
+    print("✅ All open list tests passed!")
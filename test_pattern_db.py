@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Pattern database checks: goal distances and consistency along random walks"""
+
+import sys
+import os
+import random
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver import bitboard, pattern_db, search
+
+SOLVED = "YYBBY..BR..GRRGG"
+
+
+def random_state(rng):
+    cells = list(range(16))
+    rng.shuffle(cells)
+    state = 0
+    for cell, code in zip(cells, [1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4]):
+        state |= code << (3 * cell)
+    return state
+
+
+def test_database_is_available():
+    assert pattern_db.load() is not None
+    heuristic = search.default_heuristic()
+    assert isinstance(heuristic, search.IncrementalHeuristic)
+    assert heuristic.value == pattern_db.load().additive_masks
+
+
+def test_goal_has_zero_distance():
+    db = pattern_db.load()
+    state = bitboard.parse_board(SOLVED)
+    assert db.admissible(state) == 0
+    assert db.additive(state) == 0
+
+
+def test_admissible_estimate_is_consistent():
+    # h(parent) <= h(child) + 1 for every move, so the max never overestimates
+    db = pattern_db.load()
+    rng = random.Random(3)
+    for _ in range(30):
+        state = random_state(rng)
+        for _ in range(30):
+            children = bitboard.successors(state)
+            h = db.admissible(state)
+            for _, child in children:
+                assert h <= db.admissible(child) + 1
+            state = rng.choice(children)[1]
+
+
+if __name__ == "__main__":
+    test_database_is_available()
+    test_goal_has_zero_distance()
+    test_admissible_estimate_is_consistent()
+    print("✅ All pattern database tests passed!")
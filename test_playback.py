@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Tests for solution playback in the game"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver import bitboard, search
+
+BOARD = "RRRBB..BG..GGYYY"
+
+
+def solved_playback():
+    from colorpuzzle import Playback
+    state = bitboard.parse_board(BOARD)
+    result = search.solve(state)
+    assert result.solved
+    return Playback(state, result.moves), result.moves
+
+
+def test_states_follow_moves():
+    playback, moves = solved_playback()
+    assert len(playback.states) == len(moves) + 1
+    state = playback.states[0]
+    for (action, r, c), expected in zip(moves, playback.states[1:]):
+        state = bitboard.apply_piston(state, bitboard.PISTON_INDEX[(r, c)])
+        assert state == expected
+    assert search.is_win(playback.states[-1])
+
+
+def test_seek_and_step():
+    playback, moves = solved_playback()
+    assert playback.step == 0 and playback.next_move == tuple(moves[0])
+    assert playback.seek(3) == playback.states[3]
+    assert playback.remaining == len(moves) - 3
+    assert playback.seek(len(moves) + 10) == playback.states[-1]
+    assert playback.next_move is None and playback.remaining == 0
+    assert playback.seek(-1) == playback.states[0]
+
+
+def test_rejects_illegal_moves():
+    from colorpuzzle import Playback
+    state = bitboard.parse_board(BOARD)
+    r, c = bitboard.PISTONS[0]
+    for moves in ([('retract', r, c)], [('extend', r, c), ('extend', r, c)]):
+        try:
+            Playback(state, moves)
+        except ValueError:
+            continue
+        raise AssertionError(f"{moves} accepted")
+
+
+if __name__ == "__main__":
+    test_states_follow_moves()
+    test_seek_and_step()
+    test_rejects_illegal_moves()
+    print("✅ All playback tests passed!")
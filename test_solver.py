@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Headless solver checks - these run without tkinter or a display"""
+
+import sys
+import os
+import random
+import subprocess
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver import bitboard, search
+from solver.telemetry import POLL_NODES
+
+BOARD = "GBBBY..RG..GYRRY"
+
+
+def replay(state, moves):
+    for move in moves:
+        assert move in search.get_possible_moves(state)
+        state = search.apply_move(state, move)
+    return state
+
+
+def test_solver_does_not_import_tkinter():
+    code = "import sys, solver.search; sys.exit('tkinter' in sys.modules)"
+    assert subprocess.call([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__))) == 0
+
+
+def test_parse_and_format_board():
+    state = bitboard.parse_board(BOARD)
+    assert bitboard.format_board(state) == BOARD
+    assert state >> bitboard.EXT_SHIFT == 0
+
+
+def test_solve_finds_valid_solution():
+    state = bitboard.parse_board(BOARD)
+    result = search.solve(state)
+    assert result.solved
+    assert result.nodes_expanded > 0
+    assert search.is_win(replay(state, result.moves))
+
+
+def test_ida_finds_valid_solution():
+    state = bitboard.parse_board(BOARD)
+    result = search.solve(state, method='ida')
+    assert result.solved
+    assert search.is_win(replay(state, result.moves))
+    assert result.iterations
+    assert sum(nodes for _, nodes in result.iterations) == result.nodes_expanded
+
+
+def test_bidirectional_finds_valid_solution():
+    state = bitboard.parse_board(BOARD)
+    result = search.solve(state, method='bidirectional')
+    assert result.solved
+    assert search.is_win(replay(state, result.moves))
+
+
+def test_hda_finds_valid_solution():
+    state = bitboard.parse_board(BOARD)
+    result = search.solve(state, method='hda', workers=3)
+    assert result.solved
+    assert search.is_win(replay(state, result.moves))
+    assert search.solve(state, method='hda', workers=2, max_depth=3).moves is None
+
+
+def test_anytime_improves_then_proves_optimal():
+    state = bitboard.parse_board(BOARD)
+    lengths = []
+    result = search.solve(state, method='anytime', time_limit=1,
+                          on_solution=lambda moves: lengths.append(len(moves)))
+    assert result.solved and result.optimal is False
+    assert lengths == sorted(set(lengths), reverse=True)
+    assert len(result.moves) == lengths[-1]
+    assert search.is_win(replay(state, result.moves))
+
+    # A board a few moves from the goal is searched to the end
+    perimeter = search.goal_perimeter()
+    rng = random.Random(15)
+    state = search.WIN_CELLS
+    for _ in range(30):
+        state = rng.choice(bitboard.successors(state))[1]
+    result = search.solve(state, method='anytime')
+    assert result.optimal
+    while perimeter.distance(state) is None:
+        perimeter.expand()
+    assert len(result.moves) == perimeter.distance(state)
+
+
+def test_telemetry_snapshots():
+    state = bitboard.parse_board(BOARD)
+    for method in ('astar', 'ida', 'anytime'):
+        snapshots = []
+        result = search.solve(state, method=method, on_stats=snapshots.append, stats_interval=0,
+                              time_limit=0.5 if method == 'anytime' else None)
+        assert len(snapshots) >= 2
+        assert [s.final for s in snapshots] == [False] * (len(snapshots) - 1) + [True]
+        assert snapshots[-1].nodes_expanded == result.nodes_expanded
+        counts = [s.nodes_expanded for s in snapshots]
+        assert counts == sorted(counts)
+        assert snapshots[-2].open_size > 0 and snapshots[-2].memory_bytes > 0
+
+
+def test_budgets_set_status():
+    state = bitboard.parse_board(BOARD)
+    assert search.solve(state).status == search.SOLVED
+    assert search.solve(state, max_depth=5).status == search.EXHAUSTED
+    assert search.solve(state, should_stop=lambda: True).status == search.CANCELLED
+    for method in ('astar', 'ida', 'bidirectional', 'anytime'):
+        result = search.solve(state, method=method, max_nodes=100)
+        assert result.status == search.BUDGET_EXCEEDED and result.budget == 'nodes'
+        # Only expansions count, not stale or pruned pops
+        assert result.nodes_expanded == 100
+        assert result.best_heuristic == search.default_heuristic()(result.best_state)
+        assert result.best_heuristic < search.default_heuristic()(state)
+    result = search.solve(state, time_limit=0)
+    assert result.status == search.BUDGET_EXCEEDED and result.budget == 'time'
+    # Memory is sampled every POLL_NODES expansions: the search stops right
+    # after the first sample over the limit, and the sample before was under it
+    snapshots = []
+    result = search.solve(state, max_memory=100000, on_stats=snapshots.append, stats_interval=0)
+    assert result.status == search.BUDGET_EXCEEDED and result.budget == 'memory'
+    before, over = snapshots[-3:-1]
+    assert before.memory_bytes <= 100000 < over.memory_bytes
+    assert over.nodes_expanded - before.nodes_expanded == POLL_NODES
+    # The sample is taken mid-expansion; the budget stops the next one
+    assert over.nodes_expanded <= result.nodes_expanded <= over.nodes_expanded + 1
+
+
+def test_dead_boards_rejected_without_search():
+    result = search.solve(bitboard.parse_board("YYYYB..RR..RGGGB"))
+    assert result.status == search.UNSOLVABLE and result.nodes_expanded == 0
+    assert "4 yellow, 2 blue" in result.reason
+    # A block under an extended head
+    state = bitboard.parse_board(BOARD) | 1 << (bitboard.EXT_SHIFT + bitboard.PISTON_INDEX[(1, 0)])
+    assert search.solve(state).status == search.UNSOLVABLE
+    # The pattern database bound proves no solution fits in 5 moves
+    result = search.solve(bitboard.parse_board(BOARD), max_depth=5)
+    assert result.status == search.EXHAUSTED and result.nodes_expanded == 0 and "at least" in result.reason
+    assert search.solve(bitboard.parse_board(BOARD)).reason is None
+
+
+def test_profiler_counts_phases():
+    import pstats
+    import tempfile
+    from solver.profiling import Profiler
+    state = bitboard.parse_board(BOARD)
+    plain = search.solve(state)
+    for method in ('astar', 'anytime'):
+        profiler = Profiler()
+        result = search.solve(state, method=method, max_nodes=3000, profiler=profiler)
+        if method == 'astar':
+            assert result.moves == plain.moves and result.nodes_expanded == plain.nodes_expanded
+        calls = {phase: counter[0] for phase, counter in profiler.phases.items()}
+        assert result.nodes_expanded - 1 <= calls['move_generation'] <= result.nodes_expanded
+        assert calls['open_push'] == calls['visited_store'] > 0
+        assert calls['heuristic'] > 0 and profiler.elapsed == result.elapsed
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "solve.prof")
+        profiler.dump_stats(path)
+        assert pstats.Stats(path).total_calls == 1 + sum(calls.values())
+    try:
+        search.solve(state, method='ida', profiler=Profiler())
+        assert False, "ida does not take a profiler"
+    except ValueError:
+        pass
+
+
+def test_goal_set_and_predecessors():
+    goals = search.goal_states()
+    assert goals == [search.WIN_CELLS]
+    state = bitboard.parse_board(BOARD)
+    for piston, child in bitboard.successors(state):
+        assert (piston, state) in bitboard.predecessors(child)
+
+
+def test_node_arena_rebuilds_paths():
+    state = bitboard.parse_board(BOARD)
+    nodes = search.NodeArena()
+    node_id = nodes.add(state, 0)
+    path = []
+    for g in range(1, 6):
+        piston, state = bitboard.successors(state)[g % 3]
+        node_id = nodes.add(state, g, node_id, piston)
+        path.append(piston)
+    assert nodes.path(node_id) == path
+    assert nodes.path(0) == []
+    assert nodes.states[node_id] == state and nodes.g[node_id] == 5
+
+
+def test_incremental_heuristic_matches_full_scan():
+    rng = random.Random(5)
+    for heuristic in (search.heuristic, search.default_heuristic()):
+        state = bitboard.parse_board(BOARD)
+        components = heuristic.components(state)
+        for _ in range(200):
+            _, state, k, old_line, new_line = rng.choice(bitboard.successor_lines(state))
+            components = heuristic.update(components, k, old_line, new_line)
+            assert components == heuristic.components(state)
+            assert heuristic.value(components) == heuristic(state)
+
+
+def test_solved_board_needs_no_moves():
+    state = bitboard.parse_board("YYBBY..BR..GRRGG")
+    assert search.is_win(state)
+    assert search.solve(state).moves == []
+    assert search.solve(state, method='ida').moves == []
+    assert search.solve(state, method='bidirectional').moves == []
+    assert search.solve(state, method='hda', workers=2).moves == []
+    assert search.solve(state, method='anytime').optimal
+
+
+def test_should_stop_cancels():
+    result = search.solve(bitboard.parse_board(BOARD), should_stop=lambda: True)
+    assert not result.solved
+    assert result.nodes_expanded == 0
+
+
+def test_batch_solve_record():
+    import batch_solve
+    record = batch_solve.solve_board((1, BOARD, "astar", 100, {}, None))
+    assert record["solved"] and record["length"] == len(record["moves"])
+    assert record["status"] == "solved" and not record["cached"]
+    assert "error" in batch_solve.solve_board((2, "YYB", "astar", 100, {}, None))
+    record = batch_solve.solve_board((3, BOARD, "astar", 100, {"time_limit": 0.001}, None))
+    assert record["status"] == "budget_exceeded" and record["budget"] == "time"
+
+
+if __name__ == "__main__":
+    test_solver_does_not_import_tkinter()
+    test_parse_and_format_board()
+    test_solve_finds_valid_solution()
+    test_ida_finds_valid_solution()
+    test_bidirectional_finds_valid_solution()
+    test_hda_finds_valid_solution()
+    test_anytime_improves_then_proves_optimal()
+    test_telemetry_snapshots()
+    test_budgets_set_status()
+    test_dead_boards_rejected_without_search()
+    test_profiler_counts_phases()
+    test_goal_set_and_predecessors()
+    test_incremental_heuristic_matches_full_scan()
+    test_solved_board_needs_no_moves()
+    test_should_stop_cancels()
+    test_batch_solve_record()
+    print("✅ All solver tests passed!")
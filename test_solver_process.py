@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Tests for the game's solver process"""
+
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver import bitboard, search
+
+
+def read_all(conn):
+    messages = []
+    while True:
+        try:
+            messages.append(conn.recv())
+        except EOFError:
+            return messages
+
+
+def test_streams_stats_then_result():
+    from colorpuzzle import solver_process
+    state = bitboard.parse_board("RRRBB..BG..GGYYY")
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    solver_process(writer, state)
+    messages = read_all(reader)
+    kinds = [kind for kind, _ in messages]
+    assert kinds[-1] == 'done' and set(kinds[:-1]) <= {'stats'}
+    assert messages[-2][1].final
+    moves = messages[-1][1]
+    for _, r, c in moves:
+        state = bitboard.apply_piston(state, bitboard.PISTON_INDEX[(r, c)])
+    assert search.is_win(state)
+
+
+def test_terminate_cancels_at_once():
+    from colorpuzzle import solver_process
+    # Benchmark corpus board that takes A* several seconds
+    state = bitboard.parse_board("BGYGR..RR..GYYBB")
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=solver_process, args=(writer, state))
+    process.start()
+    writer.close()
+    time.sleep(0.5)
+    start_time = time.time()
+    process.terminate()
+    process.join()
+    assert time.time() - start_time < 1.0
+    assert process.exitcode != 0
+    assert 'done' not in [kind for kind, _ in read_all(reader)]
+
+
+if __name__ == "__main__":
+    test_streams_stats_then_result()
+    test_terminate_cancels_at_once()
+    print("✅ All solver process tests passed!")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Bounded transposition table: replacement policies and use as the A* visited map"""
+
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solver import bitboard, search
+from solver.transposition import TranspositionTable
+
+BOARD = "GBBBY..RG..GYRRY"
+
+
+def test_keeps_fewest_moves():
+    for policy in ('depth', 'lru'):
+        table = TranspositionTable(capacity=64, policy=policy)
+        assert table.get(12345) is None
+        table.store(12345, 7)
+        table.store(12345, 9)
+        assert table.get(12345) == 7
+        table.store(12345, 3)
+        assert table.get(12345) == 3
+        assert table.hits == 2 and table.misses == 1
+
+
+def test_capacity_is_bounded():
+    for policy in ('depth', 'lru'):
+        table = TranspositionTable(capacity=16, policy=policy)
+        for key in range(1, 1001):
+            table.store(key << 20, key % 50)
+        assert len(table) <= table.capacity
+        assert table.evictions >= 1000 - table.capacity
+
+
+def test_depth_policy_prefers_shallow_entries():
+    # Two slots per bucket: a shallow entry survives any number of deeper ones
+    table = TranspositionTable(capacity=2)
+    table.store(1, 2)
+    for key in range(2, 100):
+        table.store(key, 10)
+    assert table.get(1) == 2
+
+
+def test_lru_evicts_least_recently_used():
+    table = TranspositionTable(capacity=2, policy='lru')
+    table.store(1, 5)
+    table.store(2, 5)
+    table.get(1)
+    table.store(3, 5)
+    assert table.get(2) is None
+    assert table.get(1) == 5
+
+
+def test_bounded_visited_map_still_solves():
+    state = bitboard.parse_board(BOARD)
+    unbounded = search.solve(state)
+    for budget, policy in ((50000, 'depth'), (50000 * 15, 'lru')):
+        result = search.solve(state, visited_bytes=budget, visited_policy=policy)
+        assert result.table_stats['evictions'] > 0
+        assert len(result.moves) == len(unbounded.moves)
+        assert result.nodes_expanded >= unbounded.nodes_expanded
+
+
+if __name__ == "__main__":
+    test_keeps_fewest_moves()
+    test_capacity_is_bounded()
+    test_depth_policy_prefers_shallow_entries()
+    test_lru_evicts_least_recently_used()
+    test_bounded_visited_map_still_solves()
+    print("✅ All transposition table tests passed!")